@@ -0,0 +1,89 @@
+"""
+Measures how long the event loop is blocked while payments are enriched and their pair
+stats computed, running the work inline and through a thread and a process pool.
+
+A heartbeat task ticks every millisecond alongside the work; its largest delay is the
+longest the event loop couldn't serve other evaluations:
+
+    poetry run python -m benchmarks.event_loop_blocking --rows 100000
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Any
+
+import pandas as pd
+from huma_utils import chain_utils
+
+from benchmarks import payment_stats
+from huma_signals.clients.request_client import request_client
+from huma_signals.commons import executors
+
+
+def enrich_and_get_pair_stats(
+    payments: list[dict[str, Any]], pairs: list[tuple[str, str]]
+) -> list[Any]:
+    enriched_df = request_client.RequestClient.enrich_payments_data(
+        pd.DataFrame.from_records(payments),
+        chain=chain_utils.Chain.ETHEREUM,
+        compact=True,
+    )
+    return request_client.RequestClient.get_pair_payment_stats(enriched_df, pairs)
+
+
+async def _measure(
+    kind: executors.ExecutorKind,
+    payments: list[dict[str, Any]],
+    pairs: list[tuple[str, str]],
+) -> None:
+    cpu_executor = executors.create_executor(
+        kind=kind, max_workers=1, inline_threshold=0
+    )
+    max_lag = 0.0
+    done = False
+
+    async def _heartbeat() -> None:
+        nonlocal max_lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.001)
+
+    heartbeat = asyncio.create_task(_heartbeat())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await cpu_executor.run(
+        enrich_and_get_pair_stats, payments, pairs, size=len(payments)
+    )
+    elapsed = time.perf_counter() - start
+    done = True
+    await heartbeat
+    if cpu_executor.executor is not None:
+        cpu_executor.executor.shutdown()
+
+    print(
+        f"{kind.value:>8}: {elapsed * 1000:8.1f} ms, "
+        f"longest event loop stall {max_lag * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--pairs", type=int, default=100)
+    args = parser.parse_args()
+
+    raw_df = payment_stats.build_raw_payments(args.rows)
+    payments: list[dict[str, Any]] = raw_df.to_dict("records")  # type: ignore[assignment]
+    rng = random.Random(0)
+    pairs = [
+        (rng.choice(payments)["from"], rng.choice(payments)["to"])
+        for _ in range(args.pairs)
+    ]
+    for kind in executors.ExecutorKind:
+        asyncio.run(_measure(kind, payments, pairs))
+
+
+if __name__ == "__main__":
+    main()
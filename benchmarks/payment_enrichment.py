@@ -0,0 +1,40 @@
+"""
+Compares `enrich_payments_data` with its compact variant over synthetic raw payments,
+reporting the time taken and the memory footprint of the enriched frame:
+
+    poetry run python -m benchmarks.payment_enrichment --rows 10000 100000 1000000
+"""
+import argparse
+import time
+
+from huma_utils import chain_utils
+
+from benchmarks import payment_stats
+from huma_signals.clients.request_client import request_client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        raw_df = payment_stats.build_raw_payments(rows)
+        for compact in (False, True):
+            start = time.perf_counter()
+            enriched_df = request_client.RequestClient.enrich_payments_data(
+                raw_df, chain=chain_utils.Chain.ETHEREUM, compact=compact
+            )
+            elapsed = time.perf_counter() - start
+            memory_mb = (
+                request_client.RequestClient.get_payments_memory_usage(enriched_df)
+                / 2**20
+            )
+            print(
+                f"{rows:>9} rows, {'compact' if compact else 'default':>7}: "
+                f"{elapsed * 1000:8.1f} ms, {memory_mb:8.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compares computing the payer, payee and pair stats of (payer, payee) pairs with one
+`get_payment_stats` call per boolean mask, as the Request Network adapters used to,
+with `get_pair_payment_stats`, over synthetic enriched payments:
+
+    poetry run python -m benchmarks.payment_stats --rows 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+from typing import Callable
+
+import pandas as pd
+from huma_utils import chain_utils
+
+from huma_signals.clients.request_client import request_client
+
+_USDC_ADDRESS = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+
+
+def _random_address(rng: random.Random) -> str:
+    return f"0x{rng.getrandbits(160):040x}"
+
+
+def build_raw_payments(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    addresses = [_random_address(rng) for _ in range(max(rows // 20, 2))]
+    token_addresses = [_USDC_ADDRESS, _random_address(rng)]
+    return pd.DataFrame(
+        {
+            "id": [f"0x{i:064x}" for i in range(rows)],
+            "contractAddress": _random_address(rng),
+            "tokenAddress": [rng.choice(token_addresses) for _ in range(rows)],
+            "to": [rng.choice(addresses) for _ in range(rows)],
+            "from": [rng.choice(addresses) for _ in range(rows)],
+            "timestamp": [1_500_000_000 + i * 15 for i in range(rows)],
+            "txHash": "0x",
+            "amount": [str(rng.getrandbits(48)) for _ in range(rows)],
+            "currency": None,
+            "amountInCrypto": None,
+        }
+    )
+
+
+def build_payments(rows: int, seed: int = 0) -> pd.DataFrame:
+    return request_client.RequestClient.enrich_payments_data(
+        build_raw_payments(rows, seed), chain=chain_utils.Chain.ETHEREUM
+    )
+
+
+def masked_stats(df: pd.DataFrame, pairs: list[tuple[str, str]]) -> None:
+    for payer, payee in pairs:
+        request_client.RequestClient.get_payment_stats(df[df["from"] == payer])
+        request_client.RequestClient.get_payment_stats(df[df["to"] == payee])
+        request_client.RequestClient.get_payment_stats(
+            df[(df["from"] == payer) & (df["to"] == payee)]
+        )
+
+
+def grouped_stats(df: pd.DataFrame, pairs: list[tuple[str, str]]) -> None:
+    request_client.RequestClient.get_pair_payment_stats(df, pairs)
+
+
+def _time_ms(fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--pairs", type=int, default=100)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = build_payments(rows)
+        rng = random.Random(rows)
+        pairs = [
+            (rng.choice(df["from"].tolist()), rng.choice(df["to"].tolist()))
+            for _ in range(args.pairs)
+        ]
+        masked_ms = _time_ms(lambda: masked_stats(df, pairs))
+        grouped_ms = _time_ms(lambda: grouped_stats(df, pairs))
+        print(
+            f"{rows:>9} rows, {len(pairs)} pairs: masked {masked_ms:9.1f} ms, "
+            f"grouped {grouped_ms:8.1f} ms ({masked_ms / grouped_ms:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
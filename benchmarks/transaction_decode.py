@@ -0,0 +1,112 @@
+"""
+Compares decoding a `txlist` payload into a list of `EthTransaction` models with
+decoding it into `TransactionColumns`.
+
+Each decoder runs in a fresh process so that the peak RSS reported is its own:
+
+    poetry run python -m benchmarks.transaction_decode --rows 50000
+"""
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import time
+
+import orjson
+
+from huma_signals.clients.eth_client import eth_types
+from huma_signals.commons import transaction_columns
+
+_DECODERS = ("models", "columns")
+
+
+def _random_address(rng: random.Random) -> str:
+    return f"0x{rng.getrandbits(160):040x}"
+
+
+def build_payload(rows: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    wallet = _random_address(rng)
+    counterparties = [_random_address(rng) for _ in range(max(rows // 20, 1))]
+    result = []
+    for i in range(rows):
+        counterparty = rng.choice(counterparties)
+        incoming = rng.random() < 0.5
+        result.append(
+            {
+                "blockNumber": str(10_000_000 + i),
+                "timeStamp": str(1_500_000_000 + i * 15),
+                "hash": f"0x{rng.getrandbits(256):064x}",
+                "nonce": str(i),
+                "blockHash": f"0x{rng.getrandbits(256):064x}",
+                "transactionIndex": str(rng.randrange(200)),
+                "from": counterparty if incoming else wallet,
+                "to": wallet if incoming else counterparty,
+                "value": str(rng.getrandbits(72)),
+                "gas": "21000",
+                "gasPrice": str(rng.getrandbits(36)),
+                "isError": "0",
+                "txreceipt_status": "1",
+                "input": "0x",
+                "contractAddress": "",
+                "cumulativeGasUsed": str(rng.randrange(10_000_000)),
+                "gasUsed": "21000",
+                "confirmations": str(rows - i),
+                "methodId": "0x",
+                "functionName": "",
+            }
+        )
+    return orjson.dumps({"status": "1", "message": "OK", "result": result})
+
+
+def _peak_rss_mb() -> float:
+    # `ru_maxrss` is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_decoder(decoder: str, rows: int) -> None:
+    payload = build_payload(rows)
+    baseline_rss_mb = _peak_rss_mb()
+
+    start = time.perf_counter()
+    if decoder == "models":
+        decoded = len(eth_types.EthTransactionResponse(**orjson.loads(payload)).result)
+    else:
+        decoded = len(transaction_columns.decode_txlist(payload))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{decoder:>8}: {elapsed * 1000:8.1f} ms, "
+        f"peak RSS +{_peak_rss_mb() - baseline_rss_mb:7.1f} MB "
+        f"({decoded} rows)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--decoder", choices=_DECODERS)
+    args = parser.parse_args()
+
+    if args.decoder:
+        run_decoder(args.decoder, args.rows)
+        return
+
+    for decoder in _DECODERS:
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.transaction_decode",
+                "--rows",
+                str(args.rows),
+                "--decoder",
+                decoder,
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,56 @@
+import asyncio
+import datetime
 import decimal
+import enum
+import functools
 import pathlib
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Collection, Sequence
 
-import aiofiles
 import orjson
 import pydantic
 import structlog
 import web3
-from huma_utils import web3_utils
+from eth_abi import exceptions as eth_abi_exceptions
+from huma_utils import chain_utils
 from web3 import exceptions as web3_exceptions
 
 from huma_signals import exceptions, models
 from huma_signals.adapters import models as adapter_models
 from huma_signals.adapters.lending_pools import registry
 from huma_signals.adapters.lending_pools.settings import settings
+from huma_signals.commons import (
+    abi_codec,
+    async_utils,
+    block_cache,
+    multicall,
+    rate_limiter,
+    web3_providers,
+)
 
 logger = structlog.get_logger(__name__)
 
+_POOL_CONFIG_ABI_PATH = str(
+    pathlib.Path(__file__).parent.resolve() / "abi" / "BasePoolConfig.json"
+)
+
+
+@functools.cache
+def load_abi(abi_path: str) -> list[dict[str, Any]]:
+    """
+    Reads and parses a contract ABI. ABIs are memoized by path, so each file is only read
+    once per process.
+    """
+    return orjson.loads(pathlib.Path(abi_path).read_bytes())
+
+
+@functools.cache
+def load_functions(abi_path: str) -> dict[str, abi_codec.AbiFunction]:
+    """
+    Returns the functions of a contract ABI by name, with their selectors and codecs
+    precomputed, so calls to the pool contracts skip web3's contract machinery.
+    """
+    return abi_codec.load_functions(load_abi(abi_path))
+
 
 class LendingPoolSignals(models.HumaBaseModel):
     # TODO: add other pool signals: utilization, liquidity, etc.
@@ -53,56 +87,432 @@ class LendingPoolSignals(models.HumaBaseModel):
     )
 
 
+class CreditState(str, enum.Enum):
+    # In the order of `BaseStructs.CreditState` in the pool contracts.
+    DELETED = "deleted"
+    REQUESTED = "requested"
+    APPROVED = "approved"
+    GOOD_STANDING = "good_standing"
+    DELAYED = "delayed"
+    DEFAULTED = "defaulted"
+
+
+class BorrowerCreditSignals(models.HumaBaseModel):
+    pool_address: str = pydantic.Field(..., description="Address of the lending pool")
+    borrower_address: str = pydantic.Field(..., description="Address of the borrower")
+    credit_state: CreditState = pydantic.Field(
+        ..., description="State of the borrower's credit line in the pool"
+    )
+    credit_limit: decimal.Decimal = pydantic.Field(
+        ..., description="Credit limit approved for the borrower"
+    )
+    apr: int = pydantic.Field(..., description="Annual percentage rate in BPS")
+    interval_in_days: int = pydantic.Field(
+        ..., description="Payment interval in days of the credit line"
+    )
+    unbilled_principal: decimal.Decimal = pydantic.Field(
+        ..., description="Principal drawn down but not billed yet"
+    )
+    total_due: decimal.Decimal = pydantic.Field(
+        ..., description="Amount due by the due date, including fees and interest"
+    )
+    fees_and_interest_due: decimal.Decimal = pydantic.Field(
+        ..., description="Part of the amount due that is fees and interest"
+    )
+    due_date: datetime.datetime | None = pydantic.Field(
+        ..., description="Due date of the current bill, if any"
+    )
+    missed_periods: int = pydantic.Field(
+        ..., description="Number of consecutive payment periods missed"
+    )
+    remaining_periods: int = pydantic.Field(
+        ..., description="Number of payment periods left on the credit line"
+    )
+    default_amount: decimal.Decimal = pydantic.Field(
+        ..., description="Amount written off as default, if any"
+    )
+
+
 class LendingPoolAdapter(adapter_models.SignalAdapterBase):
     # TODO: move the hard coded values to EA settings cause these are not pool setting
     interval_in_days_max: ClassVar[int] = 90
     interval_in_days_min: ClassVar[int] = 0
     invoice_amount_ratio: ClassVar[float] = 0.8
 
+    def __init__(
+        self,
+        rate_limiter_registry: rate_limiter.RateLimiterRegistry | None = None,
+        cache: block_cache.BlockAwareCache[LendingPoolSignals] | None = None,
+        web3_provider_registry: web3_providers.Web3ProviderRegistry | None = None,
+    ) -> None:
+        self.rpc_rate_limiter = (
+            rate_limiter_registry or rate_limiter.default_registry
+        ).get(rate_limiter.Upstream.WEB3_RPC)
+        self.web3_provider_registry = (
+            web3_provider_registry or web3_providers.default_registry
+        )
+        # Pool signals keyed by checksummed pool address, e.g. the shared
+        # `default_cache`. Without a cache, every fetch reads from chain.
+        self.cache = cache
+        self._refresher: asyncio.Task[None] | None = None
+
     async def fetch(  # pylint: disable=arguments-differ
         self, pool_address: str, *args: Any, **kwargs: Any
     ) -> LendingPoolSignals:
-        try:
-            checksum_address = web3.Web3.to_checksum_address(pool_address)
-            pool_settings = registry.POOL_REGISTRY[checksum_address]
-        except KeyError as e:
-            message = f"Invalid pool_address {pool_address}: pool settings not found."
-            logger.exception(message)
-            raise exceptions.PoolSettingsNotFoundException(
-                pool_address=pool_address
-            ) from e
+        pool_settings = registry.get_pool_settings(pool_address)
+        if self.cache is not None:
+            cached_signals = self.cache.get(pool_settings.pool_address)
+            if cached_signals is not None:
+                return cached_signals.copy(update={"pool_address": pool_address})
+
+        w3 = await self._get_w3(pool_settings.chain)
+        (contract_address,) = await self._call(
+            w3,
+            pool_settings.pool_address,
+            load_functions(pool_settings.pool_abi_path)["poolConfig"],
+            message="Failed to get contract address",
+        )
+        pool_summary = await self._call(
+            w3,
+            contract_address,
+            load_functions(_POOL_CONFIG_ABI_PATH)["getPoolSummary"],
+            message="Failed to get pool summary",
+        )
 
-        w3 = await web3_utils.get_w3(pool_settings.chain, settings.web3_provider_url)
+        signals = self._to_signals(pool_address, pool_settings, pool_summary)
+        if self.cache is not None:
+            self.cache.put(pool_settings.pool_address, signals)
+        return signals
 
-        async with aiofiles.open(pool_settings.pool_abi_path) as f:
-            contents = await f.read()
-            huma_pool_contract = w3.eth.contract(
-                address=checksum_address,
-                abi=orjson.loads(contents),
+    async def fetch_many(
+        self, pool_addresses: Sequence[str]
+    ) -> list[LendingPoolSignals]:
+        """
+        Fetches the signals of many pools, in the given order. Pools are grouped by chain,
+        and each chain takes two Multicall3 `aggregate3` calls, one resolving every pool's
+        config contract and one getting every pool summary, rather than two calls per pool.
+        With Multicall3 disabled, each step's calls are made concurrently instead.
+        Pools with fresh cached signals aren't read from chain.
+        """
+        pool_settings_list = [
+            registry.get_pool_settings(address) for address in pool_addresses
+        ]
+        cached_signals = {
+            pool_settings.pool_address: signals
+            for pool_settings in pool_settings_list
+            if self.cache is not None
+            and (signals := self.cache.get(pool_settings.pool_address)) is not None
+        }
+        pools_by_chain: dict[chain_utils.Chain, dict[str, registry.PoolSetting]] = {}
+        for pool_settings in pool_settings_list:
+            if pool_settings.pool_address in cached_signals:
+                continue
+            pools_by_chain.setdefault(pool_settings.chain, {})[
+                pool_settings.pool_address
+            ] = pool_settings
+
+        summaries_by_chain = await async_utils.gather_bounded(
+            *(
+                self._get_pool_summaries(chain, list(pools.values()))
+                for chain, pools in pools_by_chain.items()
+            ),
+            max_concurrency=max(len(pools_by_chain), 1),
+        )
+        signals_by_pool = dict(cached_signals)
+        for summaries in summaries_by_chain:
+            for address, pool_summary in summaries.items():
+                signals = self._to_signals(
+                    address, registry.POOL_REGISTRY[address], pool_summary
+                )
+                if self.cache is not None:
+                    self.cache.put(address, signals)
+                signals_by_pool[address] = signals
+        return [
+            signals_by_pool[pool_settings.pool_address].copy(
+                update={"pool_address": pool_address}
             )
+            for pool_address, pool_settings in zip(pool_addresses, pool_settings_list)
+        ]
+
+    async def fetch_all(
+        self, chains: Collection[chain_utils.Chain] | None = None
+    ) -> list[LendingPoolSignals]:
+        """
+        Fetches the signals of every pool in the registry, optionally only on the given
+        chains, through `fetch_many`.
+        """
+        return await self.fetch_many(
+            [
+                pool_settings.pool_address
+                for pool_settings in registry.POOL_REGISTRY.values()
+                if chains is None or pool_settings.chain in chains
+            ]
+        )
+
+    async def fetch_borrower_credit(
+        self,
+        borrower_address: str,
+        chains: Collection[chain_utils.Chain] | None = None,
+    ) -> list[BorrowerCreditSignals]:
+        """
+        Fetches the borrower's credit state in every registered pool, optionally only on
+        the given chains. The credit record reads of all the pools of a chain are made
+        in one Multicall3 `aggregate3` call, so adding pools doesn't add round trips.
+        """
+        if not web3.Web3.is_address(borrower_address):
+            raise exceptions.InvalidAddressException(
+                f"Invalid borrower address: {borrower_address}"
+            )
+        borrower_address = web3.Web3.to_checksum_address(borrower_address)
+        pools_by_chain: dict[chain_utils.Chain, list[registry.PoolSetting]] = {}
+        for pool_settings in registry.POOL_REGISTRY.values():
+            if chains is None or pool_settings.chain in chains:
+                pools_by_chain.setdefault(pool_settings.chain, []).append(pool_settings)
+
+        signals_by_chain = await async_utils.gather_bounded(
+            *(
+                self._get_borrower_credit(chain, pools, borrower_address)
+                for chain, pools in pools_by_chain.items()
+            ),
+            max_concurrency=max(len(pools_by_chain), 1),
+        )
+        return [
+            signals for chain_signals in signals_by_chain for signals in chain_signals
+        ]
+
+    def invalidate(self, pool_address: str, block_number: int | None = None) -> None:
+        """
+        Drops the pool's cached signals, e.g. when a config-change event such as
+        `APRChanged` or `MaxCreditLineChanged` is seen at `block_number`.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(
+                web3.Web3.to_checksum_address(pool_address), block_number=block_number
+            )
+
+    async def refresh_cache(self) -> None:
+        """
+        Re-reads the signals of every registered pool into the cache, a chain at a time.
+        Signals are stored with the block number read just before them, so they don't
+        overwrite newer ones nor survive a later invalidation.
+        """
+        if self.cache is None:
+            raise ValueError("The adapter has no cache to refresh")
+        chains = {
+            pool_settings.chain for pool_settings in registry.POOL_REGISTRY.values()
+        }
+        await async_utils.gather_bounded(
+            *(self._refresh_chain(chain) for chain in chains),
+            max_concurrency=max(len(chains), 1),
+        )
+
+    def start_refresher(
+        self,
+        interval_seconds: float = settings.pool_signals_refresh_interval_seconds,
+    ) -> None:
+        """
+        Starts refreshing the cache every `interval_seconds` in the background, so that
+        fetches of registered pools are served from the cache rather than wait on RPC.
+        """
+        if self.cache is None:
+            raise ValueError("The adapter has no cache to refresh")
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._run_refresher(interval_seconds))
+
+    async def stop_refresher(self) -> None:
+        if self._refresher is None:
+            return
+        self._refresher.cancel()
         try:
-            contract_address = await huma_pool_contract.functions.poolConfig().call()
+            await self._refresher
+        except asyncio.CancelledError:
+            pass
+        self._refresher = None
+
+    async def _run_refresher(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.refresh_cache()
+            except Exception:  # pylint: disable=broad-except
+                # Entries that couldn't be refreshed expire and are then read on demand.
+                logger.exception("Failed to refresh the lending pool signals cache")
+            await asyncio.sleep(interval_seconds)
+
+    async def _refresh_chain(self, chain: chain_utils.Chain) -> None:
+        assert self.cache is not None
+        w3 = await self._get_w3(chain)
+        try:
+            await self.rpc_rate_limiter.acquire()
+            block_number = await w3.eth.block_number  # type: ignore[misc]
         except web3_exceptions.Web3Exception as e:
-            message = "Failed to get contract address"
+            message = "Failed to get block number"
             logger.exception(message)
             raise exceptions.ContractCallFailedException(message=message) from e
 
-        async with aiofiles.open(
-            pathlib.Path(__file__).parent.resolve() / "abi" / "BasePoolConfig.json",
-        ) as f:
-            contents = await f.read()
-            pool_config_contract = w3.eth.contract(
-                address=contract_address,
-                abi=orjson.loads(contents),
+        pools = [
+            pool_settings
+            for pool_settings in registry.POOL_REGISTRY.values()
+            if pool_settings.chain == chain
+        ]
+        pool_summaries = await self._get_pool_summaries(chain, pools)
+        for pool_settings in pools:
+            self.cache.put(
+                pool_settings.pool_address,
+                self._to_signals(
+                    pool_settings.pool_address,
+                    pool_settings,
+                    pool_summaries[pool_settings.pool_address],
+                ),
+                block_number=block_number,
+            )
+
+    async def _get_pool_summaries(
+        self, chain: chain_utils.Chain, pools: list[registry.PoolSetting]
+    ) -> dict[str, tuple[Any, ...]]:
+        w3 = await self._get_w3(chain)
+        config_addresses = await self._call_many(
+            w3,
+            [
+                (
+                    pool.pool_address,
+                    load_functions(pool.pool_abi_path)["poolConfig"],
+                    (),
+                )
+                for pool in pools
+            ],
+            message="Failed to get contract address",
+        )
+        get_pool_summary = load_functions(_POOL_CONFIG_ABI_PATH)["getPoolSummary"]
+        pool_summaries = await self._call_many(
+            w3,
+            [(outputs[0], get_pool_summary, ()) for outputs in config_addresses],
+            message="Failed to get pool summary",
+        )
+        return {
+            pool.pool_address: pool_summary
+            for pool, pool_summary in zip(pools, pool_summaries)
+        }
+
+    async def _get_borrower_credit(
+        self,
+        chain: chain_utils.Chain,
+        pools: list[registry.PoolSetting],
+        borrower_address: str,
+    ) -> list[BorrowerCreditSignals]:
+        w3 = await self._get_w3(chain)
+        calls = []
+        for pool in pools:
+            functions = load_functions(pool.pool_abi_path)
+            calls.append(
+                (
+                    pool.pool_address,
+                    functions["creditRecordMapping"],
+                    (borrower_address,),
+                )
+            )
+            calls.append(
+                (
+                    pool.pool_address,
+                    functions["creditRecordStaticMapping"],
+                    (borrower_address,),
+                )
+            )
+        outputs = await self._call_many(
+            w3, calls, message="Failed to get borrower credit records"
+        )
+        return [
+            _to_borrower_credit_signals(
+                pool.pool_address, borrower_address, credit_record, credit_record_static
+            )
+            for pool, (credit_record,), (credit_record_static,) in zip(
+                pools, outputs[::2], outputs[1::2]
+            )
+        ]
+
+    async def _call(
+        self,
+        w3: web3.Web3,
+        address: str,
+        function: abi_codec.AbiFunction,
+        message: str,
+        args: Sequence[Any] = (),
+    ) -> tuple[Any, ...]:
+        """
+        Calls the contract function with a raw `eth_call`, and returns its outputs as a
+        tuple.
+        """
+        try:
+            await self.rpc_rate_limiter.acquire()
+            return_data = await w3.eth.call(  # type: ignore[misc]
+                {"to": address, "data": function.encode_input(args)}
+            )
+            return function.decode_output(return_data)
+        except (web3_exceptions.Web3Exception, eth_abi_exceptions.DecodingError) as e:
+            logger.exception(message, contract_address=address)
+            raise exceptions.ContractCallFailedException(message=message) from e
+
+    async def _call_many(
+        self,
+        w3: web3.Web3,
+        calls: Sequence[tuple[str, abi_codec.AbiFunction, Sequence[Any]]],
+        message: str,
+    ) -> list[tuple[Any, ...]]:
+        """
+        Makes the `(address, function, args)` contract calls, and returns the outputs of
+        each call as a tuple. The calls are made in one Multicall3 batch, or, where
+        Multicall3 isn't available, concurrently, so that a batching web3 provider can
+        send them as one JSON-RPC batch.
+        """
+        if not settings.multicall_enabled:
+            return await asyncio.gather(
+                *(
+                    self._call(w3, address, function, message, args)
+                    for address, function, args in calls
+                )
+            )
+
+        results = await self._aggregate3(
+            w3,
+            [
+                multicall.Call(target=address, call_data=function.encode_input(args))
+                for address, function, args in calls
+            ],
+            message,
+        )
+        try:
+            return [
+                function.decode_output(result.return_data)
+                for (_, function, _), result in zip(calls, results)
+            ]
+        except eth_abi_exceptions.DecodingError as e:
+            logger.exception(
+                message, contract_addresses=[address for address, _, _ in calls]
             )
+            raise exceptions.ContractCallFailedException(message=message) from e
 
+    async def _aggregate3(
+        self, w3: web3.Web3, calls: list[multicall.Call], message: str
+    ) -> list[multicall.CallResult]:
         try:
-            pool_summary = await pool_config_contract.functions.getPoolSummary().call()
+            await self.rpc_rate_limiter.acquire()
+            results = await multicall.aggregate3(w3, calls)
         except web3_exceptions.Web3Exception as e:
-            message = "Failed to get pool summary"
             logger.exception(message)
             raise exceptions.ContractCallFailedException(message=message) from e
+        failed_targets = [
+            call.target for call, result in zip(calls, results) if not result.success
+        ]
+        if failed_targets:
+            logger.error(message, contract_addresses=failed_targets)
+            raise exceptions.ContractCallFailedException(message=message)
+        return results
 
+    def _to_signals(
+        self,
+        pool_address: str,
+        pool_settings: registry.PoolSetting,
+        pool_summary: Sequence[Any],
+    ) -> LendingPoolSignals:
         return LendingPoolSignals(
             pool_address=pool_address,
             apr=pool_summary[1],
@@ -116,3 +526,56 @@ class LendingPoolAdapter(adapter_models.SignalAdapterBase):
             invoice_amount_ratio=self.invoice_amount_ratio,
             is_testnet=pool_settings.chain.is_testnet(),
         )
+
+    async def _get_w3(self, chain: chain_utils.Chain) -> web3.Web3:
+        return await self.web3_provider_registry.get_w3(
+            chain, default_provider_url=settings.web3_provider_url
+        )
+
+
+def _to_borrower_credit_signals(
+    pool_address: str,
+    borrower_address: str,
+    credit_record: Sequence[Any],
+    credit_record_static: Sequence[Any],
+) -> BorrowerCreditSignals:
+    (
+        unbilled_principal,
+        due_date,
+        _,
+        total_due,
+        fees_and_interest_due,
+        missed_periods,
+        remaining_periods,
+        state,
+    ) = credit_record
+    credit_limit, apr_in_bps, interval_in_days, default_amount = credit_record_static
+    return BorrowerCreditSignals(
+        pool_address=pool_address,
+        borrower_address=borrower_address,
+        credit_state=list(CreditState)[state],
+        credit_limit=credit_limit,
+        apr=apr_in_bps,
+        interval_in_days=interval_in_days,
+        unbilled_principal=unbilled_principal,
+        total_due=total_due,
+        fees_and_interest_due=fees_and_interest_due,
+        # A zero due date means there's no bill yet.
+        due_date=(
+            datetime.datetime.fromtimestamp(due_date, tz=datetime.timezone.utc)
+            if due_date
+            else None
+        ),
+        missed_periods=missed_periods,
+        remaining_periods=remaining_periods,
+        default_amount=default_amount,
+    )
+
+
+# Shared by `default_adapter`. A TTL of 0 disables the default cache.
+default_cache: block_cache.BlockAwareCache[LendingPoolSignals] | None = (
+    block_cache.BlockAwareCache(ttl_seconds=settings.pool_signals_cache_ttl_seconds)
+    if settings.pool_signals_cache_ttl_seconds > 0
+    else None
+)
+default_adapter = LendingPoolAdapter(cache=default_cache)
@@ -0,0 +1,331 @@
+import asyncio
+import decimal
+import functools
+from typing import Any, Collection
+
+import pydantic
+import structlog
+import web3
+from huma_utils import chain_utils
+from web3 import exceptions as web3_exceptions
+
+from huma_signals import exceptions, models
+from huma_signals.adapters.lending_pools import adapter, event_store, registry
+from huma_signals.adapters.lending_pools.settings import settings
+from huma_signals.commons import abi_codec, async_utils, rate_limiter, web3_providers
+
+logger = structlog.get_logger(__name__)
+
+# The indexed events, with the names of their account and amount inputs.
+_EVENT_TYPES = {
+    "DrawdownMade": (event_store.PoolEventType.DRAWDOWN, "borrower", "borrowAmount"),
+    "DrawdownMadeWithReceivable": (
+        event_store.PoolEventType.DRAWDOWN,
+        "borrower",
+        "borrowAmount",
+    ),
+    "PaymentMade": (event_store.PoolEventType.PAYMENT, "borrower", "amount"),
+    "LiquidityDeposited": (event_store.PoolEventType.DEPOSIT, "account", "assetAmount"),
+    "LiquidityWithdrawn": (
+        event_store.PoolEventType.WITHDRAWAL,
+        "account",
+        "assetAmount",
+    ),
+}
+
+
+@functools.cache
+def load_events(abi_path: str) -> dict[bytes, abi_codec.AbiEvent]:
+    """
+    Returns the indexed events of a pool ABI by topic.
+    """
+    events = abi_codec.load_events(adapter.load_abi(abi_path))
+    return {
+        event.topic: event for name, event in events.items() if name in _EVENT_TYPES
+    }
+
+
+class PoolActivity(models.HumaBaseModel):
+    pool_address: str = pydantic.Field(..., description="Address of the lending pool")
+    last_indexed_block: int | None = pydantic.Field(
+        ..., description="Last block the pool's events are indexed up to"
+    )
+    total_deposited: decimal.Decimal = pydantic.Field(
+        ..., description="Total liquidity deposited by lenders"
+    )
+    total_withdrawn: decimal.Decimal = pydantic.Field(
+        ..., description="Total liquidity withdrawn by lenders"
+    )
+    total_drawn_down: decimal.Decimal = pydantic.Field(
+        ..., description="Total amount borrowed"
+    )
+    total_paid: decimal.Decimal = pydantic.Field(
+        ..., description="Total amount paid back, including fees and interest"
+    )
+    drawdown_count: int = pydantic.Field(..., description="Number of drawdowns")
+    payment_count: int = pydantic.Field(..., description="Number of payments")
+    borrower_count: int = pydantic.Field(
+        ..., description="Number of distinct borrowers that drew down"
+    )
+    lender_count: int = pydantic.Field(
+        ..., description="Number of distinct lenders that deposited"
+    )
+
+
+class BorrowerActivity(models.HumaBaseModel):
+    pool_address: str = pydantic.Field(..., description="Address of the lending pool")
+    borrower_address: str = pydantic.Field(..., description="Address of the borrower")
+    drawdown_count: int = pydantic.Field(..., description="Number of drawdowns")
+    total_drawn_down: decimal.Decimal = pydantic.Field(
+        ..., description="Total amount borrowed"
+    )
+    payment_count: int = pydantic.Field(..., description="Number of payments")
+    total_paid: decimal.Decimal = pydantic.Field(
+        ..., description="Total amount paid back, including fees and interest"
+    )
+    first_drawdown_block: int | None = pydantic.Field(
+        ..., description="Block of the first drawdown, if any"
+    )
+    last_payment_block: int | None = pydantic.Field(
+        ..., description="Block of the last payment, if any"
+    )
+
+
+class PoolEventIndexer:
+    """
+    Indexes the drawdown, payment and liquidity events of the registered lending pools
+    in a local store, so that pool and borrower activity is answered from the index
+    rather than from chain on every request.
+
+    Each sync scans the blocks mined since the pool's last indexed block with
+    `eth_getLogs`. The block range of a request doubles after each success, up to the
+    max, and halves after each failure, e.g. when the provider rejects a range with too
+    many logs. The range reached is kept for the pool's next sync.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        store: event_store.PoolEventStore,
+        rate_limiter_registry: rate_limiter.RateLimiterRegistry | None = None,
+        web3_provider_registry: web3_providers.Web3ProviderRegistry | None = None,
+        initial_block_range: int = settings.pool_event_index_initial_block_range,
+        max_block_range: int = settings.pool_event_index_max_block_range,
+        confirmations: int = settings.pool_event_index_confirmations,
+    ) -> None:
+        self.store = store
+        self.rpc_rate_limiter = (
+            rate_limiter_registry or rate_limiter.default_registry
+        ).get(rate_limiter.Upstream.WEB3_RPC)
+        self.web3_provider_registry = (
+            web3_provider_registry or web3_providers.default_registry
+        )
+        self.initial_block_range = initial_block_range
+        self.max_block_range = max_block_range
+        self.confirmations = confirmations
+        self._block_ranges: dict[str, int] = {}
+
+    async def sync(self, pool_address: str) -> int:
+        """
+        Indexes the pool's events up to the latest confirmed block, and returns the
+        number of new events.
+        """
+        pool_settings = registry.get_pool_settings(pool_address)
+        pool_address = pool_settings.pool_address
+        w3 = await self.web3_provider_registry.get_w3(
+            pool_settings.chain, default_provider_url=settings.web3_provider_url
+        )
+        try:
+            await self.rpc_rate_limiter.acquire()
+            latest_block = await w3.eth.block_number  # type: ignore[misc]
+        except web3_exceptions.Web3Exception as e:
+            message = "Failed to get block number"
+            logger.exception(message)
+            raise exceptions.ContractCallFailedException(message=message) from e
+
+        last_block = await self.store.get_last_indexed_block(
+            pool_settings.chain, pool_address
+        )
+        start_block = 0 if last_block is None else last_block + 1
+        end_block = latest_block - self.confirmations
+        events_by_topic = load_events(pool_settings.pool_abi_path)
+        block_range = self._block_ranges.get(pool_address, self.initial_block_range)
+        new_events = 0
+        while start_block <= end_block:
+            range_end = min(start_block + block_range - 1, end_block)
+            try:
+                await self.rpc_rate_limiter.acquire()
+                logs = await w3.eth.get_logs(  # type: ignore[misc]
+                    {
+                        "address": pool_address,
+                        "fromBlock": start_block,
+                        "toBlock": range_end,
+                        "topics": [[web3.Web3.to_hex(t) for t in events_by_topic]],
+                    }
+                )
+            except (
+                ValueError,
+                web3_exceptions.Web3Exception,
+                asyncio.TimeoutError,
+            ) as e:
+                if block_range == 1:
+                    message = "Failed to get pool event logs"
+                    logger.exception(message, pool_address=pool_address)
+                    raise exceptions.ContractCallFailedException(message=message) from e
+                block_range = max(block_range // 2, 1)
+                continue
+
+            pool_events = [
+                _to_pool_event(pool_address, events_by_topic, log) for log in logs
+            ]
+            await self.store.save_events(
+                pool_settings.chain, pool_address, pool_events, last_block=range_end
+            )
+            new_events += len(pool_events)
+            start_block = range_end + 1
+            block_range = min(block_range * 2, self.max_block_range)
+
+        self._block_ranges[pool_address] = block_range
+        logger.debug(
+            "Indexed pool events",
+            pool_address=pool_address,
+            end_block=end_block,
+            new_events=new_events,
+        )
+        return new_events
+
+    async def sync_all(
+        self, chains: Collection[chain_utils.Chain] | None = None
+    ) -> dict[str, int]:
+        """
+        Syncs every pool in the registry, optionally only on the given chains, and
+        returns the number of new events by pool address.
+        """
+        pool_addresses = [
+            pool_settings.pool_address
+            for pool_settings in registry.POOL_REGISTRY.values()
+            if chains is None or pool_settings.chain in chains
+        ]
+        new_events = await async_utils.gather_bounded(
+            *(self.sync(pool_address) for pool_address in pool_addresses),
+            max_concurrency=max(len(pool_addresses), 1),
+        )
+        return dict(zip(pool_addresses, new_events))
+
+    async def get_pool_activity(self, pool_address: str) -> PoolActivity:
+        pool_settings = registry.get_pool_settings(pool_address)
+        events = await self.store.load_events(
+            pool_settings.chain, pool_address=pool_settings.pool_address
+        )
+        totals = {
+            event_type: decimal.Decimal(0) for event_type in event_store.PoolEventType
+        }
+        counts = {event_type: 0 for event_type in event_store.PoolEventType}
+        for event in events:
+            totals[event.event_type] += decimal.Decimal(event.amount)
+            counts[event.event_type] += 1
+        return PoolActivity(
+            pool_address=pool_address,
+            last_indexed_block=await self.store.get_last_indexed_block(
+                pool_settings.chain, pool_settings.pool_address
+            ),
+            total_deposited=totals[event_store.PoolEventType.DEPOSIT],
+            total_withdrawn=totals[event_store.PoolEventType.WITHDRAWAL],
+            total_drawn_down=totals[event_store.PoolEventType.DRAWDOWN],
+            total_paid=totals[event_store.PoolEventType.PAYMENT],
+            drawdown_count=counts[event_store.PoolEventType.DRAWDOWN],
+            payment_count=counts[event_store.PoolEventType.PAYMENT],
+            borrower_count=len(
+                {
+                    event.account
+                    for event in events
+                    if event.event_type == event_store.PoolEventType.DRAWDOWN
+                }
+            ),
+            lender_count=len(
+                {
+                    event.account
+                    for event in events
+                    if event.event_type == event_store.PoolEventType.DEPOSIT
+                }
+            ),
+        )
+
+    async def get_borrower_activity(
+        self,
+        borrower_address: str,
+        chains: Collection[chain_utils.Chain] | None = None,
+    ) -> list[BorrowerActivity]:
+        """
+        Returns the borrower's drawdown and payment history in each registered pool they
+        drew down from, optionally only on the given chains.
+        """
+        if not web3.Web3.is_address(borrower_address):
+            raise exceptions.InvalidAddressException(
+                f"Invalid borrower address: {borrower_address}"
+            )
+        borrower_address = web3.Web3.to_checksum_address(borrower_address)
+        pool_chains = {
+            pool_settings.chain
+            for pool_settings in registry.POOL_REGISTRY.values()
+            if chains is None or pool_settings.chain in chains
+        }
+        activities: dict[str, BorrowerActivity] = {}
+        for chain in pool_chains:
+            for event in await self.store.load_events(
+                chain,
+                account=borrower_address,
+                event_types=[
+                    event_store.PoolEventType.DRAWDOWN,
+                    event_store.PoolEventType.PAYMENT,
+                ],
+            ):
+                activity = activities.setdefault(
+                    event.pool_address,
+                    BorrowerActivity(
+                        pool_address=event.pool_address,
+                        borrower_address=borrower_address,
+                        drawdown_count=0,
+                        total_drawn_down=decimal.Decimal(0),
+                        payment_count=0,
+                        total_paid=decimal.Decimal(0),
+                        first_drawdown_block=None,
+                        last_payment_block=None,
+                    ),
+                )
+                if event.event_type == event_store.PoolEventType.DRAWDOWN:
+                    activity.drawdown_count += 1
+                    activity.total_drawn_down += decimal.Decimal(event.amount)
+                    if activity.first_drawdown_block is None:
+                        activity.first_drawdown_block = event.block_number
+                else:
+                    activity.payment_count += 1
+                    activity.total_paid += decimal.Decimal(event.amount)
+                    activity.last_payment_block = event.block_number
+        return list(activities.values())
+
+
+def _to_pool_event(
+    pool_address: str,
+    events_by_topic: dict[bytes, abi_codec.AbiEvent],
+    log: Any,
+) -> event_store.PoolEvent:
+    topics = [bytes(topic) for topic in log["topics"]]
+    event = events_by_topic[topics[0]]
+    values = event.decode_log(topics[1:], bytes(log["data"]))
+    event_type, account_input, amount_input = _EVENT_TYPES[event.name]
+    return event_store.PoolEvent(
+        pool_address=pool_address,
+        event_type=event_type,
+        account=values[account_input],
+        amount=values[amount_input],
+        block_number=log["blockNumber"],
+        log_index=log["logIndex"],
+        transaction_hash=web3.Web3.to_hex(log["transactionHash"]),
+    )
+
+
+default_indexer = (
+    PoolEventIndexer(event_store.PoolEventStore(settings.pool_event_index_path))
+    if settings.pool_event_index_path
+    else None
+)
@@ -0,0 +1,198 @@
+import asyncio
+import contextlib
+import enum
+import sqlite3
+from typing import Collection, Iterator
+
+import web3
+from huma_utils import chain_utils
+
+from huma_signals import models
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pool_events (
+    chain TEXT NOT NULL,
+    pool_address TEXT NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    account TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    PRIMARY KEY (chain, pool_address, transaction_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS pool_events_by_account
+    ON pool_events (chain, account, pool_address);
+CREATE TABLE IF NOT EXISTS pool_index_state (
+    chain TEXT NOT NULL,
+    pool_address TEXT NOT NULL,
+    last_block INTEGER NOT NULL,
+    PRIMARY KEY (chain, pool_address)
+);
+"""
+
+
+class PoolEventType(str, enum.Enum):
+    DRAWDOWN = "drawdown"
+    PAYMENT = "payment"
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+
+
+class PoolEvent(models.HumaBaseModel):
+    pool_address: str
+    event_type: PoolEventType
+    # The borrower for drawdowns and payments, the lender for deposits and withdrawals.
+    account: str
+    # In the smallest unit of the pool's token.
+    amount: int
+    block_number: int
+    log_index: int
+    transaction_hash: str
+
+
+class PoolEventStore:
+    """
+    A local SQLite index of lending pool events keyed by chain and pool address,
+    together with the last block indexed for each pool, so that each sync only needs to
+    scan the blocks mined since.
+
+    Amounts are stored as text since they don't fit in SQLite integers.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._schema_created = False
+
+    async def get_last_indexed_block(
+        self, chain: chain_utils.Chain, pool_address: str
+    ) -> int | None:
+        return await asyncio.to_thread(
+            self._get_last_indexed_block, chain, pool_address.lower()
+        )
+
+    async def save_events(
+        self,
+        chain: chain_utils.Chain,
+        pool_address: str,
+        events: list[PoolEvent],
+        last_block: int,
+    ) -> None:
+        """
+        Stores the events and moves the pool's cursor to `last_block` in one
+        transaction, so that an interrupted sync resumes after the last range it saved.
+        """
+        rows = [
+            (
+                chain.value,
+                pool_address.lower(),
+                event.transaction_hash,
+                event.log_index,
+                event.block_number,
+                event.event_type.value,
+                event.account.lower(),
+                str(event.amount),
+            )
+            for event in events
+        ]
+        await asyncio.to_thread(
+            self._save_rows, chain, pool_address.lower(), rows, last_block
+        )
+
+    async def load_events(
+        self,
+        chain: chain_utils.Chain,
+        pool_address: str | None = None,
+        account: str | None = None,
+        event_types: Collection[PoolEventType] | None = None,
+    ) -> list[PoolEvent]:
+        """
+        Returns the indexed events of the pool and/or account, in the order they were
+        emitted.
+        """
+        return await asyncio.to_thread(
+            self._load_events,
+            chain,
+            pool_address.lower() if pool_address else None,
+            account.lower() if account else None,
+            event_types,
+        )
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with contextlib.closing(sqlite3.connect(self.path)) as conn:
+            if not self._schema_created:
+                conn.executescript(_SCHEMA)
+                self._schema_created = True
+            with conn:
+                yield conn
+
+    def _get_last_indexed_block(
+        self, chain: chain_utils.Chain, pool_address: str
+    ) -> int | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_block FROM pool_index_state"
+                " WHERE chain = ? AND pool_address = ?",
+                (chain.value, pool_address),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def _load_events(
+        self,
+        chain: chain_utils.Chain,
+        pool_address: str | None,
+        account: str | None,
+        event_types: Collection[PoolEventType] | None,
+    ) -> list[PoolEvent]:
+        query = (
+            "SELECT pool_address, event_type, account, amount, block_number, log_index,"
+            " transaction_hash FROM pool_events WHERE chain = ?"
+        )
+        params: list[str] = [chain.value]
+        if pool_address is not None:
+            query += " AND pool_address = ?"
+            params.append(pool_address)
+        if account is not None:
+            query += " AND account = ?"
+            params.append(account)
+        if event_types is not None:
+            query += f" AND event_type IN ({','.join('?' * len(event_types))})"
+            params.extend(event_type.value for event_type in event_types)
+        query += " ORDER BY block_number, log_index"
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            PoolEvent(
+                pool_address=web3.Web3.to_checksum_address(row[0]),
+                event_type=row[1],
+                account=web3.Web3.to_checksum_address(row[2]),
+                amount=int(row[3]),
+                block_number=row[4],
+                log_index=row[5],
+                transaction_hash=row[6],
+            )
+            for row in rows
+        ]
+
+    def _save_rows(
+        self,
+        chain: chain_utils.Chain,
+        pool_address: str,
+        rows: list[tuple[str, str, str, int, int, str, str, str]],
+        last_block: int,
+    ) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO pool_events"
+                " (chain, pool_address, transaction_hash, log_index, block_number,"
+                " event_type, account, amount)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO pool_index_state (chain, pool_address, last_block)"
+                " VALUES (?, ?, ?) ON CONFLICT (chain, pool_address)"
+                " DO UPDATE SET last_block = MAX(last_block, excluded.last_block)",
+                (chain.value, pool_address, last_block),
+            )
@@ -1,10 +1,13 @@
 import pathlib
 
 import eth_typing
+import structlog
 import web3
 from huma_utils import chain_utils
 
-from huma_signals import models
+from huma_signals import exceptions, models
+
+logger = structlog.get_logger(__name__)
 
 
 class PoolSetting(models.HumaBaseModel):
@@ -91,3 +94,12 @@ _POOLS = [
 
 
 POOL_REGISTRY = {pool.pool_address: pool for pool in _POOLS}
+
+
+def get_pool_settings(pool_address: str) -> PoolSetting:
+    try:
+        return POOL_REGISTRY[web3.Web3.to_checksum_address(pool_address)]
+    except KeyError as e:
+        message = f"Invalid pool_address {pool_address}: pool settings not found."
+        logger.exception(message)
+        raise exceptions.PoolSettingsNotFoundException(pool_address=pool_address) from e
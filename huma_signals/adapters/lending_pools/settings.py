@@ -6,6 +6,23 @@ class Settings(pydantic.BaseSettings):
         case_sensitive = False
 
     web3_provider_url: str
+    # Whether the pool chains have Multicall3. Without it, the reads of many pools are
+    # made concurrently, and can be batched with `WEB3_RPC_BATCH_WINDOW_SECONDS`.
+    multicall_enabled: bool = True
+
+    # How long cached pool signals stay fresh, and how often the background refresher
+    # re-reads every registered pool. The interval should be shorter than the TTL. 0
+    # disables the cache or the refresher.
+    pool_signals_cache_ttl_seconds: float = 300.0
+    pool_signals_refresh_interval_seconds: float = 60.0
+
+    # When set, pool events are indexed in this SQLite file. Logs are fetched in block
+    # ranges that grow after successful requests and shrink after failed ones, and only
+    # blocks with enough confirmations are indexed.
+    pool_event_index_path: str | None = None
+    pool_event_index_initial_block_range: int = 2_000
+    pool_event_index_max_block_range: int = 100_000
+    pool_event_index_confirmations: int = 12
 
 
 settings = Settings()
@@ -1,13 +1,14 @@
-import datetime
-from typing import Any
+from typing import Any, Sequence
 
 import structlog
-from huma_utils import datetime_utils
+from huma_utils import chain_utils, datetime_utils
 
 from huma_signals import models
 from huma_signals.adapters import models as adapter_models
+from huma_signals.adapters import wallet_signals
 from huma_signals.adapters.polygon_wallet.settings import settings
-from huma_signals.clients.polygon_client import polygon_client, polygon_types
+from huma_signals.clients.polygon_client import polygon_client
+from huma_signals.commons import transaction_columns, transaction_store
 
 logger = structlog.get_logger()
 
@@ -17,8 +18,9 @@ class PolygonWalletSignals(models.HumaBaseModel):
     total_sent: int
     total_received: int
     wallet_tenure_in_days: int
-    total_income_90days: float
+    total_income_90days: int
     total_transactions_90days: int
+    windows: list[wallet_signals.WalletWindowSignals] = []
 
 
 class BasePolygonWalletAdapter(adapter_models.SignalAdapterBase):
@@ -29,67 +31,54 @@ class BasePolygonWalletAdapter(adapter_models.SignalAdapterBase):
 
 
 class PolygonWalletAdapter(BasePolygonWalletAdapter):
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         polygon_client_: polygon_client.BasePolygonClient | None = None,
         polygonscan_base_url: str = settings.polygonscan_base_url,
         polygonscan_api_key: str = settings.polygonscan_api_key,
+        chain: chain_utils.Chain = settings.polygonscan_chain,
+        transaction_store_: transaction_store.WalletTransactionStore | None = None,
+        windows_in_days: Sequence[int] = tuple(settings.wallet_signal_windows_in_days),
     ) -> None:
         self.polygon_client = polygon_client_ or polygon_client.PolygonClient(
             polygonscan_base_url=polygonscan_base_url,
             polygonscan_api_key=polygonscan_api_key,
         )
+        self.chain = chain
+        if transaction_store_ is None and settings.wallet_transaction_store_path:
+            transaction_store_ = transaction_store.WalletTransactionStore(
+                settings.wallet_transaction_store_path,
+                confirmations=settings.wallet_transaction_store_confirmations,
+            )
+        self.transaction_store = transaction_store_
+        self.windows_in_days = windows_in_days
 
     async def fetch(
         self, borrower_wallet_address: str, *args: Any, **kwargs: Any
     ) -> PolygonWalletSignals:
-        transactions = await self.polygon_client.get_transactions(
-            borrower_wallet_address,
-        )
-        now = datetime_utils.tz_aware_utc_now()
-        min_tx_timestamp = (
-            None
-            if len(transactions) == 0
-            else min(tx.time_stamp for tx in transactions)
+        columns = await self._get_transaction_columns(borrower_wallet_address)
+        stats = wallet_signals.compute_wallet_signal_stats(
+            columns,
+            wallet_address=borrower_wallet_address,
+            now=datetime_utils.tz_aware_utc_now(),
+            windows_in_days=self.windows_in_days,
         )
+        return PolygonWalletSignals(**stats.dict())
 
-        return PolygonWalletSignals(
-            total_transactions=len(transactions),
-            total_sent=len(
-                [
-                    tx
-                    for tx in transactions
-                    if tx.from_ == borrower_wallet_address.lower()
-                ]
-            ),
-            total_received=len(
-                [tx for tx in transactions if tx.to == borrower_wallet_address.lower()]
-            ),
-            wallet_tenure_in_days=0
-            if min_tx_timestamp is None
-            else (
-                now
-                - datetime_utils.timestamp_to_tz_aware_utc_datetime(min_tx_timestamp)
-            ).days,
-            total_income_90days=sum(
-                int(tx.value)
-                for tx in transactions
-                if _is_transaction_within_90_days(now=now, transaction=tx)
-                and tx.to == borrower_wallet_address.lower()
-            ),
-            total_transactions_90days=len(
-                [
-                    tx
-                    for tx in transactions
-                    if _is_transaction_within_90_days(now=now, transaction=tx)
-                ]
+    async def _get_transaction_columns(
+        self, wallet_address: str
+    ) -> transaction_columns.TransactionColumns:
+        if self.transaction_store is None:
+            return await self.polygon_client.get_transaction_columns(
+                wallet_address, fields=wallet_signals.WALLET_SIGNAL_FIELDS
+            )
+
+        # Only the transactions mined since the last sync are fetched from the explorer.
+        return await self.transaction_store.sync_transactions(
+            chain=self.chain,
+            address=wallet_address,
+            fetch_since=lambda start_block: self.polygon_client.get_transactions(
+                wallet_address, start_block=start_block
             ),
+            fields=wallet_signals.WALLET_SIGNAL_FIELDS,
         )
-
-
-def _is_transaction_within_90_days(
-    now: datetime.datetime, transaction: polygon_types.PolygonTransaction
-) -> bool:
-    return (
-        now - datetime_utils.timestamp_to_tz_aware_utc_datetime(transaction.time_stamp)
-    ).days < 90
@@ -1,4 +1,5 @@
 import pydantic
+from huma_utils import chain_utils
 
 
 class Settings(pydantic.BaseSettings):
@@ -6,7 +7,16 @@ class Settings(pydantic.BaseSettings):
         case_sensitive = False
 
     polygonscan_base_url: str = "https://api.polygonscan.com"
+    # The chain of the explorer at the base URL, e.g. MUMBAI for its testnet explorer.
+    polygonscan_chain: chain_utils.Chain = chain_utils.Chain.POLYGON
     polygonscan_api_key: str
+    # When set, wallet histories are persisted in this SQLite file and synced incrementally.
+    wallet_transaction_store_path: str | None = None
+    # Stored transactions this many blocks behind the latest one are re-fetched on the
+    # next sync, in case they were reorged out.
+    wallet_transaction_store_confirmations: int = 128
+    # The trailing windows the wallet activity is also reported for, e.g. `[7, 30, 90]`.
+    wallet_signal_windows_in_days: list[int] = [7, 30, 90, 180, 365]
 
 
 settings = Settings()
@@ -1,7 +1,6 @@
 import datetime
 from typing import Any
 
-import pandas as pd
 import structlog
 import web3
 from huma_utils import chain_utils
@@ -13,10 +12,15 @@ from huma_signals.adapters.polygon_wallet import adapter as polygon_wallet_adapt
 from huma_signals.adapters.request_network import models
 from huma_signals.adapters.request_network.settings import settings
 from huma_signals.clients.request_client import request_client
+from huma_signals.commons import async_utils, executors
 
 logger = structlog.get_logger(__name__)
 
-_WALLET_ADAPTER_BY_CHAIN = {
+_WALLET_ADAPTER_BY_CHAIN: dict[
+    chain_utils.Chain,
+    type[ethereum_wallet_adapter.BaseEthereumWalletAdapter]
+    | type[polygon_wallet_adapter.BasePolygonWalletAdapter],
+] = {
     chain_utils.Chain.ETHEREUM: ethereum_wallet_adapter.EthereumWalletAdapter,
     chain_utils.Chain.GOERLI: ethereum_wallet_adapter.EthereumWalletAdapter,
     chain_utils.Chain.POLYGON: polygon_wallet_adapter.PolygonWalletAdapter,
@@ -33,12 +37,23 @@ class RequestInvoiceAdapter(adapter_models.SignalAdapterBase):
         request_network_subgraph_endpoint_url: str = settings.request_network_subgraph_endpoint_url,
         invoice_api_url: str = settings.request_network_invoice_api_url,
         chain: chain_utils.Chain = settings.chain,
+        max_concurrent_fetches: int = 4,
+        cpu_executor: executors.CpuExecutor | None = None,
     ) -> None:
         self.request_client = request_client_ or request_client.RequestClient(
             request_network_subgraph_endpoint_url=request_network_subgraph_endpoint_url,
             invoice_api_url=invoice_api_url,
+            page_size=settings.request_network_subgraph_page_size,
+            pipeline_depth=settings.request_network_subgraph_pipeline_depth,
+            shard_fan_out=settings.request_network_subgraph_shard_fan_out,
         )
         self.chain = chain
+        self.max_concurrent_fetches = max_concurrent_fetches
+        self.cpu_executor = cpu_executor or executors.default_executor
+        self.wallet_adapter: (
+            ethereum_wallet_adapter.BaseEthereumWalletAdapter
+            | polygon_wallet_adapter.BasePolygonWalletAdapter
+        )
         if wallet_adapter is not None:
             self.wallet_adapter = wallet_adapter
         else:
@@ -62,40 +77,25 @@ class RequestInvoiceAdapter(adapter_models.SignalAdapterBase):
             )
 
         invoice = await self.request_client.get_invoice(request_id=receivable_param)
-        records = []
-        records.extend(
-            await self.request_client.get_payments(
-                from_address=invoice.payer, to_address=None
-            )
-        )
-        records.extend(
-            await self.request_client.get_payments(
-                from_address=None, to_address=invoice.payee
-            )
-        )
-        payments_df = pd.DataFrame.from_records(records)
-        enriched_payments_df = self.request_client.enrich_payments_data(
-            payments_df, chain=self.chain
-        )
-
-        payer_stats = self.request_client.get_payment_stats(
-            enriched_payments_df[enriched_payments_df["from"] == invoice.payer]
-        )
-        payee_stats = self.request_client.get_payment_stats(
-            enriched_payments_df[enriched_payments_df["to"] == invoice.payee]
-        )
-        pair_stats = self.request_client.get_payment_stats(
-            enriched_payments_df[
-                (enriched_payments_df["from"] == invoice.payer)
-                & (enriched_payments_df["to"] == invoice.payee)
-            ]
-        )
-
-        # Fetch wallet tenure
+        # The remaining fetches only depend on the invoice's parties, so they run
+        # concurrently.
         payee_wallet: ethereum_wallet_adapter.EthereumWalletSignals | polygon_wallet_adapter.PolygonWalletSignals
         payer_wallet: ethereum_wallet_adapter.EthereumWalletSignals | polygon_wallet_adapter.PolygonWalletSignals
-        payee_wallet = await self.wallet_adapter.fetch(invoice.payee)
-        payer_wallet = await self.wallet_adapter.fetch(invoice.payer)
+        (
+            (payer_stats, payee_stats, pair_stats),
+            payer_wallet,
+            payee_wallet,
+        ) = await async_utils.gather_bounded(
+            self.request_client.get_party_payment_stats(
+                payer_address=invoice.payer,
+                payee_address=invoice.payee,
+                chain=self.chain,
+                cpu_executor=self.cpu_executor,
+            ),
+            self.wallet_adapter.fetch(invoice.payer),
+            self.wallet_adapter.fetch(invoice.payee),
+            max_concurrency=self.max_concurrent_fetches,
+        )
 
         return models.RequestInvoiceSignals(
             payer_tenure=payer_wallet.wallet_tenure_in_days,
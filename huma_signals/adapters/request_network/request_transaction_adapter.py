@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Sequence
 
 import pandas as pd
 import structlog
@@ -12,10 +12,15 @@ from huma_signals.adapters.polygon_wallet import adapter as polygon_wallet_adapt
 from huma_signals.adapters.request_network import models
 from huma_signals.adapters.request_network.settings import settings
 from huma_signals.clients.request_client import request_client
+from huma_signals.commons import async_utils, executors
 
 logger = structlog.get_logger(__name__)
 
-_WALLET_ADAPTER_BY_CHAIN = {
+_WALLET_ADAPTER_BY_CHAIN: dict[
+    chain_utils.Chain,
+    type[ethereum_wallet_adapter.BaseEthereumWalletAdapter]
+    | type[polygon_wallet_adapter.BasePolygonWalletAdapter],
+] = {
     chain_utils.Chain.ETHEREUM: ethereum_wallet_adapter.EthereumWalletAdapter,
     chain_utils.Chain.GOERLI: ethereum_wallet_adapter.EthereumWalletAdapter,
     chain_utils.Chain.POLYGON: polygon_wallet_adapter.PolygonWalletAdapter,
@@ -32,12 +37,23 @@ class RequestTransactionAdapter(adapter_models.SignalAdapterBase):
         request_network_subgraph_endpoint_url: str = settings.request_network_subgraph_endpoint_url,
         invoice_api_url: str = settings.request_network_invoice_api_url,
         chain: chain_utils.Chain = settings.chain,
+        max_concurrent_fetches: int = 4,
+        cpu_executor: executors.CpuExecutor | None = None,
     ) -> None:
         self.request_client = request_client_ or request_client.RequestClient(
             request_network_subgraph_endpoint_url=request_network_subgraph_endpoint_url,
             invoice_api_url=invoice_api_url,
+            page_size=settings.request_network_subgraph_page_size,
+            pipeline_depth=settings.request_network_subgraph_pipeline_depth,
+            shard_fan_out=settings.request_network_subgraph_shard_fan_out,
         )
         self.chain = chain
+        self.max_concurrent_fetches = max_concurrent_fetches
+        self.cpu_executor = cpu_executor or executors.default_executor
+        self.wallet_adapter: (
+            ethereum_wallet_adapter.BaseEthereumWalletAdapter
+            | polygon_wallet_adapter.BasePolygonWalletAdapter
+        )
         if wallet_adapter is not None:
             self.wallet_adapter = wallet_adapter
         else:
@@ -55,57 +71,136 @@ class RequestTransactionAdapter(adapter_models.SignalAdapterBase):
         *args: Any,
         **kwargs: Any,
     ) -> models.RequestTransactionSignals:
-        if not web3.Web3.is_address(payer_address):
-            raise exceptions.InvalidAddressException(
-                f"Invalid payer address: {payer_address}"
-            )
-        if not web3.Web3.is_address(payee_address):
-            raise exceptions.InvalidAddressException(
-                f"Invalid payee address: {payee_address}"
-            )
+        _validate_addresses(payer_address, payee_address)
 
-        payer_payments = await self.request_client.get_payments(
-            from_address=payer_address,
-            to_address=None,
-        )
-        payee_payments = await self.request_client.get_payments(
-            from_address=None,
-            to_address=payee_address,
-        )
-        payments_df = pd.DataFrame.from_records([*payer_payments, *payee_payments])
-        enriched_payments_df = self.request_client.enrich_payments_data(
-            payments_df, self.chain
+        payee_wallet: ethereum_wallet_adapter.EthereumWalletSignals | polygon_wallet_adapter.PolygonWalletSignals
+        payer_wallet: ethereum_wallet_adapter.EthereumWalletSignals | polygon_wallet_adapter.PolygonWalletSignals
+        (
+            (payer_stats, payee_stats, pair_stats),
+            payer_wallet,
+            payee_wallet,
+        ) = await async_utils.gather_bounded(
+            self.request_client.get_party_payment_stats(
+                payer_address=payer_address,
+                payee_address=payee_address,
+                chain=self.chain,
+                cpu_executor=self.cpu_executor,
+            ),
+            self.wallet_adapter.fetch(payer_address),
+            self.wallet_adapter.fetch(payee_address),
+            max_concurrency=self.max_concurrent_fetches,
         )
 
-        payer_stats = self.request_client.get_payment_stats(
-            enriched_payments_df[enriched_payments_df["from"] == payer_address]
+        return _to_signals(
+            payer_stats, payee_stats, pair_stats, payer_wallet, payee_wallet
         )
-        payee_stats = self.request_client.get_payment_stats(
-            enriched_payments_df[enriched_payments_df["to"] == payee_address]
+
+    async def fetch_many(
+        self, pairs: Sequence[tuple[str, str]]
+    ) -> list[models.RequestTransactionSignals]:
+        """
+        Fetches the signals of many (payer address, payee address) pairs at once.
+
+        The payments of all payers and payees are fetched with shared batched queries
+        instead of one pagination per pair, and each wallet is only fetched once.
+        """
+        for payer_address, payee_address in pairs:
+            _validate_addresses(payer_address, payee_address)
+
+        payer_addresses = list(dict.fromkeys(payer for payer, _ in pairs))
+        payee_addresses = list(dict.fromkeys(payee for _, payee in pairs))
+        wallet_addresses = list(dict.fromkeys([*payer_addresses, *payee_addresses]))
+        (
+            payments_by_payer,
+            payments_by_payee,
+        ), *wallets = await async_utils.gather_bounded(
+            self.request_client.get_payments_by_party(
+                payer_addresses=payer_addresses, payee_addresses=payee_addresses
+            ),
+            *(self.wallet_adapter.fetch(address) for address in wallet_addresses),
+            max_concurrency=self.max_concurrent_fetches,
         )
-        pair_stats = self.request_client.get_payment_stats(
-            enriched_payments_df[
-                (enriched_payments_df["from"] == payer_address)
-                & (enriched_payments_df["to"] == payee_address)
-            ]
+        wallet_by_address = dict(zip(wallet_addresses, wallets))
+        payments = [
+            payment
+            for payments_by_address in (payments_by_payer, payments_by_payee)
+            for payments in payments_by_address.values()
+            for payment in payments
+        ]
+        pair_stats_list = await self.cpu_executor.run(
+            _get_pair_payment_stats,
+            type(self.request_client),
+            payments,
+            self.chain,
+            pairs,
+            size=len(payments),
         )
 
-        payee_wallet: ethereum_wallet_adapter.EthereumWalletSignals | polygon_wallet_adapter.PolygonWalletSignals
-        payer_wallet: ethereum_wallet_adapter.EthereumWalletSignals | polygon_wallet_adapter.PolygonWalletSignals
-        payee_wallet = await self.wallet_adapter.fetch(payee_address)
-        payer_wallet = await self.wallet_adapter.fetch(payer_address)
-
-        return models.RequestTransactionSignals(
-            payer_tenure=payer_wallet.wallet_tenure_in_days,
-            payer_recent=int(payer_stats.get("last_txn_age_in_days", 0)),
-            payer_count=int(payer_stats.get("total_txns", 0)),
-            payer_total_amount=int(payer_stats.get("total_amount", 0)),
-            payer_unique_payees=int(payer_stats.get("unique_payees", 0)),
-            payee_tenure=payee_wallet.wallet_tenure_in_days,
-            payee_recent=int(payee_stats.get("last_txn_age_in_days", 0)),
-            payee_count=int(payee_stats.get("total_txns", 0)),
-            payee_total_amount=int(payee_stats.get("total_amount", 0)),
-            payee_unique_payers=int(payee_stats.get("unique_payers", 0)),
-            mutual_count=int(pair_stats.get("total_txns", 0)),
-            mutual_total_amount=int(pair_stats.get("total_amount", 0)),
+        return [
+            _to_signals(
+                payer_stats,
+                payee_stats,
+                pair_stats,
+                wallet_by_address[payer_address],
+                wallet_by_address[payee_address],
+            )
+            for (payer_address, payee_address), (
+                payer_stats,
+                payee_stats,
+                pair_stats,
+            ) in zip(pairs, pair_stats_list)
+        ]
+
+
+def _get_pair_payment_stats(
+    client_cls: type[request_client.BaseRequestClient],
+    payments: list[dict[str, Any]],
+    chain: chain_utils.Chain,
+    pairs: Sequence[tuple[str, str]],
+) -> list[
+    tuple[
+        request_client.PaymentStats,
+        request_client.PaymentStats,
+        request_client.PaymentStats,
+    ]
+]:
+    enriched_payments_df = client_cls.enrich_payments_data(
+        pd.DataFrame.from_records(payments), chain, compact=True
+    )
+    return client_cls.get_pair_payment_stats(enriched_payments_df, pairs)
+
+
+def _validate_addresses(payer_address: str, payee_address: str) -> None:
+    if not web3.Web3.is_address(payer_address):
+        raise exceptions.InvalidAddressException(
+            f"Invalid payer address: {payer_address}"
+        )
+    if not web3.Web3.is_address(payee_address):
+        raise exceptions.InvalidAddressException(
+            f"Invalid payee address: {payee_address}"
         )
+
+
+def _to_signals(
+    payer_stats: request_client.PaymentStats,
+    payee_stats: request_client.PaymentStats,
+    pair_stats: request_client.PaymentStats,
+    payer_wallet: ethereum_wallet_adapter.EthereumWalletSignals
+    | polygon_wallet_adapter.PolygonWalletSignals,
+    payee_wallet: ethereum_wallet_adapter.EthereumWalletSignals
+    | polygon_wallet_adapter.PolygonWalletSignals,
+) -> models.RequestTransactionSignals:
+    return models.RequestTransactionSignals(
+        payer_tenure=payer_wallet.wallet_tenure_in_days,
+        payer_recent=int(payer_stats.get("last_txn_age_in_days", 0)),
+        payer_count=int(payer_stats.get("total_txns", 0)),
+        payer_total_amount=int(payer_stats.get("total_amount", 0)),
+        payer_unique_payees=int(payer_stats.get("unique_payees", 0)),
+        payee_tenure=payee_wallet.wallet_tenure_in_days,
+        payee_recent=int(payee_stats.get("last_txn_age_in_days", 0)),
+        payee_count=int(payee_stats.get("total_txns", 0)),
+        payee_total_amount=int(payee_stats.get("total_amount", 0)),
+        payee_unique_payers=int(payee_stats.get("unique_payers", 0)),
+        mutual_count=int(pair_stats.get("total_txns", 0)),
+        mutual_total_amount=int(pair_stats.get("total_amount", 0)),
+    )
@@ -9,6 +9,10 @@ class Settings(pydantic.BaseSettings):
     chain: chain_utils.Chain
     request_network_subgraph_endpoint_url: str
     request_network_invoice_api_url: str
+    # Pages of payments to keep in flight, and id ranges to paginate concurrently.
+    request_network_subgraph_page_size: int = 1000
+    request_network_subgraph_pipeline_depth: int = 1
+    request_network_subgraph_shard_fan_out: int = 1
 
 
 settings = Settings()
@@ -1,4 +1,3 @@
-import httpx
 import structlog
 import web3
 from huma_utils import chain_utils
@@ -7,6 +6,7 @@ from huma_signals import exceptions
 from huma_signals.adapters import models as adapter_models
 from huma_signals.adapters.superfluid import superfluid_models
 from huma_signals.adapters.superfluid.settings import settings
+from huma_signals.commons import http_client_pool, rate_limiter
 
 logger = structlog.get_logger()
 
@@ -38,9 +38,15 @@ class SuperfluidAdapter(adapter_models.SignalAdapterBase):
         self,
         superfluid_subgraph_endpoint_url: str = settings.superfluid_subgraph_endpoint_url,
         chain: chain_utils.Chain = settings.chain,
+        http_client_pool_: http_client_pool.HttpClientPool | None = None,
+        rate_limiter_registry: rate_limiter.RateLimiterRegistry | None = None,
     ) -> None:
         self.superfluid_subgraph_endpoint_url = superfluid_subgraph_endpoint_url
         self.chain = chain
+        self.http_client_pool = http_client_pool_ or http_client_pool.default_pool
+        self.subgraph_rate_limiter = (
+            rate_limiter_registry or rate_limiter.default_registry
+        ).get(rate_limiter.Upstream.SUPERFLUID_SUBGRAPH)
 
     async def fetch(  # pylint: disable=arguments-differ
         self,
@@ -82,21 +88,22 @@ class SuperfluidAdapter(adapter_models.SignalAdapterBase):
     async def _get_current_stream(
         self, sender_address: str, receiver_address: str, token_address: str
     ) -> superfluid_models.SuperfluidStream:
+        client = self.http_client_pool.get_client()
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    self.superfluid_subgraph_endpoint_url,
-                    json={
-                        "query": _CURRENT_STREAM_QUERY,
-                        "variables": {
-                            "sender": sender_address,
-                            "receiver": receiver_address,
-                            "token": token_address,
-                        },
+            await self.subgraph_rate_limiter.acquire()
+            resp = await client.post(
+                self.superfluid_subgraph_endpoint_url,
+                json={
+                    "query": _CURRENT_STREAM_QUERY,
+                    "variables": {
+                        "sender": sender_address,
+                        "receiver": receiver_address,
+                        "token": token_address,
                     },
-                )
-                streams = resp.json()["data"]["streams"]
-                return superfluid_models.SuperfluidStream(**streams[0])
+                },
+            )
+            streams = resp.json()["data"]["streams"]
+            return superfluid_models.SuperfluidStream(**streams[0])
         except KeyError as e:
             message = "No data returned from query"
             logger.exception(message, resp_body=resp.json())
@@ -0,0 +1,115 @@
+import datetime
+from typing import Sequence
+
+import numpy as np
+
+from huma_signals import models
+from huma_signals.commons import fixed_point, transaction_columns
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECONDS_PER_SECOND = 10**6
+_MICROSECONDS_PER_DAY = 86_400 * _MICROSECONDS_PER_SECOND
+
+# The only transaction fields the wallet signals are computed from.
+WALLET_SIGNAL_FIELDS = frozenset(
+    {
+        transaction_columns.TransactionField.TIME_STAMP,
+        transaction_columns.TransactionField.FROM,
+        transaction_columns.TransactionField.TO,
+        transaction_columns.TransactionField.VALUE,
+    }
+)
+
+
+class WalletWindowSignals(models.HumaBaseModel):
+    window_in_days: int
+    total_transactions: int
+    total_sent: int
+    total_received: int
+    total_income: int
+
+
+class WalletSignalStats(models.HumaBaseModel):
+    total_transactions: int
+    total_sent: int
+    total_received: int
+    wallet_tenure_in_days: int
+    total_income_90days: int
+    total_transactions_90days: int
+    windows: list[WalletWindowSignals]
+
+
+def compute_wallet_signal_stats(
+    columns: transaction_columns.TransactionColumns,
+    wallet_address: str,
+    now: datetime.datetime,
+    windows_in_days: Sequence[int] = (),
+) -> WalletSignalStats:
+    """
+    Computes the wallet signals shared by the Ethereum and Polygon wallet adapters from
+    the wallet's transaction columns, including the activity within each of the trailing
+    `windows_in_days`.
+
+    Transactions are in the window if they're less than that many days old, where days
+    are floored as in `datetime.timedelta.days`. With the timestamps sorted, the start
+    of each window is found by binary search and its income by a prefix sum, so every
+    window after the first sort costs O(log n).
+    """
+    if columns.time_stamp is None or columns.from_index is None:
+        raise ValueError("The wallet signals need the time_stamp and from columns")
+    if columns.to_index is None:
+        raise ValueError("The wallet signals need the to column")
+
+    # The explorers return transactions in ascending order, so this rarely sorts.
+    order = np.arange(len(columns))
+    if np.any(columns.time_stamp[1:] < columns.time_stamp[:-1]):
+        order = np.argsort(columns.time_stamp, kind="stable")
+    time_stamp = columns.time_stamp[order]
+
+    wallet_index = columns.address_index(wallet_address)
+    if wallet_index is None:
+        sent = received = np.zeros(len(columns), dtype=np.bool_)
+    else:
+        sent = columns.from_index[order] == wallet_index
+        received = columns.to_index[order] == wallet_index
+    sent_time_stamp = time_stamp[sent]
+    received_time_stamp = time_stamp[received]
+    if columns.value_limbs is None:
+        raise ValueError("The wallet signals need the value column")
+    income_prefix_sums = fixed_point.prefix_sums(columns.value_limbs[order[received]])
+
+    now_us = (now - _EPOCH) // datetime.timedelta(microseconds=1)
+
+    def _window(days: int) -> WalletWindowSignals:
+        # A whole-second timestamp `ts` is in the window iff
+        # `now_us - ts * 10**6 < days * _MICROSECONDS_PER_DAY`, i.e. iff it's
+        # greater than this cutoff.
+        cutoff = (now_us - days * _MICROSECONDS_PER_DAY) // _MICROSECONDS_PER_SECOND
+        received_start = int(np.searchsorted(received_time_stamp, cutoff, side="right"))
+        return WalletWindowSignals(
+            window_in_days=days,
+            total_transactions=len(time_stamp)
+            - int(np.searchsorted(time_stamp, cutoff, side="right")),
+            total_sent=len(sent_time_stamp)
+            - int(np.searchsorted(sent_time_stamp, cutoff, side="right")),
+            total_received=len(received_time_stamp) - received_start,
+            total_income=fixed_point.combine_limb_sums(
+                income_prefix_sums[-1] - income_prefix_sums[received_start]
+            ),
+        )
+
+    window_90days = _window(90)
+    return WalletSignalStats(
+        total_transactions=len(time_stamp),
+        total_sent=len(sent_time_stamp),
+        total_received=len(received_time_stamp),
+        wallet_tenure_in_days=0
+        if len(time_stamp) == 0
+        else (now_us - int(time_stamp[0]) * _MICROSECONDS_PER_SECOND)
+        // _MICROSECONDS_PER_DAY,
+        total_income_90days=window_90days.total_income,
+        total_transactions_90days=window_90days.total_transactions,
+        windows=[
+            window_90days if days == 90 else _window(days) for days in windows_in_days
+        ],
+    )
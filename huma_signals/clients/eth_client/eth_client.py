@@ -1,46 +1,121 @@
-from typing import Protocol
+from typing import Any, Protocol
 
 import httpx
 import structlog
 
 from huma_signals.clients.eth_client import eth_types
+from huma_signals.commons import (
+    block_explorer,
+    block_ranges,
+    http_client_pool,
+    rate_limiter,
+    single_flight,
+    transaction_columns,
+)
 
 logger = structlog.get_logger(__name__)
 
 
 class BaseEthClient(Protocol):
     async def get_transactions(
-        self, wallet_address: str
+        self, wallet_address: str, start_block: int = 0
     ) -> list[eth_types.EthTransaction]:
         pass
 
+    async def get_transaction_columns(
+        self,
+        wallet_address: str,
+        start_block: int = 0,
+        fields: frozenset[
+            transaction_columns.TransactionField
+        ] = transaction_columns.ALL_FIELDS,
+    ) -> transaction_columns.TransactionColumns:
+        pass
+
 
 class EthClient:
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         etherscan_base_url: str,
         etherscan_api_key: str,
+        http_client_pool_: http_client_pool.HttpClientPool | None = None,
+        range_fan_out: int = 4,
+        max_concurrent_requests: int = 4,
+        rate_limiter_registry: rate_limiter.RateLimiterRegistry | None = None,
+        single_flight_group: single_flight.SingleFlight | None = None,
     ) -> None:
         self.etherscan_base_url = etherscan_base_url
-        self.etherscan_api_key = etherscan_api_key
+        # Several comma-separated API keys can be given to multiply the rate limit.
+        self.etherscan_api_keys = rate_limiter.parse_api_keys(etherscan_api_key)
+        self.http_client_pool = http_client_pool_ or http_client_pool.default_pool
+        self.api_key_pool = (
+            rate_limiter_registry or rate_limiter.default_registry
+        ).get_api_key_pool(rate_limiter.Upstream.ETHERSCAN, self.etherscan_api_keys)
+        self.range_fan_out = range_fan_out
+        self.max_concurrent_requests = max_concurrent_requests
+        self.single_flight_group = single_flight_group or single_flight.default_group
 
     async def get_transactions(
-        self, wallet_address: str
+        self, wallet_address: str, start_block: int = 0
     ) -> list[eth_types.EthTransaction]:
+        """
+        Returns the transaction history of the wallet from `start_block` onwards. Block
+        ranges that hit the explorer's 10k records cap are split up and fetched
+        concurrently. Concurrent calls for the same wallet share a single upstream fetch.
+        """
+        rows = await self._get_raw_transactions(wallet_address, start_block=start_block)
+        return [eth_types.EthTransaction(**row) for row in rows]
+
+    async def get_transaction_columns(
+        self,
+        wallet_address: str,
+        start_block: int = 0,
+        fields: frozenset[
+            transaction_columns.TransactionField
+        ] = transaction_columns.ALL_FIELDS,
+    ) -> transaction_columns.TransactionColumns:
+        """
+        Same as `get_transactions`, but decodes only the given fields into compact
+        columns instead of validating a model per transaction.
+        """
+        rows = await self._get_raw_transactions(wallet_address, start_block=start_block)
+        return transaction_columns.TransactionColumns.from_rows(rows, fields=fields)
+
+    async def _get_raw_transactions(
+        self, wallet_address: str, start_block: int
+    ) -> list[dict[str, Any]]:
+        # The raw rows are shared between coalesced callers, so they're never mutated.
+        return await self.single_flight_group.do(
+            (
+                "eth_client",
+                self.etherscan_base_url,
+                wallet_address.lower(),
+                start_block,
+            ),
+            lambda: block_ranges.fetch_block_range(
+                fetch_page=lambda start, end: self._get_transactions_in_range(
+                    wallet_address, start_block=start, end_block=end
+                ),
+                get_block_number=lambda row: int(row["blockNumber"]),
+                get_key=lambda row: row["hash"],
+                start_block=start_block,
+                fan_out=self.range_fan_out,
+                max_concurrency=self.max_concurrent_requests,
+            ),
+        )
+
+    async def _get_transactions_in_range(
+        self, wallet_address: str, start_block: int, end_block: int
+    ) -> list[dict[str, Any]]:
+        client = self.http_client_pool.get_client(self.etherscan_base_url)
+        request = (
+            f"/api?module=account&action=txlist"
+            f"&address={wallet_address}"
+            f"&startblock={start_block}&endblock={end_block}"
+            f"&sort=asc"
+        )
         try:
-            async with httpx.AsyncClient(base_url=self.etherscan_base_url) as client:
-                request = (
-                    f"/api?module=account&action=txlist"
-                    f"&address={wallet_address}"
-                    f"&startblock=0&endblock=99999999"
-                    f"&sort=asc"
-                    f"&apikey={self.etherscan_api_key}"
-                )
-                resp = await client.get(request)
-                resp.raise_for_status()
-                payload = eth_types.EthTransactionResponse(**resp.json())
-                if payload.status == "1":
-                    return payload.result
+            return await block_explorer.get_result(client, request, self.api_key_pool)
         except httpx.HTTPStatusError:
             logger.exception("Error fetching transactions", request=request)
 
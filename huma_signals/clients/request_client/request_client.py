@@ -1,8 +1,12 @@
+import asyncio
+import collections
 import datetime
 import decimal
-from typing import Any, Protocol
+import json
+from typing import Any, AsyncIterator, Collection, Mapping, Protocol, Sequence
 
 import httpx
+import numpy as np
 import pandas as pd
 import structlog
 import web3
@@ -10,11 +14,285 @@ from huma_utils import chain_utils
 
 from huma_signals import exceptions
 from huma_signals.clients.request_client import request_types
-from huma_signals.commons import tokens
+from huma_signals.commons import (
+    async_utils,
+    executors,
+    fixed_point,
+    http_client_pool,
+    rate_limiter,
+    single_flight,
+    tokens,
+)
 
 logger = structlog.get_logger(__name__)
 
 _DEFAULT_GRAPHQL_CHUNK_SIZE = 1000
+# Addresses per `from_in`/`to_in` filter when fetching the payments of many addresses.
+_DEFAULT_ADDRESS_BATCH_SIZE = 100
+# The Graph rejects queries that skip more than this many records.
+_MAX_GRAPHQL_SKIP = 5000
+_PAYMENT_FIELDS = """
+    id
+    contractAddress
+    tokenAddress
+    to
+    from
+    timestamp
+    txHash
+    amount
+    currency
+    amountInCrypto
+"""
+
+
+def _build_payments_field(
+    where: Mapping[str, str | list[str]],
+    last_id: str,
+    page_size: int,
+    skip: int = 0,
+    alias: str | None = None,
+) -> str:
+    where_clause = "".join(
+        f"{key}: {json.dumps(value)},\n" for key, value in where.items()
+    )
+    field_name = f"{alias}: payments" if alias else "payments"
+    return f"""
+        {field_name}(
+            first: {page_size},
+            skip: {skip},
+            where: {{
+                {where_clause}
+                id_gt: "{last_id}"
+            }}
+            orderBy: id,
+            orderDirection: asc
+        ) {{{_PAYMENT_FIELDS}}}
+    """
+
+
+def _id_shards(fan_out: int) -> list[dict[str, str]]:
+    """
+    Splits the payment id space into `fan_out` contiguous ranges by the leading hex
+    digits of the ids, which are hex strings starting with `0x`. The first and the last
+    range are open-ended, so ids of any other shape still land in some range.
+    """
+    boundaries = [f"0x{i * 16**4 // fan_out:04x}" for i in range(1, fan_out)]
+    shards = []
+    for i in range(fan_out):
+        shard_where = {}
+        if i > 0:
+            shard_where["id_gte"] = boundaries[i - 1]
+        if i < fan_out - 1:
+            shard_where["id_lt"] = boundaries[i]
+        shards.append(shard_where)
+    return shards
+
+
+def _page_alias(alias: str, shard: int, page: int) -> str:
+    # The first page of the first shard keeps the plain alias.
+    return alias if shard == page == 0 else f"{alias}_{shard}_{page}"
+
+
+def _payments_where(from_address: str | None, to_address: str | None) -> dict[str, str]:
+    where = {}
+    if from_address:
+        where["from"] = from_address
+    if to_address:
+        where["to"] = to_address
+    return where
+
+
+def _batch_addresses(addresses: Collection[str], batch_size: int) -> list[list[str]]:
+    unique_addresses = list(
+        {address.lower(): address for address in addresses}.values()
+    )
+    return [
+        unique_addresses[i : i + batch_size]
+        for i in range(0, len(unique_addresses), batch_size)
+    ]
+
+
+def _get_payments_chunk(data: dict[str, Any], field_name: str) -> list[dict[str, Any]]:
+    try:
+        return data[field_name]
+    except KeyError as e:
+        message = "No data returned from query"
+        logger.exception(message, field_name=field_name)
+        raise exceptions.RequestException(message=message) from e
+
+
+PaymentStats = dict[str, int | decimal.Decimal]
+PaymentsByAddress = dict[str, list[dict[str, Any]]]
+
+
+class PaymentStatsAccumulator:
+    """
+    Computes the stats of `BaseRequestClient.get_payment_stats` incrementally from
+    batches of enriched payments, so that they can be computed while the payments are
+    being paged through without holding on to them.
+
+    Payments must be added once each, since only the distinct payees and payers are
+    kept, so memory grows with the number of counterparties rather than of payments.
+    """
+
+    def __init__(self) -> None:
+        self.total_amount = 0
+        self.total_txns = 0
+        self.earliest_txn_time: datetime.datetime | None = None
+        self.last_txn_time: datetime.datetime | None = None
+        self._payees: set[str] = set()
+        self._payers: set[str] = set()
+
+    def add(self, enriched_df: pd.DataFrame) -> None:
+        if len(enriched_df) == 0:
+            return
+
+        self._payees.update(enriched_df["to"].dropna())
+        self._payers.update(enriched_df["from"].dropna())
+        self.total_amount += int(enriched_df.amount_usd.sum())
+        self.total_txns += len(enriched_df)
+        earliest_txn_time = enriched_df.txn_time.min()
+        last_txn_time = enriched_df.txn_time.max()
+        if self.earliest_txn_time is None or earliest_txn_time < self.earliest_txn_time:
+            self.earliest_txn_time = earliest_txn_time
+        if self.last_txn_time is None or last_txn_time > self.last_txn_time:
+            self.last_txn_time = last_txn_time
+
+    def result(self) -> PaymentStats:
+        if self.earliest_txn_time is None or self.last_txn_time is None:
+            return _empty_payment_stats()
+        return _payment_stats(
+            total_amount=self.total_amount,
+            total_txns=self.total_txns,
+            earliest_txn_time=self.earliest_txn_time,
+            last_txn_time=self.last_txn_time,
+            unique_payees=len(self._payees),
+            unique_payers=len(self._payers),
+            now=datetime.datetime.now(),
+        )
+
+
+def _split_party_payments(
+    client_cls: type["BaseRequestClient"],
+    payments: list[dict[str, Any]],
+    chain: chain_utils.Chain,
+    payer_address: str,
+    payee_address: str,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Enriches a page of payments and splits out the payer's, the payee's and their mutual
+    payments. Module-level so that it can run in a process pool.
+    """
+    enriched_df = client_cls.enrich_payments_data(
+        pd.DataFrame.from_records(payments), chain=chain, compact=True
+    )
+    is_from_payer = enriched_df["from"] == payer_address
+    is_to_payee = enriched_df["to"] == payee_address
+    return (
+        enriched_df[is_from_payer],
+        enriched_df[is_to_payee],
+        enriched_df[is_from_payer & is_to_payee],
+    )
+
+
+_PAYMENT_ADDRESS_COLUMNS = ("contractAddress", "tokenAddress", "to", "from")
+
+
+def _enrich_payments_data_compact(
+    payments_raw_df: pd.DataFrame, chain: chain_utils.Chain
+) -> pd.DataFrame:
+    raw_df = (
+        payments_raw_df
+        if payments_raw_df["id"].is_unique
+        else payments_raw_df.drop_duplicates("id")
+    )
+    columns = {
+        column: raw_df[column].astype("category")
+        if column in _PAYMENT_ADDRESS_COLUMNS
+        else raw_df[column]
+        for column in raw_df.columns
+    }
+
+    # Token symbols and prices are looked up once per distinct token address, and
+    # broadcast through the category codes. Missing addresses have code -1, which
+    # picks the trailing "Other".
+    token_addresses = columns["tokenAddress"].cat
+    address_mapping = tokens.TOKEN_ADDRESS_MAPPING.get(chain, {})
+    symbols = [address_mapping.get(a, "Other") for a in token_addresses.categories]
+    symbol_categories = list(dict.fromkeys([*symbols, "Other"]))
+    symbol_codes = np.array(
+        [symbol_categories.index(symbol) for symbol in [*symbols, "Other"]],
+        dtype=np.int32,
+    )[token_addresses.codes.to_numpy()]
+    symbol_prices = np.array(
+        [tokens.TOKEN_USD_PRICE_MAPPING.get(s, 0.0) for s in symbol_categories]
+    )
+
+    amounts = fixed_point.to_int_array(raw_df.amount)
+    amount_usd = np.zeros(len(raw_df), dtype=amounts.dtype)
+    for token_symbol, token in tokens.TOKENS.items():
+        if token_symbol in symbol_categories:
+            is_token = symbol_codes == symbol_categories.index(token_symbol)
+            amount_usd[is_token] = token.to_usd(amounts[is_token])
+
+    index = raw_df.index
+    columns["amount"] = pd.Series(amounts, index=index)
+    columns["txn_time"] = pd.to_datetime(raw_df.timestamp, unit="s")
+    columns["token_symbol"] = pd.Series(
+        pd.Categorical.from_codes(symbol_codes, categories=pd.Index(symbol_categories)),
+        index=index,
+    )
+    columns["token_usd_price"] = pd.Series(symbol_prices[symbol_codes], index=index)
+    columns["amount_usd"] = pd.Series(amount_usd, index=index)
+    return pd.DataFrame(columns, copy=False)
+
+
+def _empty_payment_stats() -> PaymentStats:
+    return {
+        "total_amount": 0,
+        "total_txns": 0,
+        "earliest_txn_age_in_days": 0,
+        "last_txn_age_in_days": 999,
+        "unique_payees": 0,
+        "unique_payers": 0,
+    }
+
+
+def _roll_up_pair_stats(
+    by_pair: pd.DataFrame, level: str, counterparty_level: str
+) -> pd.DataFrame:
+    # Each (payer, payee) group is one distinct counterparty, unless it's missing.
+    is_counterparty = by_pair.index.get_level_values(counterparty_level) != ""
+    return (
+        by_pair.assign(is_counterparty=is_counterparty)
+        .groupby(level=level, observed=True)
+        .agg(
+            total_amount=pd.NamedAgg("total_amount", "sum"),
+            total_txns=pd.NamedAgg("total_txns", "sum"),
+            earliest_txn_time=pd.NamedAgg("earliest_txn_time", "min"),
+            last_txn_time=pd.NamedAgg("last_txn_time", "max"),
+            counterparties=pd.NamedAgg("is_counterparty", "sum"),
+        )
+    )
+
+
+def _payment_stats(  # pylint: disable=too-many-arguments
+    total_amount: int,
+    total_txns: int,
+    earliest_txn_time: datetime.datetime,
+    last_txn_time: datetime.datetime,
+    unique_payees: int,
+    unique_payers: int,
+    now: datetime.datetime,
+) -> PaymentStats:
+    return {
+        "total_amount": total_amount,
+        "total_txns": total_txns,
+        "earliest_txn_age_in_days": (now - earliest_txn_time).days,
+        "last_txn_age_in_days": (now - last_txn_time).days,
+        "unique_payees": unique_payees,
+        "unique_payers": unique_payers,
+    }
 
 
 class BaseRequestClient(Protocol):
@@ -25,15 +303,99 @@ class BaseRequestClient(Protocol):
     ) -> list[dict[str, Any]]:
         pass
 
+    async def get_payments_for_parties(
+        self,
+        payer_address: str | None,
+        payee_address: str | None,
+    ) -> list[dict[str, Any]]:
+        pass
+
+    async def get_payments_by_party(
+        self,
+        payer_addresses: Collection[str],
+        payee_addresses: Collection[str],
+    ) -> tuple[PaymentsByAddress, PaymentsByAddress]:
+        pass
+
+    def iter_payments(
+        self,
+        from_address: str | None,
+        to_address: str | None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        pass
+
+    def iter_payments_for_parties(
+        self,
+        payer_address: str | None,
+        payee_address: str | None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        pass
+
     async def get_invoice(self, request_id: str) -> request_types.Invoice:
         pass
 
+    async def get_party_payment_stats(
+        self,
+        payer_address: str,
+        payee_address: str,
+        chain: chain_utils.Chain,
+        cpu_executor: executors.CpuExecutor | None = None,
+    ) -> tuple[PaymentStats, PaymentStats, PaymentStats]:
+        """
+        Returns the payment stats of the payer, of the payee and of the payments between
+        them, computed while the pages of their payments arrive.
+
+        Pages are enriched and split through `cpu_executor`, inline by default. They are
+        buffered until they reach the executor's inline threshold, so that the payments
+        of a party with more payments than the threshold are offloaded even though each
+        page is smaller than it.
+        """
+        executor = cpu_executor or executors.inline_executor
+        payer_stats = PaymentStatsAccumulator()
+        payee_stats = PaymentStatsAccumulator()
+        mutual_stats = PaymentStatsAccumulator()
+        buffered: list[dict[str, Any]] = []
+        total_rows = 0
+
+        async def _add_buffered() -> None:
+            # The last, partial batch is offloaded as well if the party's payments as a
+            # whole reach the threshold.
+            payer_df, payee_df, mutual_df = await executor.run(
+                _split_party_payments,
+                type(self),
+                buffered,
+                chain,
+                payer_address,
+                payee_address,
+                size=total_rows,
+            )
+            payer_stats.add(payer_df)
+            payee_stats.add(payee_df)
+            mutual_stats.add(mutual_df)
+
+        async for page in self.iter_payments_for_parties(payer_address, payee_address):
+            buffered.extend(page)
+            total_rows += len(page)
+            if len(buffered) >= executor.inline_threshold:
+                await _add_buffered()
+                buffered = []
+        if buffered:
+            await _add_buffered()
+        return payer_stats.result(), payee_stats.result(), mutual_stats.result()
+
     @classmethod
     def enrich_payments_data(
-        cls, payments_raw_df: pd.DataFrame, chain: chain_utils.Chain
+        cls,
+        payments_raw_df: pd.DataFrame,
+        chain: chain_utils.Chain,
+        compact: bool = False,
     ) -> pd.DataFrame:
         """
         Enriches the raw payments data with additional information
+
+        If `compact`, the raw frame isn't copied up front, addresses and token symbols
+        are categoricals and `amount` is kept as the exact integer amount rather than a
+        float. The stats are the same either way.
         """
         if len(payments_raw_df) == 0:
             return pd.DataFrame(
@@ -54,46 +416,118 @@ class BaseRequestClient(Protocol):
                     "amount_usd",
                 ]
             )
+        if compact:
+            return _enrich_payments_data_compact(payments_raw_df, chain)
+
         df = payments_raw_df.copy().drop_duplicates("id")
         df["txn_time"] = pd.to_datetime(df.timestamp, unit="s")
         df["token_symbol"] = df.tokenAddress.map(
             tokens.TOKEN_ADDRESS_MAPPING.get(chain)
         ).fillna("Other")
+        # Amounts are in the token's base units and can exceed what a float represents
+        # exactly, so the USD amounts are derived from the integer amounts.
+        amounts = fixed_point.to_int_array(df.amount)
         df["amount"] = df.amount.astype(float)
         df["token_usd_price"] = df.token_symbol.map(
             tokens.TOKEN_USD_PRICE_MAPPING
         ).fillna(0)
-        df["amount_usd"] = (df.amount * df.token_usd_price).astype(int)
+        amount_usd = np.zeros(len(df), dtype=amounts.dtype)
+        for token_symbol, token in tokens.TOKENS.items():
+            is_token = (df.token_symbol == token_symbol).to_numpy()
+            amount_usd[is_token] = token.to_usd(amounts[is_token])
+        df["amount_usd"] = amount_usd
         return df
 
     @classmethod
-    def get_payment_stats(
-        cls, enriched_df: pd.DataFrame
-    ) -> dict[str, int | decimal.Decimal]:
+    def get_payments_memory_usage(cls, enriched_df: pd.DataFrame) -> int:
+        """
+        Returns the memory footprint of the enriched payments data in bytes, including
+        the strings the object columns point to.
+        """
+        return int(enriched_df.memory_usage(deep=True).sum())
+
+    @classmethod
+    def get_payment_stats(cls, enriched_df: pd.DataFrame) -> PaymentStats:
         """
         Calculate some basic stats from the enriched payments data
         """
         if len(enriched_df) == 0:
-            return {
-                "total_amount": 0,
-                "total_txns": 0,
-                "earliest_txn_age_in_days": 0,
-                "last_txn_age_in_days": 999,
-                "unique_payees": 0,
-                "unique_payers": 0,
-            }
-        return {
-            "total_amount": enriched_df.amount_usd.sum(),
-            "total_txns": len(enriched_df),
-            "earliest_txn_age_in_days": (
-                datetime.datetime.now() - enriched_df.txn_time.min()
-            ).days,
-            "last_txn_age_in_days": (
-                datetime.datetime.now() - enriched_df.txn_time.max()
-            ).days,
-            "unique_payees": enriched_df["to"].nunique(),
-            "unique_payers": enriched_df["from"].nunique(),
-        }
+            return _empty_payment_stats()
+        return _payment_stats(
+            total_amount=enriched_df.amount_usd.sum(),
+            total_txns=len(enriched_df),
+            earliest_txn_time=enriched_df.txn_time.min(),
+            last_txn_time=enriched_df.txn_time.max(),
+            unique_payees=enriched_df["to"].nunique(),
+            unique_payers=enriched_df["from"].nunique(),
+            now=datetime.datetime.now(),
+        )
+
+    @classmethod
+    def get_pair_payment_stats(
+        cls, enriched_df: pd.DataFrame, pairs: Sequence[tuple[str, str]]
+    ) -> list[tuple[PaymentStats, PaymentStats, PaymentStats]]:
+        """
+        Returns the stats of the payments from the payer, to the payee and between the
+        two for each (payer, payee) pair, as `get_payment_stats` would for each subset.
+
+        Rather than filtering the payments once per subset, they are aggregated once by
+        (payer, payee) over categorical address columns, and the per-payer and per-payee
+        stats are rolled up from those much smaller groups.
+        """
+        payers = {payer for payer, _ in pairs}
+        payees = {payee for _, payee in pairs}
+        df = enriched_df.loc[
+            enriched_df["from"].isin(payers) | enriched_df["to"].isin(payees),
+            ["from", "to", "amount_usd", "txn_time"],
+        ]
+        # Grouping drops missing keys, so missing addresses are grouped as "" instead.
+        df = df.astype({"from": "category", "to": "category"})
+        for column in ("from", "to"):
+            if "" not in df[column].cat.categories:
+                df[column] = df[column].cat.add_categories("")
+        df = df.fillna({"from": "", "to": ""})
+        by_pair = (
+            df.groupby(["from", "to"], observed=True, sort=False)
+            .agg(
+                total_amount=("amount_usd", "sum"),
+                total_txns=("amount_usd", "size"),
+                earliest_txn_time=("txn_time", "min"),
+                last_txn_time=("txn_time", "max"),
+            )
+            .assign(unique_payees=1, unique_payers=1)
+        )
+        by_payer = _roll_up_pair_stats(by_pair, "from", counterparty_level="to").assign(
+            unique_payees=lambda df: df.counterparties, unique_payers=1
+        )
+        by_payee = _roll_up_pair_stats(by_pair, "to", counterparty_level="from").assign(
+            unique_payees=1, unique_payers=lambda df: df.counterparties
+        )
+
+        now = datetime.datetime.now()
+
+        def _lookup(aggregates: pd.DataFrame, key: Any) -> PaymentStats:
+            if key not in aggregates.index:
+                return _empty_payment_stats()
+            row = aggregates.loc[key]
+            return _payment_stats(
+                total_amount=int(row["total_amount"]),
+                total_txns=int(row["total_txns"]),
+                earliest_txn_time=row["earliest_txn_time"],
+                last_txn_time=row["last_txn_time"],
+                unique_payees=int(row["unique_payees"]),
+                unique_payers=int(row["unique_payers"]),
+                now=now,
+            )
+
+        return [
+            (
+                _lookup(by_payer, payer),
+                _lookup(by_payee, payee),
+                _lookup(by_pair, (payer, payee)),
+            )
+            for payer, payee in pairs
+        ]
 
 
 class RequestClient(BaseRequestClient):
@@ -105,62 +539,302 @@ class RequestClient(BaseRequestClient):
         self,
         request_network_subgraph_endpoint_url: str,
         invoice_api_url: str,
+        http_client_pool_: http_client_pool.HttpClientPool | None = None,
+        rate_limiter_registry: rate_limiter.RateLimiterRegistry | None = None,
+        single_flight_group: single_flight.SingleFlight | None = None,
+        page_size: int = _DEFAULT_GRAPHQL_CHUNK_SIZE,
+        pipeline_depth: int = 1,
+        shard_fan_out: int = 1,
+        address_batch_size: int = _DEFAULT_ADDRESS_BATCH_SIZE,
     ) -> None:
+        if (pipeline_depth - 1) * page_size > _MAX_GRAPHQL_SKIP:
+            raise ValueError(
+                f"Pipelining {pipeline_depth} pages of {page_size} payments exceeds "
+                f"the subgraph's max skip of {_MAX_GRAPHQL_SKIP}"
+            )
         self.request_network_subgraph_endpoint_url = (
             request_network_subgraph_endpoint_url
         )
         self.invoice_api_url = invoice_api_url
+        self.http_client_pool = http_client_pool_ or http_client_pool.default_pool
+        self.subgraph_rate_limiter = (
+            rate_limiter_registry or rate_limiter.default_registry
+        ).get(rate_limiter.Upstream.REQUEST_SUBGRAPH)
+        self.single_flight_group = single_flight_group or single_flight.default_group
+        self.page_size = page_size
+        # 1 means pages are requested one after another.
+        self.pipeline_depth = pipeline_depth
+        # 1 means the id space isn't split up.
+        self.shard_fan_out = shard_fan_out
+        self.address_batch_size = address_batch_size
 
     async def get_payments(
         self,
         from_address: str | None,
         to_address: str | None,
     ) -> list[dict[str, Any]]:
-        where_clause = ""
-        if from_address:
-            where_clause += f'from: "{from_address}",\n'
-        if to_address:
-            where_clause += f'to: "{to_address}",\n'
-
-        payments = []
-        last_chunk_size = _DEFAULT_GRAPHQL_CHUNK_SIZE
+        return await self.single_flight_group.do(
+            (
+                "request_client.get_payments",
+                self.request_network_subgraph_endpoint_url,
+                from_address,
+                to_address,
+            ),
+            lambda: self._get_payments(from_address, to_address),
+        )
+
+    async def get_payments_for_parties(
+        self,
+        payer_address: str | None,
+        payee_address: str | None,
+    ) -> list[dict[str, Any]]:
+        """
+        Returns the payments sent by the payer together with the payments received by the
+        payee, without duplicates. Both are paginated independently but share one aliased
+        query per page, so this takes half the round trips of two `get_payments` calls.
+        """
+        return await self.single_flight_group.do(
+            (
+                "request_client.get_payments_for_parties",
+                self.request_network_subgraph_endpoint_url,
+                payer_address,
+                payee_address,
+            ),
+            lambda: self._get_payments_for_parties(payer_address, payee_address),
+        )
+
+    async def get_payments_by_party(
+        self,
+        payer_addresses: Collection[str],
+        payee_addresses: Collection[str],
+    ) -> tuple[PaymentsByAddress, PaymentsByAddress]:
+        """
+        Returns the payments sent by each payer and the payments received by each payee,
+        keyed by the given addresses.
+
+        The addresses are split into batches of `address_batch_size` that are queried
+        with `from_in`/`to_in` filters, and all batches are paginated together in one
+        aliased query per page, so this takes as many round trips as the largest batch
+        has pages rather than one pagination per address.
+        """
+        payer_batches = _batch_addresses(payer_addresses, self.address_batch_size)
+        payee_batches = _batch_addresses(payee_addresses, self.address_batch_size)
+        where_by_alias: dict[str, dict[str, str | list[str]]] = {
+            **{
+                f"payers{i}": {"from_in": batch}
+                for i, batch in enumerate(payer_batches)
+            },
+            **{f"payees{i}": {"to_in": batch} for i, batch in enumerate(payee_batches)},
+        }
+        payer_by_key = {address.lower(): address for address in payer_addresses}
+        payee_by_key = {address.lower(): address for address in payee_addresses}
+        payments_by_payer: PaymentsByAddress = {
+            address: [] for address in payer_addresses
+        }
+        payments_by_payee: PaymentsByAddress = {
+            address: [] for address in payee_addresses
+        }
+        async for chunks in self._iter_aliased_pages(where_by_alias):
+            for alias, new_chunk in chunks.items():
+                for payment in new_chunk:
+                    if alias.startswith("payers"):
+                        payments_by_payer[payer_by_key[payment["from"].lower()]].append(
+                            payment
+                        )
+                    else:
+                        payments_by_payee[payee_by_key[payment["to"].lower()]].append(
+                            payment
+                        )
+        return payments_by_payer, payments_by_payee
+
+    async def get_invoice(self, request_id: str) -> request_types.Invoice:
+        return await self.single_flight_group.do(
+            ("request_client.get_invoice", self.invoice_api_url, request_id),
+            lambda: self._get_invoice(request_id),
+        )
+
+    async def _get_payments(
+        self,
+        from_address: str | None,
+        to_address: str | None,
+    ) -> list[dict[str, Any]]:
+        where = _payments_where(from_address, to_address)
+        if self.shard_fan_out > 1:
+            shards = await async_utils.gather_bounded(
+                *(
+                    self._collect_payment_pages({**where, **shard_where})
+                    for shard_where in _id_shards(self.shard_fan_out)
+                ),
+                max_concurrency=self.shard_fan_out,
+            )
+            payments = [payment for shard in shards for payment in shard]
+        else:
+            payments = await self._collect_payment_pages(where)
+
+        # Pipelined pages may overlap if payments are indexed while paginating.
+        return list({payment["id"]: payment for payment in payments}.values())
+
+    async def iter_payments(
+        self,
+        from_address: str | None,
+        to_address: str | None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yields the payments `get_payments` returns one page at a time, as they arrive.
+
+        Pages are pipelined as configured, but id shards are paged through one after
+        another. A payment indexed while paginating may be yielded twice.
+        """
+        where = _payments_where(from_address, to_address)
+        for shard_where in _id_shards(self.shard_fan_out):
+            async for page in self._iter_payment_pages({**where, **shard_where}):
+                yield page
+
+    async def _collect_payment_pages(
+        self, where: dict[str, str]
+    ) -> list[dict[str, Any]]:
+        return [
+            payment
+            async for page in self._iter_payment_pages(where)
+            for payment in page
+        ]
+
+    async def _iter_payment_pages(
+        self, where: dict[str, str]
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Pages through the payments matching `where` in ascending id order, keeping up to
+        `pipeline_depth` pages in flight.
+
+        The i-th page in flight is requested as the page `i` pages past the last id
+        received, using `skip`, so that the next pages are already on their way while
+        the current one is being processed.
+        """
         last_id = ""
+        in_flight: collections.deque[
+            asyncio.Future[dict[str, Any]]
+        ] = collections.deque()
         try:
-            async with httpx.AsyncClient() as client:
-                while last_chunk_size == _DEFAULT_GRAPHQL_CHUNK_SIZE:
-                    query = f"""
-                        query HumaRequestNetworkPayments {{
-                            payments(
-                                first: {_DEFAULT_GRAPHQL_CHUNK_SIZE},
-                                where: {{
-                                    {where_clause}
-                                    id_gt: "{last_id}"
-                                }}
-                                orderBy: id,
-                                orderDirection: asc
-                            ) {{
-                                id
-                                contractAddress
-                                tokenAddress
-                                to
-                                from
-                                timestamp
-                                txHash
-                                amount
-                                currency
-                                amountInCrypto
-                            }}
-                        }}
-                        """
-                    resp = await client.post(
-                        self.request_network_subgraph_endpoint_url,
-                        json={"query": query},
+            while True:
+                while len(in_flight) < self.pipeline_depth:
+                    field = _build_payments_field(
+                        where,
+                        last_id,
+                        self.page_size,
+                        skip=len(in_flight) * self.page_size,
+                    )
+                    in_flight.append(asyncio.ensure_future(self._query_payments(field)))
+                new_chunk = _get_payments_chunk(await in_flight.popleft(), "payments")
+                yield new_chunk
+                if len(new_chunk) < self.page_size:
+                    return
+                last_id = new_chunk[-1]["id"]
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    async def _get_payments_for_parties(
+        self,
+        payer_address: str | None,
+        payee_address: str | None,
+    ) -> list[dict[str, Any]]:
+        return [
+            payment
+            async for page in self.iter_payments_for_parties(
+                payer_address, payee_address
+            )
+            for payment in page
+        ]
+
+    async def iter_payments_for_parties(
+        self,
+        payer_address: str | None,
+        payee_address: str | None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yields the payments `get_payments_for_parties` returns one aliased page at a
+        time, as they arrive, without duplicates.
+
+        The payments from the payer to the payee match both filters. Rather than
+        remembering the ids already yielded, they're only taken from the payer's pages.
+        """
+        where_by_alias: dict[str, dict[str, str | list[str]]] = {}
+        if payer_address:
+            where_by_alias["payer"] = {"from": payer_address}
+        if payee_address:
+            where_by_alias["payee"] = {"to": payee_address}
+
+        payer_key = payer_address.lower() if payer_address else None
+        async for chunks in self._iter_aliased_pages(where_by_alias):
+            yield [
+                *chunks.get("payer", []),
+                *(
+                    payment
+                    for payment in chunks.get("payee", [])
+                    if payer_key is None or (payment["from"] or "").lower() != payer_key
+                ),
+            ]
+
+    async def _iter_aliased_pages(
+        self, where_by_alias: dict[str, dict[str, str | list[str]]]
+    ) -> AsyncIterator[dict[str, list[dict[str, Any]]]]:
+        """
+        Pages through the payments matching each alias's filter with one aliased query
+        per round trip, yielding the new payments of each alias still being paginated.
+
+        Each alias is split into `shard_fan_out` id ranges that are paginated side by
+        side, and each query asks for the next `pipeline_depth` pages of each range,
+        using `skip`. All the fields of a query are answered from the same block, so the
+        pages don't overlap.
+        """
+        shards = _id_shards(self.shard_fan_out)
+        where_by_key = {
+            (alias, shard): {**where, **shard_where}
+            for alias, where in where_by_alias.items()
+            for shard, shard_where in enumerate(shards)
+        }
+        last_id_by_key = {key: "" for key in where_by_key}
+        # Ranges drop out of the query once they've returned a partial page.
+        while last_id_by_key:
+            data = await self._query_payments(
+                "".join(
+                    _build_payments_field(
+                        where_by_key[key],
+                        last_id,
+                        self.page_size,
+                        skip=page * self.page_size,
+                        alias=_page_alias(*key, page),
                     )
-                    new_chunk = resp.json()["data"]["payments"]
-                    payments.extend(new_chunk)
-                    last_chunk_size = len(new_chunk)
-                    if len(payments) > 0:
-                        last_id = payments[-1]["id"]
+                    for key, last_id in last_id_by_key.items()
+                    for page in range(self.pipeline_depth)
+                )
+            )
+            chunks: dict[str, list[dict[str, Any]]] = {}
+            for key in list(last_id_by_key):
+                chunk = chunks.setdefault(key[0], [])
+                for page in range(self.pipeline_depth):
+                    new_chunk = _get_payments_chunk(data, _page_alias(*key, page))
+                    chunk.extend(new_chunk)
+                    if len(new_chunk) < self.page_size:
+                        del last_id_by_key[key]
+                        break
+                    last_id_by_key[key] = new_chunk[-1]["id"]
+            yield chunks
+
+    async def _query_payments(self, fields: str) -> dict[str, Any]:
+        query = f"""
+            query HumaRequestNetworkPayments {{
+                {fields}
+            }}
+            """
+        client = self.http_client_pool.get_client()
+        try:
+            await self.subgraph_rate_limiter.acquire()
+            resp = await client.post(
+                self.request_network_subgraph_endpoint_url,
+                json={"query": query},
+            )
+            return resp.json()["data"]
         except KeyError as e:
             message = "No data returned from query"
             logger.exception(message, resp_body=resp.json())
@@ -170,45 +844,41 @@ class RequestClient(BaseRequestClient):
             logger.exception(message)
             raise exceptions.RequestException(message=message) from e
 
-        return payments
-
-    async def get_invoice(self, request_id: str) -> request_types.Invoice:
+    async def _get_invoice(self, request_id: str) -> request_types.Invoice:
+        client = self.http_client_pool.get_client(self.invoice_api_url)
         try:
-            async with httpx.AsyncClient(base_url=self.invoice_api_url) as client:
-                resp = await client.get(f"?id={request_id}")
-                resp.raise_for_status()
-                invoice_info = resp.json()
-                if not web3.Web3.is_address(invoice_info["owner"]):
-                    raise exceptions.InvalidAddressException(
-                        f"Invoice's owner is not a valid address: {invoice_info['owner']}"
-                    )
-                if not web3.Web3.is_address(invoice_info["payer"]):
-                    raise exceptions.InvalidAddressException(
-                        f"Invoice's payer is not a valid address: {invoice_info['payer']}"
-                    )
-                if not web3.Web3.is_address(invoice_info["payee"]):
-                    raise exceptions.InvalidAddressException(
-                        f"Invoice's payee is not a valid address: {invoice_info['payee']}"
-                    )
-
-                return request_types.Invoice(
-                    token_owner=invoice_info["owner"].lower(),
-                    currency=invoice_info.get("currencyInfo").get("symbol"),
-                    amount=decimal.Decimal(invoice_info["expectedAmount"]),
-                    status="",
-                    payer=invoice_info["payer"].lower(),
-                    payee=invoice_info["payee"].lower(),
-                    # TODO(jiatu): do we need to add tz info here?
-                    creation_date=datetime.datetime.fromtimestamp(
-                        invoice_info["creationDate"]
-                    ),
-                    # TODO: Figure out way to get real due date
-                    due_date=datetime.datetime.fromtimestamp(
-                        invoice_info["creationDate"]
-                    )
-                    + datetime.timedelta(days=30),
-                    token_id=invoice_info["tokenId"],
+            resp = await client.get(f"?id={request_id}")
+            resp.raise_for_status()
+            invoice_info = resp.json()
+            if not web3.Web3.is_address(invoice_info["owner"]):
+                raise exceptions.InvalidAddressException(
+                    f"Invoice's owner is not a valid address: {invoice_info['owner']}"
+                )
+            if not web3.Web3.is_address(invoice_info["payer"]):
+                raise exceptions.InvalidAddressException(
+                    f"Invoice's payer is not a valid address: {invoice_info['payer']}"
+                )
+            if not web3.Web3.is_address(invoice_info["payee"]):
+                raise exceptions.InvalidAddressException(
+                    f"Invoice's payee is not a valid address: {invoice_info['payee']}"
                 )
+
+            return request_types.Invoice(
+                token_owner=invoice_info["owner"].lower(),
+                currency=invoice_info.get("currencyInfo").get("symbol"),
+                amount=decimal.Decimal(invoice_info["expectedAmount"]),
+                status="",
+                payer=invoice_info["payer"].lower(),
+                payee=invoice_info["payee"].lower(),
+                # TODO(jiatu): do we need to add tz info here?
+                creation_date=datetime.datetime.fromtimestamp(
+                    invoice_info["creationDate"]
+                ),
+                # TODO: Figure out way to get real due date
+                due_date=datetime.datetime.fromtimestamp(invoice_info["creationDate"])
+                + datetime.timedelta(days=30),
+                token_id=invoice_info["tokenId"],
+            )
         except httpx.HTTPStatusError as e:
             logger.exception(
                 f"Request Network API returned status code {e.response.status_code}",
@@ -0,0 +1,154 @@
+import collections
+from typing import Any, Sequence
+
+import web3
+from eth_abi import decoding, encoding
+from eth_abi.registry import registry as abi_registry
+
+
+class AbiFunction:
+    """
+    The selector, and the input encoder and output decoder, of a contract function,
+    computed once from its ABI entry. Encoding a call or decoding its return data then
+    skips web3's per-call ABI lookup and generic result formatting.
+
+    Addresses are decoded checksummed, like web3 returns them.
+    """
+
+    def __init__(self, abi: dict[str, Any]) -> None:
+        self.name: str = abi["name"]
+        self.inputs: list[dict[str, Any]] = abi.get("inputs", [])
+        self.outputs: list[dict[str, Any]] = abi.get("outputs", [])
+        input_types = [_abi_type(param) for param in self.inputs]
+        output_types = [_abi_type(param) for param in self.outputs]
+        self.signature = f"{self.name}({','.join(input_types)})"
+        self.selector = bytes(web3.Web3.keccak(text=self.signature)[:4])
+        self._encoder = _tuple_encoder(input_types)
+        self._decoder = _tuple_decoder(output_types)
+
+    def encode_input(self, args: Sequence[Any] = ()) -> bytes:
+        return self.selector + self._encoder(tuple(args))
+
+    def decode_output(self, data: bytes) -> tuple[Any, ...]:
+        """
+        Decodes the return data into a tuple with one value per output.
+        """
+        values = _decode(self._decoder, data)
+        return tuple(
+            _normalize(param, value) for param, value in zip(self.outputs, values)
+        )
+
+
+class AbiEvent:
+    """
+    The topic and the decoders of a contract event, computed once from its ABI entry.
+    Indexed values are decoded from the topics, except for the types whose topic is a
+    hash of the value, which is returned as is.
+    """
+
+    def __init__(self, abi: dict[str, Any]) -> None:
+        self.name: str = abi["name"]
+        self.inputs: list[dict[str, Any]] = abi.get("inputs", [])
+        self.signature = (
+            f"{self.name}({','.join(_abi_type(param) for param in self.inputs)})"
+        )
+        self.topic = bytes(web3.Web3.keccak(text=self.signature))
+        self._indexed = [param for param in self.inputs if param.get("indexed")]
+        self._data = [param for param in self.inputs if not param.get("indexed")]
+        self._indexed_decoders = [
+            abi_registry.get_decoder(_abi_type(param))
+            if _is_elementary(_abi_type(param))
+            else None
+            for param in self._indexed
+        ]
+        self._data_decoder = _tuple_decoder([_abi_type(param) for param in self._data])
+
+    def decode_log(self, topics: Sequence[bytes], data: bytes) -> dict[str, Any]:
+        """
+        Decodes a log of the event, given its topics after the event topic, into its
+        values by input name.
+        """
+        values = {}
+        for param, decoder, topic in zip(self._indexed, self._indexed_decoders, topics):
+            values[param["name"]] = (
+                topic if decoder is None else _normalize(param, _decode(decoder, topic))
+            )
+        data_values = _decode(self._data_decoder, data)
+        for param, value in zip(self._data, data_values):
+            values[param["name"]] = _normalize(param, value)
+        return values
+
+
+def load_events(abi: Sequence[dict[str, Any]]) -> dict[str, AbiEvent]:
+    """
+    Returns the events of the ABI by name.
+    """
+    return {
+        entry["name"]: AbiEvent(entry) for entry in abi if entry.get("type") == "event"
+    }
+
+
+def load_functions(abi: Sequence[dict[str, Any]]) -> dict[str, AbiFunction]:
+    """
+    Returns the functions of the ABI by signature, e.g. `balanceOf(address)`, and also
+    by name unless the name is overloaded, so that an overload is never picked by its
+    name alone.
+    """
+    functions = [AbiFunction(entry) for entry in abi if entry.get("type") == "function"]
+    name_counts = collections.Counter(function.name for function in functions)
+    by_signature = {function.signature: function for function in functions}
+    by_name = {
+        function.name: function
+        for function in functions
+        if name_counts[function.name] == 1
+    }
+    return {**by_name, **by_signature}
+
+
+def _abi_type(param: dict[str, Any]) -> str:
+    # Tuples are written out as their component types, e.g. `(address,uint256)[]`.
+    if not param["type"].startswith("tuple"):
+        return param["type"]
+    components = ",".join(_abi_type(component) for component in param["components"])
+    return f"({components}){param['type'][len('tuple'):]}"
+
+
+def _tuple_encoder(abi_types: Sequence[str]) -> encoding.TupleEncoder:
+    # Built from the element encoders, since the registry can't parse `()` for
+    # functions without inputs.
+    return encoding.TupleEncoder(  # type: ignore[no-untyped-call]
+        encoders=tuple(abi_registry.get_encoder(abi_type) for abi_type in abi_types)
+    )
+
+
+def _tuple_decoder(abi_types: Sequence[str]) -> decoding.TupleDecoder:
+    return decoding.TupleDecoder(  # type: ignore[no-untyped-call]
+        decoders=tuple(abi_registry.get_decoder(abi_type) for abi_type in abi_types)
+    )
+
+
+def _decode(decoder: Any, data: bytes) -> Any:
+    return decoder(decoding.ContextFramesBytesIO(data))  # type: ignore[no-untyped-call]
+
+
+def _is_elementary(abi_type: str) -> bool:
+    # Indexed strings, bytes, arrays and tuples are topics as their keccak hash.
+    return (
+        abi_type not in ("string", "bytes")
+        and "[" not in abi_type
+        and not abi_type.startswith("(")
+    )
+
+
+def _normalize(param: dict[str, Any], value: Any) -> Any:
+    if param["type"].endswith("]"):
+        element = {**param, "type": param["type"][: param["type"].rindex("[")]}
+        return tuple(_normalize(element, item) for item in value)
+    if param["type"] == "tuple":
+        return tuple(
+            _normalize(component, item)
+            for component, item in zip(param["components"], value)
+        )
+    if param["type"] == "address":
+        return web3.Web3.to_checksum_address(value)
+    return value
@@ -0,0 +1,25 @@
+import asyncio
+from typing import Any, Awaitable
+
+
+async def gather_bounded(*aws: Awaitable[Any], max_concurrency: int) -> list[Any]:
+    """
+    Like `asyncio.gather`, but runs at most `max_concurrency` of the awaitables at once.
+
+    If one of them fails, the others are cancelled and its exception is re-raised as is,
+    so callers see the same exception types as when awaiting them one after another.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    tasks = [asyncio.ensure_future(_run(aw)) for aw in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
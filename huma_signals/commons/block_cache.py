@@ -0,0 +1,85 @@
+import time
+from typing import Callable, Generic, Hashable, TypeVar
+
+from huma_signals import models
+
+T = TypeVar("T")
+
+
+class BlockCacheStats(models.HumaBaseModel):
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+class BlockAwareCache(Generic[T]):
+    """
+    A TTL cache whose entries can also be invalidated by block number, for values read from
+    chain that change rarely, e.g. pool policy.
+
+    Entries remember the block they were read at, if known. Invalidating a key at a block,
+    e.g. the block of a config-change event, drops its entry and rejects later writes of
+    values read before that block, so an in-flight read that started before the change
+    can't bring the old value back.
+    """
+
+    def __init__(
+        self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stats = BlockCacheStats()
+        self._clock = clock
+        # Values with the time they were stored and the block they were read at.
+        self._entries: dict[Hashable, tuple[T, float, int | None]] = {}
+        self._min_block_by_key: dict[Hashable, int] = {}
+
+    def get(self, key: Hashable) -> T | None:
+        entry = self._entries.get(key)
+        if entry is None or self._clock() - entry[1] >= self.ttl_seconds:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: T, block_number: int | None = None) -> bool:
+        """
+        Stores the value read at `block_number`. Returns whether it was stored: values
+        read before the key was last invalidated, or before the block of the current
+        entry, are dropped.
+        """
+        if block_number is not None:
+            min_block = self._min_block_by_key.get(key)
+            current = self._entries.get(key)
+            if min_block is not None and block_number < min_block:
+                return False
+            if (
+                current is not None
+                and current[2] is not None
+                and block_number < current[2]
+            ):
+                return False
+        self._entries[key] = (value, self._clock(), block_number)
+        return True
+
+    def invalidate(self, key: Hashable, block_number: int | None = None) -> None:
+        """
+        Drops the key's entry. With a block number, only an entry read before that block
+        is dropped, and values read before it are no longer accepted.
+        """
+        entry = self._entries.get(key)
+        if block_number is not None:
+            self._min_block_by_key[key] = max(
+                block_number, self._min_block_by_key.get(key, block_number)
+            )
+            if entry is not None and entry[2] is not None and entry[2] >= block_number:
+                return
+        if entry is not None:
+            del self._entries[key]
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._min_block_by_key.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any
+
+import httpx
+import orjson
+import structlog
+
+from huma_signals import exceptions
+from huma_signals.commons import rate_limiter
+from huma_signals.commons.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+_NO_TRANSACTIONS_MESSAGE = "No transactions found"
+
+
+async def get_result(
+    client: httpx.AsyncClient,
+    request: str,
+    api_key_pool: rate_limiter.ApiKeyPool,
+    max_rate_limit_retries: int = settings.explorer_max_rate_limit_retries,
+    rate_limit_backoff_seconds: float = settings.explorer_rate_limit_backoff_seconds,
+) -> list[dict[str, Any]]:
+    """
+    Calls an Etherscan-compatible explorer API with a key from `api_key_pool` and
+    returns the records of the result.
+
+    Explorers answer with status "0" both when there are no records and when the call
+    failed, e.g. with "Max rate limit reached" when the key's rate limit was exceeded
+    by concurrent requests. Only the former is an empty result. Rate limited calls are
+    retried, with another key when one has capacity, after an exponential backoff. Other
+    failures, and calls still rate limited after the retries, raise a
+    `BlockExplorerException`, so that the records of a block range are never dropped.
+    """
+    for attempt in range(max_rate_limit_retries + 1):
+        api_key = await api_key_pool.acquire()
+        resp = await client.get(f"{request}&apikey={api_key}")
+        resp.raise_for_status()
+        payload = orjson.loads(resp.content)
+        if payload["status"] == "1":
+            return payload["result"]
+        if payload.get("message") == _NO_TRANSACTIONS_MESSAGE:
+            return []
+        if "rate limit" not in str(payload.get("result", "")).lower():
+            raise exceptions.BlockExplorerException(
+                message=(
+                    f"Explorer request failed: {payload.get('message')}: "
+                    f"{payload.get('result')}"
+                )
+            )
+        if attempt < max_rate_limit_retries:
+            logger.warning(
+                "Explorer rate limit reached, retrying",
+                request=request,
+                attempt=attempt + 1,
+            )
+            await asyncio.sleep(rate_limit_backoff_seconds * 2**attempt)
+
+    raise exceptions.BlockExplorerException(
+        message=(
+            f"Explorer rate limit still reached after {max_rate_limit_retries} retries"
+        )
+    )
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Etherscan-compatible explorers never return more than 10k records for a single
+# `txlist` request, no matter how wide the block range is.
+EXPLORER_MAX_RESULTS = 10_000
+LATEST_BLOCK = 99_999_999
+
+
+async def fetch_block_range(  # pylint: disable=too-many-arguments
+    fetch_page: Callable[[int, int], Awaitable[list[T]]],
+    get_block_number: Callable[[T], int],
+    get_key: Callable[[T], str],
+    start_block: int = 0,
+    end_block: int = LATEST_BLOCK,
+    max_page_size: int = EXPLORER_MAX_RESULTS,
+    fan_out: int = 4,
+    max_concurrency: int = 4,
+) -> list[T]:
+    """
+    Fetches all records in `[start_block, end_block]` sorted by block number, splitting
+    saturated pages into sub-ranges that are fetched concurrently.
+
+    `fetch_page` must return the records in the given block range sorted in ascending
+    block order, capped at `max_page_size` records. A page that hits the cap is complete
+    up to (but excluding) its last block, so the remaining range is split into `fan_out`
+    sub-ranges sized after the block span the saturated page covered.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _fetch(start: int, end: int) -> list[T]:
+        async with semaphore:
+            page = await fetch_page(start, end)
+        if len(page) < max_page_size or start >= end:
+            if len(page) >= max_page_size:
+                logger.warning(
+                    "Single block exceeds the page size, records may be missing",
+                    block_number=start,
+                )
+            return page
+
+        last_block = get_block_number(page[-1])
+        if last_block <= start:
+            logger.warning(
+                "Single block exceeds the page size, records may be missing",
+                block_number=start,
+            )
+            complete, next_start = page, start + 1
+        else:
+            # The last block in a saturated page may have been cut off, so re-fetch it.
+            complete = [r for r in page if get_block_number(r) < last_block]
+            next_start = last_block
+
+        span = max(last_block - start + 1, 1)
+        sub_ranges = []
+        for i in range(fan_out):
+            sub_start = next_start + i * span
+            if sub_start > end:
+                break
+            sub_end = end if i == fan_out - 1 else min(sub_start + span - 1, end)
+            sub_ranges.append((sub_start, sub_end))
+
+        sub_pages = await asyncio.gather(*(_fetch(s, e) for s, e in sub_ranges))
+        for sub_page in sub_pages:
+            complete.extend(sub_page)
+        return complete
+
+    records = await _fetch(start_block, end_block)
+
+    seen: set[str] = set()
+    deduped = []
+    for record in records:
+        key = get_key(record)
+        if key not in seen:
+            seen.add(key)
+            deduped.append(record)
+    return deduped
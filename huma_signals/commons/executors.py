@@ -0,0 +1,87 @@
+import asyncio
+import concurrent.futures
+import functools
+import time
+from typing import Any, Callable, TypeVar
+
+from huma_signals import models
+from huma_signals.commons import settings as commons_settings
+
+T = TypeVar("T")
+
+
+ExecutorKind = commons_settings.ExecutorKind
+
+
+class CpuExecutorStats(models.HumaBaseModel):
+    inline_calls: int = 0
+    offloaded_calls: int = 0
+    # Time the event loop was blocked by work run inline.
+    inline_seconds: float = 0.0
+    # Time spent awaiting offloaded work, during which the event loop was free to serve
+    # other evaluations. This is the blocking the executor removed.
+    offloaded_seconds: float = 0.0
+    max_offloaded_seconds: float = 0.0
+
+
+class CpuExecutor:
+    """
+    Runs CPU-bound work, such as pandas enrichment and stats, off the event loop so that
+    a large evaluation doesn't stall the concurrent ones.
+
+    Work smaller than `inline_threshold`, e.g. in rows, runs inline since handing it to
+    the executor would cost more than it saves. Without an executor, everything runs
+    inline. With a process pool, the function and its arguments must be picklable, i.e.
+    module-level functions or classmethods called with plain data.
+    """
+
+    def __init__(
+        self,
+        executor: concurrent.futures.Executor | None = None,
+        inline_threshold: int = 0,
+    ) -> None:
+        self.executor = executor
+        self.inline_threshold = inline_threshold
+        self.stats = CpuExecutorStats()
+
+    async def run(self, fn: Callable[..., T], *args: Any, size: int) -> T:
+        start = time.perf_counter()
+        if self.executor is None or size < self.inline_threshold:
+            result = fn(*args)
+            self.stats.inline_calls += 1
+            self.stats.inline_seconds += time.perf_counter() - start
+            return result
+
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(fn, *args)
+        )
+        elapsed = time.perf_counter() - start
+        self.stats.offloaded_calls += 1
+        self.stats.offloaded_seconds += elapsed
+        self.stats.max_offloaded_seconds = max(
+            self.stats.max_offloaded_seconds, elapsed
+        )
+        return result
+
+
+def create_executor(
+    kind: ExecutorKind, max_workers: int, inline_threshold: int
+) -> CpuExecutor:
+    executor: concurrent.futures.Executor | None
+    if kind == ExecutorKind.THREAD:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="huma-signals-cpu"
+        )
+    elif kind == ExecutorKind.PROCESS:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        executor = None
+    return CpuExecutor(executor=executor, inline_threshold=inline_threshold)
+
+
+inline_executor = CpuExecutor()
+default_executor = create_executor(
+    kind=commons_settings.settings.cpu_executor_kind,
+    max_workers=commons_settings.settings.cpu_executor_max_workers,
+    inline_threshold=commons_settings.settings.cpu_executor_inline_threshold,
+)
@@ -0,0 +1,66 @@
+from typing import Any, Iterable
+
+import numpy as np
+
+# Token amounts are uint256 on chain, so they're split into 8 little-endian 32-bit limbs.
+# Limbs are summed in uint64, which can't overflow for fewer than 2**32 rows.
+LIMB_BITS = 32
+UINT256_LIMBS = 8
+
+
+def to_limbs(values: Iterable[int | str], num_limbs: int = UINT256_LIMBS) -> np.ndarray:
+    """
+    Splits non-negative integers into a `(len(values), num_limbs)` array of uint32 limbs,
+    least significant limb first.
+    """
+    num_bytes = num_limbs * LIMB_BITS // 8
+    raw = b"".join(int(value or 0).to_bytes(num_bytes, "little") for value in values)
+    return np.frombuffer(raw, dtype="<u4").reshape(-1, num_limbs)
+
+
+def from_limbs(limbs: np.ndarray) -> list[int]:
+    """
+    Joins the rows of a limb array back into Python ints.
+    """
+    num_bytes = limbs.shape[1] * LIMB_BITS // 8
+    raw = limbs.astype("<u4", copy=False).tobytes()
+    return [
+        int.from_bytes(raw[i : i + num_bytes], "little")
+        for i in range(0, len(raw), num_bytes)
+    ]
+
+
+def combine_limb_sums(limb_sums: np.ndarray) -> int:
+    """
+    Turns per-limb sums, which may have carried past 32 bits, into the exact total.
+    """
+    return sum(int(limb_sum) << (LIMB_BITS * i) for i, limb_sum in enumerate(limb_sums))
+
+
+def sum_limbs(limbs: np.ndarray) -> int:
+    """
+    Returns the exact sum of the values in a limb array.
+    """
+    return combine_limb_sums(limbs.sum(axis=0, dtype=np.uint64))
+
+
+def prefix_sums(limbs: np.ndarray) -> np.ndarray:
+    """
+    Returns the `(len(limbs) + 1, num_limbs)` per-limb prefix sums of a limb array, so that
+    the exact sum of rows `[i, j)` is `combine_limb_sums(sums[j] - sums[i])`.
+    """
+    sums = np.zeros((limbs.shape[0] + 1, limbs.shape[1]), dtype=np.uint64)
+    np.cumsum(limbs, axis=0, dtype=np.uint64, out=sums[1:])
+    return sums
+
+
+def to_int_array(values: Iterable[Any]) -> np.ndarray:
+    """
+    Converts integer-valued numbers or strings into an int64 array, falling back to an
+    object array of Python ints only when some value doesn't fit into 64 bits.
+    """
+    ints = [int(value) for value in values]
+    try:
+        return np.array(ints, dtype=np.int64)
+    except OverflowError:
+        return np.array(ints, dtype=object)
@@ -0,0 +1,136 @@
+import asyncio
+from typing import Any, Iterable
+
+import httpx
+import structlog
+
+from huma_signals import models
+from huma_signals.commons.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class ConnectionStats(models.HumaBaseModel):
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+
+class HttpClientPool:
+    """
+    Long-lived `httpx.AsyncClient`s shared by all upstream clients, one per base URL, so that
+    connections (and their DNS lookups and TLS handshakes) are reused across signal fetches.
+
+    Clients are bound to the event loop they were created in. If the pool is used from a
+    different event loop, e.g. across test cases, a new client is created for that loop
+    and the replaced one is closed in its own loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.http_client_max_connections,
+        max_keepalive_connections: int = settings.http_client_max_keepalive_connections,
+        keepalive_expiry_seconds: float = settings.http_client_keepalive_expiry_seconds,
+        timeout_seconds: float = settings.http_client_timeout_seconds,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self.timeout = httpx.Timeout(timeout_seconds)
+        self.transport = transport
+        self._clients: dict[
+            str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]
+        ] = {}
+        self._stats: dict[str, ConnectionStats] = {}
+
+    def get_client(self, base_url: str = "") -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(base_url)
+        if entry is not None:
+            client_loop, client = entry
+            if client_loop is loop and not client.is_closed:
+                return client
+            if client_loop is not loop:
+                _close_in_loop(client_loop, client)
+
+        client = self._create_client(base_url)
+        self._clients[base_url] = (loop, client)
+        return client
+
+    async def startup(self, base_urls: Iterable[str] = ()) -> None:
+        """
+        Eagerly creates the clients for the given base URLs in the running event loop.
+        """
+        for base_url in base_urls:
+            self.get_client(base_url)
+
+    async def shutdown(self) -> None:
+        """
+        Closes all clients and logs the connection stats. Clients created in other event
+        loops are closed in their own loop if it is still running.
+        """
+        loop = asyncio.get_running_loop()
+        for base_url, (client_loop, client) in list(self._clients.items()):
+            if client_loop is loop:
+                await client.aclose()
+            else:
+                _close_in_loop(client_loop, client)
+            del self._clients[base_url]
+        logger.info(
+            "HTTP client pool shut down",
+            connection_stats={
+                base_url: {
+                    **stats.dict(),
+                    "connections_reused": stats.connections_reused,
+                }
+                for base_url, stats in self._stats.items()
+            },
+        )
+
+    def connection_stats(self) -> dict[str, ConnectionStats]:
+        return dict(self._stats)
+
+    def _create_client(self, base_url: str) -> httpx.AsyncClient:
+        stats = self._stats.setdefault(base_url, ConnectionStats())
+
+        async def _trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+
+        async def _on_request(request: httpx.Request) -> None:
+            request.extensions = {**request.extensions, "trace": _trace}
+
+        async def _on_response(_: httpx.Response) -> None:
+            stats.requests += 1
+
+        return httpx.AsyncClient(
+            base_url=base_url,
+            limits=self.limits,
+            timeout=self.timeout,
+            transport=self.transport,
+            event_hooks={"request": [_on_request], "response": [_on_response]},
+        )
+
+
+def _close_in_loop(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    # A client's connections can only be closed in the event loop they were opened in.
+    if client.is_closed:
+        return
+    if not loop.is_running():
+        # A coroutine scheduled in a stopped loop may never run, and is never awaited.
+        logger.debug(
+            "HTTP client's event loop is not running, dropping the client",
+            base_url=str(client.base_url),
+            loop_closed=loop.is_closed(),
+        )
+        return
+    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+default_pool = HttpClientPool()
@@ -0,0 +1,150 @@
+import asyncio
+import itertools
+from typing import Any, Collection
+
+import aiohttp
+import orjson
+import structlog
+from web3.providers.async_base import AsyncBaseProvider
+from web3.providers.async_rpc import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from huma_signals import models
+
+logger = structlog.get_logger(__name__)
+
+
+class BatchStats(models.HumaBaseModel):
+    requests: int = 0
+    batches: int = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+class BatchingAsyncHTTPProvider(AsyncBaseProvider):
+    """
+    Collects the requests for `methods` issued within `window_seconds` of each other and
+    sends them to the endpoint as a single JSON-RPC batch, i.e. an array of requests, then
+    routes each response back to its caller by id. Useful for contract reads on chains
+    or providers without Multicall3.
+
+    A batch is sent early once it has `max_batch_size` requests. A lone request, and
+    requests for other methods, are sent as is. If the endpoint doesn't answer a batch
+    with an array, e.g. because it doesn't support batches, its requests are resent one
+    by one.
+    """
+
+    def __init__(
+        self,
+        provider: AsyncHTTPProvider,
+        session: aiohttp.ClientSession,
+        window_seconds: float,
+        max_batch_size: int,
+        methods: Collection[str] = ("eth_call",),
+    ) -> None:
+        super().__init__()
+        self.provider = provider
+        self.session = session
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.methods = frozenset(methods)
+        self.stats = BatchStats()
+        self._pending: list[tuple[RPCEndpoint, Any, asyncio.Future[RPCResponse]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+        self._request_ids = itertools.count()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method not in self.methods:
+            return await self.provider.make_request(method, params)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[RPCResponse] = loop.create_future()
+        self._pending.append((method, params, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return await self.provider.is_connected(show_traceback=show_traceback)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._send(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _send(
+        self, batch: list[tuple[RPCEndpoint, Any, asyncio.Future[RPCResponse]]]
+    ) -> None:
+        self.stats.requests += len(batch)
+        self.stats.batches += 1
+        if len(batch) == 1:
+            await self._send_one(*batch[0])
+            return
+
+        futures_by_id: dict[int, asyncio.Future[RPCResponse]] = {}
+        payload = []
+        for method, params, future in batch:
+            request_id = next(self._request_ids)
+            futures_by_id[request_id] = future
+            payload.append(
+                {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+            )
+        try:
+            # The provider's request kwargs include its JSON-RPC headers.
+            async with self.session.post(
+                str(self.provider.endpoint_uri),
+                data=orjson.dumps(payload),
+                **dict(self.provider.get_request_kwargs()),
+            ) as response:
+                response.raise_for_status()
+                responses = orjson.loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            for future in futures_by_id.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not isinstance(responses, list):
+            logger.warning(
+                "JSON-RPC batch rejected, sending the requests one by one",
+                endpoint_uri=self.provider.endpoint_uri,
+                response=responses,
+            )
+            await asyncio.gather(*(self._send_one(*request) for request in batch))
+            return
+
+        for rpc_response in responses:
+            response_id = rpc_response.get("id")
+            if not isinstance(response_id, int) or response_id not in futures_by_id:
+                continue
+            future = futures_by_id.pop(response_id)
+            if not future.done():
+                future.set_result(rpc_response)
+        for request_id, future in futures_by_id.items():
+            if not future.done():
+                future.set_exception(
+                    ValueError(f"No response for JSON-RPC request {request_id}")
+                )
+
+    async def _send_one(
+        self, method: RPCEndpoint, params: Any, future: asyncio.Future[RPCResponse]
+    ) -> None:
+        try:
+            rpc_response = await self.provider.make_request(method, params)
+        except Exception as e:  # pylint: disable=broad-except
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(rpc_response)
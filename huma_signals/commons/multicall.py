@@ -0,0 +1,76 @@
+from typing import Sequence
+
+import web3
+
+from huma_signals import models
+from huma_signals.commons import abi_codec
+
+# Multicall3 is deployed at the same address on every chain we support.
+MULTICALL3_ADDRESS = web3.Web3.to_checksum_address(
+    "0xcA11bde05977b3631167028862bE2a173976CA11"
+)
+_AGGREGATE3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+_AGGREGATE3 = abi_codec.AbiFunction(_AGGREGATE3_ABI[0])
+
+
+class Call(models.HumaBaseModel):
+    target: str
+    call_data: bytes
+    allow_failure: bool = True
+
+
+class CallResult(models.HumaBaseModel):
+    success: bool
+    return_data: bytes
+
+
+async def aggregate3(w3: web3.Web3, calls: Sequence[Call]) -> list[CallResult]:
+    """
+    Makes all the calls in a single `eth_call` to Multicall3's `aggregate3`. The results
+    are in the order of the calls; calls that allow failure report it in `success`
+    instead of reverting the whole batch.
+    """
+    if not calls:
+        return []
+    return_data = await w3.eth.call(  # type: ignore[misc]
+        {
+            "to": MULTICALL3_ADDRESS,
+            "data": _AGGREGATE3.encode_input(
+                [[(call.target, call.allow_failure, call.call_data) for call in calls]]
+            ),
+        }
+    )
+    (results,) = _AGGREGATE3.decode_output(return_data)
+    return [
+        CallResult(success=success, return_data=return_data)
+        for success, return_data in results
+    ]
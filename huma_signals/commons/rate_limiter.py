@@ -0,0 +1,153 @@
+import asyncio
+import enum
+import time
+from typing import Sequence
+
+from huma_signals import models
+from huma_signals.commons.settings import settings
+
+
+class Upstream(str, enum.Enum):
+    ETHERSCAN = "etherscan"
+    POLYGONSCAN = "polygonscan"
+    REQUEST_SUBGRAPH = "request_subgraph"
+    SUPERFLUID_SUBGRAPH = "superfluid_subgraph"
+    WEB3_RPC = "web3_rpc"
+
+
+_DEFAULT_REQUESTS_PER_SECOND = {
+    Upstream.ETHERSCAN: settings.etherscan_requests_per_second,
+    Upstream.POLYGONSCAN: settings.polygonscan_requests_per_second,
+    Upstream.REQUEST_SUBGRAPH: settings.request_subgraph_requests_per_second,
+    Upstream.SUPERFLUID_SUBGRAPH: settings.superfluid_subgraph_requests_per_second,
+    Upstream.WEB3_RPC: settings.web3_rpc_requests_per_second,
+}
+
+
+class RateLimiterStats(models.HumaBaseModel):
+    acquired: int = 0
+    waited: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.acquired if self.acquired else 0.0
+
+    def record(self, wait_seconds: float) -> None:
+        self.acquired += 1
+        if wait_seconds > 0:
+            self.waited += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+
+class TokenBucketRateLimiter:
+    """
+    An async token bucket. Callers that find the bucket empty reserve a future token
+    and sleep until it's due, so waiters are served in the order they arrived.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int | None = None) -> None:
+        self.requests_per_second = requests_per_second
+        self.capacity = burst or max(int(requests_per_second), 1)
+        self.stats = RateLimiterStats()
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+
+    def available_tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    async def acquire(self) -> None:
+        self._refill()
+        self._tokens -= 1
+        wait_seconds = (
+            0.0 if self._tokens >= 0 else -self._tokens / self.requests_per_second
+        )
+        self.stats.record(wait_seconds)
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated_at) * self.requests_per_second,
+        )
+        self._updated_at = now
+
+
+class ApiKeyPool:
+    """
+    Rotates requests over several API keys of the same upstream, each with its own
+    rate limit, so that throughput scales with the number of keys.
+    """
+
+    def __init__(self, limiters_by_key: dict[str, TokenBucketRateLimiter]) -> None:
+        if not limiters_by_key:
+            raise ValueError("At least one API key is required")
+        self.limiters_by_key = limiters_by_key
+
+    async def acquire(self) -> str:
+        """
+        Waits for capacity on the least busy key and returns that key.
+        """
+        api_key, limiter = max(
+            self.limiters_by_key.items(), key=lambda kv: kv[1].available_tokens()
+        )
+        await limiter.acquire()
+        return api_key
+
+
+class RateLimiterRegistry:
+    """
+    Rate limiters shared by all clients of the same upstream (and API key) in the process.
+    """
+
+    def __init__(
+        self, requests_per_second: dict[Upstream, float] | None = None
+    ) -> None:
+        self.requests_per_second = {
+            **_DEFAULT_REQUESTS_PER_SECOND,
+            **(requests_per_second or {}),
+        }
+        self._limiters: dict[tuple[Upstream, str], TokenBucketRateLimiter] = {}
+
+    def get(self, upstream: Upstream, api_key: str = "") -> TokenBucketRateLimiter:
+        if (upstream, api_key) not in self._limiters:
+            self._limiters[(upstream, api_key)] = TokenBucketRateLimiter(
+                requests_per_second=self.requests_per_second[upstream]
+            )
+        return self._limiters[(upstream, api_key)]
+
+    def get_api_key_pool(
+        self, upstream: Upstream, api_keys: Sequence[str]
+    ) -> ApiKeyPool:
+        return ApiKeyPool({key: self.get(upstream, key) for key in api_keys})
+
+    def stats(self) -> dict[Upstream, RateLimiterStats]:
+        """
+        Returns the queue wait stats aggregated over all API keys of each upstream.
+        """
+        result: dict[Upstream, RateLimiterStats] = {}
+        for (upstream, _), limiter in self._limiters.items():
+            stats = result.setdefault(upstream, RateLimiterStats())
+            stats.acquired += limiter.stats.acquired
+            stats.waited += limiter.stats.waited
+            stats.total_wait_seconds += limiter.stats.total_wait_seconds
+            stats.max_wait_seconds = max(
+                stats.max_wait_seconds, limiter.stats.max_wait_seconds
+            )
+        return result
+
+
+def parse_api_keys(api_keys: str) -> list[str]:
+    """
+    Parses a comma-separated list of API keys, e.g. from the `ETHERSCAN_API_KEY` env var.
+    An empty value means the upstream is called without an API key.
+    """
+    return [key.strip() for key in api_keys.split(",") if key.strip()] or [""]
+
+
+default_registry = RateLimiterRegistry()
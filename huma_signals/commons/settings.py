@@ -0,0 +1,51 @@
+import enum
+
+import pydantic
+from huma_utils import chain_utils
+
+
+class ExecutorKind(str, enum.Enum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class Settings(pydantic.BaseSettings):
+    class Config:
+        case_sensitive = False
+
+    # Shared HTTP client pool
+    http_client_max_connections: int = 100
+    http_client_max_keepalive_connections: int = 20
+    http_client_keepalive_expiry_seconds: float = 30.0
+    http_client_timeout_seconds: float = 5.0
+
+    # Web3 provider URLs per chain, e.g. `{"POLYGON": ["https://a", "https://b"]}`.
+    # Requests go to the fastest healthy URL, and a URL that fails is skipped for the
+    # cooldown.
+    web3_provider_urls: dict[chain_utils.Chain, list[str]] = {}
+    web3_provider_failover_cooldown_seconds: float = 30.0
+    # When above 0, `eth_call`s sent to a provider within the window go out as one
+    # JSON-RPC batch request, for chains or providers without Multicall3.
+    web3_rpc_batch_window_seconds: float = 0.0
+    web3_rpc_max_batch_size: int = 100
+
+    # Upstream rate limits. For explorers the limit applies per API key.
+    etherscan_requests_per_second: float = 5.0
+    polygonscan_requests_per_second: float = 5.0
+    request_subgraph_requests_per_second: float = 10.0
+    superfluid_subgraph_requests_per_second: float = 10.0
+    web3_rpc_requests_per_second: float = 25.0
+    # Explorer calls rejected with "Max rate limit reached" are retried after a backoff
+    # that doubles with each retry.
+    explorer_max_rate_limit_retries: int = 3
+    explorer_rate_limit_backoff_seconds: float = 1.0
+
+    # Executor for CPU-bound work such as pandas enrichment: "thread", "process" or
+    # "inline". Work on fewer rows than the threshold stays on the event loop.
+    cpu_executor_kind: ExecutorKind = ExecutorKind.THREAD
+    cpu_executor_max_workers: int = 4
+    cpu_executor_inline_threshold: int = 5000
+
+
+settings = Settings()
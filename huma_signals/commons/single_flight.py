@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from huma_signals import models
+
+T = TypeVar("T")
+
+
+class SingleFlightStats(models.HumaBaseModel):
+    calls: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single upstream call: callers
+    that arrive while a call for their key is in flight await its result (or exception)
+    instead of issuing their own. Callers receive the same result object, so it must be
+    treated as read-only.
+
+    Keys are tuples whose first element names the kind of call, e.g. `("eth_client", ...)`,
+    which is also what the stats are grouped by.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[tuple[Hashable, ...], asyncio.Future[Any]] = {}
+        self._stats: dict[str, SingleFlightStats] = {}
+
+    async def do(self, key: tuple[Hashable, ...], fn: Callable[[], Awaitable[T]]) -> T:
+        stats = self._stats.setdefault(str(key[0]), SingleFlightStats())
+        stats.calls += 1
+
+        future = self._in_flight.get(key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            stats.coalesced += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+
+        # Shield the shared call so that one caller being cancelled doesn't cancel it for
+        # everyone else waiting on it.
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict[str, SingleFlightStats]:
+        return dict(self._stats)
+
+    def _forget(self, key: tuple[Hashable, ...], future: asyncio.Future[Any]) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+
+default_group = SingleFlight()
@@ -1,5 +1,9 @@
+from typing import Any
+
 from huma_utils import chain_utils
 
+from huma_signals import models
+
 TOKEN_ADDRESS_MAPPING = {
     chain_utils.Chain.ETHEREUM: {
         "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": "USDC",
@@ -27,8 +31,31 @@ TOKEN_ADDRESS_MAPPING = {
     },
 }
 
+
+class Token(models.HumaBaseModel):
+    decimals: int
+    # The USD price of one whole token. The supported tokens are USD stablecoins.
+    usd_price: int = 1
+
+    @property
+    def base_unit_usd_price(self) -> float:
+        return self.usd_price / 10**self.decimals
+
+    def to_usd(self, base_units: Any) -> Any:
+        """
+        Converts amounts in base units, an int or an array of ints, to whole USD. The
+        integer arithmetic is exact, and drops the fractional cents, i.e. floors.
+        """
+        return base_units * self.usd_price // 10**self.decimals
+
+
+TOKENS = {
+    "USDC": Token(decimals=6),
+    "DAI": Token(decimals=18),
+    "USDT": Token(decimals=6),
+}
+
+# The USD price of one base unit of each token.
 TOKEN_USD_PRICE_MAPPING = {
-    "USDC": 1.0 / 10**6,
-    "DAI": 1.0 / 10**18,
-    "USDT": 1.0 / 10**6,
+    token_symbol: token.base_unit_usd_price for token_symbol, token in TOKENS.items()
 }
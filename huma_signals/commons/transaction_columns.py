@@ -0,0 +1,143 @@
+import enum
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import orjson
+
+from huma_signals import models
+from huma_signals.commons import fixed_point
+
+
+class TransactionField(str, enum.Enum):
+    """
+    The `txlist` fields that can be decoded into columns, named after the payload keys.
+    """
+
+    BLOCK_NUMBER = "blockNumber"
+    TIME_STAMP = "timeStamp"
+    HASH = "hash"
+    FROM = "from"
+    TO = "to"
+    VALUE = "value"
+    IS_ERROR = "isError"
+
+
+ALL_FIELDS = frozenset(TransactionField)
+
+
+class TransactionColumns(models.HumaBaseModel):
+    """
+    A compact, column-oriented representation of a wallet's transactions, as an
+    alternative to a list of `EthTransaction`/`PolygonTransaction` models.
+
+    Addresses are lowercased and interned: `from_index` and `to_index` index into
+    `addresses`, and values are kept exact as uint256 limbs (see `fixed_point`).
+    Columns that weren't projected when decoding are `None`.
+    """
+
+    size: int
+    addresses: list[str]
+    block_number: np.ndarray | None = None
+    time_stamp: np.ndarray | None = None
+    hash: np.ndarray | None = None
+    from_index: np.ndarray | None = None
+    to_index: np.ndarray | None = None
+    value_limbs: np.ndarray | None = None
+    is_error: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def address_index(self, address: str) -> int | None:
+        try:
+            return self.addresses.index(address.lower())
+        except ValueError:
+            return None
+
+    def values(self, rows: np.ndarray | None = None) -> list[int]:
+        """
+        Returns the exact transaction values in wei, optionally only for the `rows`
+        selected by a boolean mask or an array of row indices.
+        """
+        if self.value_limbs is None:
+            raise ValueError("The value column was not decoded")
+        value_limbs = self.value_limbs if rows is None else self.value_limbs[rows]
+        return fixed_point.from_limbs(value_limbs)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Mapping[str, Any]],
+        fields: frozenset[TransactionField] = ALL_FIELDS,
+    ) -> "TransactionColumns":
+        """
+        Builds the columns from raw `txlist` rows, only decoding the given fields.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        size = len(rows)
+        interned: dict[str, int] = {}
+
+        def _intern(key: str) -> np.ndarray:
+            return np.fromiter(
+                (interned.setdefault(row[key].lower(), len(interned)) for row in rows),
+                dtype=np.int32,
+                count=size,
+            )
+
+        def _ints(key: str) -> np.ndarray:
+            return np.fromiter(
+                (int(row[key]) for row in rows), dtype=np.int64, count=size
+            )
+
+        columns: dict[str, Any] = {}
+        if TransactionField.BLOCK_NUMBER in fields:
+            columns["block_number"] = _ints(TransactionField.BLOCK_NUMBER)
+        if TransactionField.TIME_STAMP in fields:
+            columns["time_stamp"] = _ints(TransactionField.TIME_STAMP)
+        if TransactionField.HASH in fields:
+            columns["hash"] = np.array(
+                [row[TransactionField.HASH].encode() for row in rows], dtype=np.bytes_
+            )
+        if TransactionField.FROM in fields:
+            columns["from_index"] = _intern(TransactionField.FROM)
+        if TransactionField.TO in fields:
+            columns["to_index"] = _intern(TransactionField.TO)
+        if TransactionField.VALUE in fields:
+            columns["value_limbs"] = fixed_point.to_limbs(
+                row[TransactionField.VALUE] for row in rows
+            )
+        if TransactionField.IS_ERROR in fields:
+            columns["is_error"] = np.fromiter(
+                (row[TransactionField.IS_ERROR] == "1" for row in rows),
+                dtype=np.bool_,
+                count=size,
+            )
+
+        return cls(size=size, addresses=list(interned), **columns)
+
+    @classmethod
+    def from_transactions(
+        cls,
+        transactions: Iterable[Any],
+        fields: frozenset[TransactionField] = ALL_FIELDS,
+    ) -> "TransactionColumns":
+        """
+        Builds the columns from `EthTransaction`/`PolygonTransaction` models.
+        """
+        return cls.from_rows(
+            (tx.dict(by_alias=True) for tx in transactions), fields=fields
+        )
+
+
+def decode_txlist(
+    payload: bytes, fields: frozenset[TransactionField] = ALL_FIELDS
+) -> TransactionColumns:
+    """
+    Decodes a raw `txlist` response body straight into columns, skipping the models.
+    Failed responses, whose `result` is an error message, decode to no transactions.
+    """
+    body = orjson.loads(payload)
+    rows = body.get("result") if body.get("status") == "1" else None
+    return TransactionColumns.from_rows(
+        rows if isinstance(rows, list) else [], fields=fields
+    )
@@ -0,0 +1,202 @@
+import asyncio
+import contextlib
+import sqlite3
+from typing import Any, Awaitable, Callable, Iterator, Protocol, TypeVar
+
+import orjson
+import structlog
+from huma_utils import chain_utils
+
+from huma_signals.commons import transaction_columns
+
+logger = structlog.get_logger(__name__)
+
+
+class _Transaction(Protocol):
+    block_number: str
+    hash: str
+
+    def dict(self, *, by_alias: bool = False) -> dict[str, Any]:
+        ...
+
+
+TransactionT = TypeVar("TransactionT", bound=_Transaction)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallet_transactions (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (chain, address, hash)
+);
+CREATE TABLE IF NOT EXISTS wallet_sync_state (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    last_block INTEGER NOT NULL,
+    PRIMARY KEY (chain, address)
+);
+"""
+
+
+class WalletTransactionStore:
+    """
+    A local SQLite store of wallet transaction histories keyed by chain and address,
+    together with the last block synced for each wallet, so that repeat lookups only
+    need to fetch the transactions mined since.
+
+    Transactions less than `confirmations` blocks behind the latest synced one could
+    still be reorged out, so the sync cursor stays that far behind and those blocks are
+    fetched and replaced again on the next sync.
+    """
+
+    def __init__(self, path: str, confirmations: int = 12) -> None:
+        self.path = path
+        self.confirmations = confirmations
+        self._schema_created = False
+
+    async def get_last_synced_block(
+        self, chain: chain_utils.Chain, address: str
+    ) -> int | None:
+        return await asyncio.to_thread(
+            self._get_last_synced_block, chain, address.lower()
+        )
+
+    async def load_transaction_columns(
+        self,
+        chain: chain_utils.Chain,
+        address: str,
+        fields: frozenset[
+            transaction_columns.TransactionField
+        ] = transaction_columns.ALL_FIELDS,
+    ) -> transaction_columns.TransactionColumns:
+        """
+        Decodes the stored transactions straight into columns, in ascending block order.
+        """
+        return await asyncio.to_thread(
+            self._load_columns, chain, address.lower(), fields
+        )
+
+    async def save_transactions(
+        self,
+        chain: chain_utils.Chain,
+        address: str,
+        transactions: list[TransactionT],
+        start_block: int,
+        last_block: int,
+    ) -> None:
+        """
+        Replaces the stored transactions from `start_block` onwards with `transactions`,
+        and moves the sync cursor up to `last_block`.
+        """
+        rows = [
+            (
+                chain.value,
+                address.lower(),
+                tx.hash,
+                int(tx.block_number),
+                orjson.dumps(tx.dict(by_alias=True)),
+            )
+            for tx in transactions
+        ]
+        await asyncio.to_thread(
+            self._save_rows, chain, address.lower(), rows, start_block, last_block
+        )
+
+    async def sync_transactions(
+        self,
+        chain: chain_utils.Chain,
+        address: str,
+        fetch_since: Callable[[int], Awaitable[list[TransactionT]]],
+        fields: frozenset[
+            transaction_columns.TransactionField
+        ] = transaction_columns.ALL_FIELDS,
+    ) -> transaction_columns.TransactionColumns:
+        """
+        Fetches the transactions mined after the last synced block through `fetch_since`,
+        stores them and returns the wallet's full history as columns.
+        """
+        last_block = await self.get_last_synced_block(chain, address)
+        start_block = 0 if last_block is None else last_block + 1
+        new_transactions = await fetch_since(start_block)
+        latest_block = max(
+            (int(tx.block_number) for tx in new_transactions), default=start_block
+        )
+        await self.save_transactions(
+            chain,
+            address,
+            new_transactions,
+            start_block=start_block,
+            last_block=max(start_block - 1, latest_block - self.confirmations),
+        )
+        logger.debug(
+            "Synced wallet transactions",
+            chain=chain.value,
+            address=address,
+            start_block=start_block,
+            new_transactions=len(new_transactions),
+        )
+        return await self.load_transaction_columns(chain, address, fields=fields)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with contextlib.closing(sqlite3.connect(self.path)) as conn:
+            if not self._schema_created:
+                conn.executescript(_SCHEMA)
+                self._schema_created = True
+            with conn:
+                yield conn
+
+    def _get_last_synced_block(
+        self, chain: chain_utils.Chain, address: str
+    ) -> int | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_block FROM wallet_sync_state WHERE chain = ? AND address = ?",
+                (chain.value, address),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def _load_columns(
+        self,
+        chain: chain_utils.Chain,
+        address: str,
+        fields: frozenset[transaction_columns.TransactionField],
+    ) -> transaction_columns.TransactionColumns:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM wallet_transactions WHERE chain = ? AND address = ?"
+                " ORDER BY block_number, rowid",
+                (chain.value, address),
+            ).fetchall()
+        return transaction_columns.TransactionColumns.from_rows(
+            [orjson.loads(row[0]) for row in rows], fields=fields
+        )
+
+    def _save_rows(
+        self,
+        chain: chain_utils.Chain,
+        address: str,
+        rows: list[tuple[str, str, str, int, bytes]],
+        start_block: int,
+        last_block: int,
+    ) -> None:
+        with self._connect() as conn:
+            # Drops the transactions of blocks reorged out since the last sync.
+            conn.execute(
+                "DELETE FROM wallet_transactions"
+                " WHERE chain = ? AND address = ? AND block_number >= ?",
+                (chain.value, address, start_block),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO wallet_transactions"
+                " (chain, address, hash, block_number, payload) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO wallet_sync_state (chain, address, last_block) VALUES (?, ?, ?)"
+                " ON CONFLICT (chain, address)"
+                " DO UPDATE SET last_block = MAX(last_block, excluded.last_block)",
+                (chain.value, address, last_block),
+            )
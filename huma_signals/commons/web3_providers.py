@@ -0,0 +1,260 @@
+import asyncio
+import time
+from typing import Any, Mapping, Sequence, cast
+
+import aiohttp
+import structlog
+import web3
+from huma_utils import chain_utils, web3_utils
+from web3.providers.async_base import AsyncBaseProvider
+from web3.providers.async_rpc import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from huma_signals import models
+from huma_signals.commons import json_rpc_batch, single_flight
+from huma_signals.commons.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# Weight of the latest request in an endpoint's moving average latency.
+_LATENCY_EWMA_ALPHA = 0.2
+
+
+class EndpointStats(models.HumaBaseModel):
+    requests: int = 0
+    failures: int = 0
+    ewma_latency_seconds: float = 0.0
+    unhealthy_until: float = 0.0
+
+    def record_success(self, latency_seconds: float) -> None:
+        self.requests += 1
+        self.ewma_latency_seconds = (
+            latency_seconds
+            if self.requests == 1
+            else _LATENCY_EWMA_ALPHA * latency_seconds
+            + (1 - _LATENCY_EWMA_ALPHA) * self.ewma_latency_seconds
+        )
+        self.unhealthy_until = 0.0
+
+    def record_failure(self, cooldown_seconds: float) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.unhealthy_until = time.monotonic() + cooldown_seconds
+
+
+class RoutedAsyncHTTPProvider(AsyncBaseProvider):
+    """
+    Routes each JSON-RPC request to the endpoint of the chain with the lowest moving
+    average latency. An endpoint whose request fails at the transport level is skipped
+    for `cooldown_seconds` and the request is retried on the next one, so a single slow
+    or unavailable node doesn't fail requests nor dominate tail latency.
+
+    Unhealthy endpoints are still tried, last, when no healthy endpoint is left.
+    """
+
+    def __init__(
+        self,
+        endpoints: Mapping[str, AsyncBaseProvider],
+        cooldown_seconds: float = settings.web3_provider_failover_cooldown_seconds,
+    ) -> None:
+        super().__init__()
+        if not endpoints:
+            raise ValueError("At least one provider endpoint is required")
+        self.endpoints = dict(endpoints)
+        self.cooldown_seconds = cooldown_seconds
+        self.stats = {endpoint_uri: EndpointStats() for endpoint_uri in endpoints}
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        last_exception: Exception | None = None
+        for endpoint_uri in self._ranked_endpoints():
+            stats = self.stats[endpoint_uri]
+            started_at = time.monotonic()
+            try:
+                response = await self.endpoints[endpoint_uri].make_request(
+                    method, params
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                stats.record_failure(self.cooldown_seconds)
+                logger.warning(
+                    "Web3 provider request failed, failing over",
+                    endpoint_uri=endpoint_uri,
+                    method=method,
+                    exc_info=True,
+                )
+                last_exception = e
+                continue
+            stats.record_success(time.monotonic() - started_at)
+            return response
+
+        assert last_exception is not None
+        raise last_exception
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        for endpoint in self.endpoints.values():
+            if await endpoint.is_connected(show_traceback=show_traceback):
+                return True
+        return False
+
+    def _ranked_endpoints(self) -> list[str]:
+        now = time.monotonic()
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint_uri: (
+                self.stats[endpoint_uri].unhealthy_until > now,
+                self.stats[endpoint_uri].ewma_latency_seconds,
+            ),
+        )
+
+
+class Web3ProviderRegistry:
+    """
+    `Web3` instances shared by all clients of a chain in the process, created once per
+    chain, each routing its requests over the chain's provider URLs. All providers share
+    one pooled aiohttp session, so connections to the nodes are kept alive across
+    requests. With a batch window, the contract reads sent to an endpoint within the
+    window go out as one JSON-RPC batch.
+
+    Like the HTTP client pool, instances are bound to the event loop they were created
+    in, and are recreated when used from a different event loop.
+    """
+
+    def __init__(
+        self,
+        provider_urls: Mapping[chain_utils.Chain, Sequence[str]] | None = None,
+        cooldown_seconds: float = settings.web3_provider_failover_cooldown_seconds,
+        batch_window_seconds: float = settings.web3_rpc_batch_window_seconds,
+        max_batch_size: int = settings.web3_rpc_max_batch_size,
+    ) -> None:
+        self.provider_urls = {
+            chain: list(urls) for chain, urls in (provider_urls or {}).items()
+        }
+        self.cooldown_seconds = cooldown_seconds
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max_batch_size
+        self._w3_by_chain: dict[
+            chain_utils.Chain, tuple[asyncio.AbstractEventLoop, web3.Web3]
+        ] = {}
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._single_flight = single_flight.SingleFlight()
+
+    async def get_w3(
+        self, chain: chain_utils.Chain, default_provider_url: str | None = None
+    ) -> web3.Web3:
+        """
+        Returns the chain's `Web3`. `default_provider_url` is used when no provider URL
+        is configured for the chain.
+
+        Raises `ValueError` if a provider URL isn't for the chain.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._w3_by_chain.get(chain)
+        if entry is not None and entry[0] is loop:
+            return entry[1]
+        return await self._single_flight.do(
+            ("web3_provider", chain, id(loop)),
+            lambda: self._create_w3(chain, default_provider_url),
+        )
+
+    def endpoint_stats(self) -> dict[chain_utils.Chain, dict[str, EndpointStats]]:
+        stats = {}
+        for chain, (_, w3) in self._w3_by_chain.items():
+            # `Web3.provider` is typed as a sync provider, but these `Web3`s are async.
+            provider = cast(AsyncBaseProvider, w3.provider)
+            if isinstance(provider, RoutedAsyncHTTPProvider):
+                stats[chain] = dict(provider.stats)
+        return stats
+
+    async def shutdown(self) -> None:
+        """
+        Closes the session of the running event loop and forgets its `Web3` instances.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+        for chain, (w3_loop, _) in list(self._w3_by_chain.items()):
+            if w3_loop is loop:
+                del self._w3_by_chain[chain]
+
+    async def _create_w3(
+        self, chain: chain_utils.Chain, default_provider_url: str | None
+    ) -> web3.Web3:
+        provider_urls = self.provider_urls.get(chain) or (
+            [default_provider_url] if default_provider_url else []
+        )
+        if not provider_urls:
+            raise ValueError(f"No web3 provider URL configured for chain {chain}")
+
+        # `get_w3` checks that each provider is for the chain. The first `Web3` is kept,
+        # with its modules and middlewares, and routes over all the providers.
+        w3s = await self._get_reachable_w3s(chain, provider_urls)
+        endpoints: dict[str, AsyncBaseProvider] = {
+            url: cast(AsyncBaseProvider, w3.provider) for url, w3 in w3s.items()
+        }
+        session = self._get_session()
+        for url, endpoint in endpoints.items():
+            if not isinstance(endpoint, AsyncHTTPProvider):
+                continue
+            await endpoint.cache_async_session(session)
+            if self.batch_window_seconds > 0:
+                endpoints[url] = json_rpc_batch.BatchingAsyncHTTPProvider(
+                    endpoint,
+                    session,
+                    window_seconds=self.batch_window_seconds,
+                    max_batch_size=self.max_batch_size,
+                )
+        w3 = next(iter(w3s.values()))
+        w3.provider = RoutedAsyncHTTPProvider(  # type: ignore[assignment]
+            endpoints, cooldown_seconds=self.cooldown_seconds
+        )
+        self._w3_by_chain[chain] = (asyncio.get_running_loop(), w3)
+        return w3
+
+    @staticmethod
+    async def _get_reachable_w3s(
+        chain: chain_utils.Chain, provider_urls: Sequence[str]
+    ) -> dict[str, web3.Web3]:
+        """
+        Connects to the provider URLs concurrently, leaving out the ones that can't be
+        reached so that a dead node doesn't fail the whole chain. Raises the last
+        connection error if none can be reached.
+        """
+        results = await asyncio.gather(
+            *(web3_utils.get_w3(chain, url) for url in provider_urls),
+            return_exceptions=True,
+        )
+        w3s: dict[str, web3.Web3] = {}
+        last_error: BaseException | None = None
+        for url, result in zip(provider_urls, results):
+            if isinstance(result, (aiohttp.ClientError, asyncio.TimeoutError)):
+                last_error = result
+                logger.warning(
+                    "Web3 provider unreachable, leaving it out",
+                    chain=chain.name,
+                    endpoint_uri=url,
+                    exc_info=result,
+                )
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            w3s[url] = result
+        if not w3s:
+            assert last_error is not None
+            raise last_error
+        return w3s
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.http_client_max_connections,
+                    keepalive_timeout=settings.http_client_keepalive_expiry_seconds,
+                )
+            )
+            self._sessions[loop] = session
+        return session
+
+
+default_registry = Web3ProviderRegistry(settings.web3_provider_urls)
@@ -27,6 +27,11 @@ class ContractCallFailedException(HumaSignalException):
         super().__init__(message=message)
 
 
+class BlockExplorerException(HumaSignalException):
+    def __init__(self, message: str) -> None:
+        super().__init__(message=message)
+
+
 class RequestException(HumaSignalException):
     def __init__(self, message: str) -> None:
         super().__init__(message=message)
@@ -0,0 +1,37 @@
+import structlog
+
+from huma_signals.adapters.lending_pools import adapter as lending_pool_adapter
+from huma_signals.adapters.lending_pools.settings import (
+    settings as lending_pool_settings,
+)
+from huma_signals.commons import http_client_pool, web3_providers
+
+logger = structlog.get_logger(__name__)
+
+
+async def startup() -> None:
+    """
+    Sets up the resources the signal adapters share across requests. Register it as
+    the startup handler of the service hosting the adapters, e.g.
+    `app.add_event_handler("startup", lifecycle.startup)` with FastAPI.
+
+    Also starts refreshing the lending pool signals cache in the background.
+    """
+    await http_client_pool.default_pool.startup()
+    if (
+        lending_pool_adapter.default_adapter.cache is not None
+        and lending_pool_settings.pool_signals_refresh_interval_seconds > 0
+    ):
+        lending_pool_adapter.default_adapter.start_refresher()
+
+
+async def shutdown() -> None:
+    """
+    Stops the background refresh, and closes the pooled HTTP clients and web3
+    sessions. Register it as the shutdown handler of the service hosting the adapters,
+    so that their connections are closed before the event loop is.
+    """
+    await lending_pool_adapter.default_adapter.stop_refresher()
+    await http_client_pool.default_pool.shutdown()
+    await web3_providers.default_registry.shutdown()
+    logger.info("Signal adapters shut down")
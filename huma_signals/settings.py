@@ -6,6 +6,8 @@ import dotenv
 import pydantic
 from huma_utils import chain_utils
 
+from huma_signals.commons import settings as commons_settings
+
 
 class Env(str, enum.Enum):
     DEVELOPMENT = "development"
@@ -45,20 +47,60 @@ class Settings(pydantic.BaseSettings):
     instrumentation_enabled: bool
     datadog_api_key: str
 
+    # shared HTTP client pool
+    http_client_max_connections: int = 100
+    http_client_max_keepalive_connections: int = 20
+    http_client_keepalive_expiry_seconds: float = 30.0
+    http_client_timeout_seconds: float = 5.0
+
+    # upstream rate limits, for explorers the limit applies per API key
+    etherscan_requests_per_second: float = 5.0
+    polygonscan_requests_per_second: float = 5.0
+    request_subgraph_requests_per_second: float = 10.0
+    superfluid_subgraph_requests_per_second: float = 10.0
+    web3_rpc_requests_per_second: float = 25.0
+
+    # executor for CPU-bound work, "thread", "process" or "inline", and the row count
+    # under which work stays on the event loop
+    cpu_executor_kind: commons_settings.ExecutorKind = (
+        commons_settings.ExecutorKind.THREAD
+    )
+    cpu_executor_max_workers: int = 4
+    cpu_executor_inline_threshold: int = 5000
+
     # adapter: allowlist
     allow_list_endpoint: str = "https://dev.allowlist.huma.finance/"
 
+    # adapter: ethereum_wallet, polygon_wallet
+    # When set, wallet histories are persisted in this SQLite file and synced incrementally.
+    wallet_transaction_store_path: str | None = None
+    # Stored transactions this many blocks behind the latest one are re-fetched on the
+    # next sync, in case they were reorged out.
+    wallet_transaction_store_confirmations: int = 12
+    # The trailing windows the wallet activity is also reported for, e.g. `[7, 30, 90]`.
+    wallet_signal_windows_in_days: list[int] = [7, 30, 90, 180, 365]
+
     # adapter: ethereum_wallet
     etherscan_base_url: str = "https://api.etherscan.io"
+    # The chain of the explorer at the base URL, e.g. GOERLI for its testnet explorer.
+    etherscan_chain: chain_utils.Chain = chain_utils.Chain.ETHEREUM
+    # One or more comma-separated API keys, rotated to multiply the rate limit.
     etherscan_api_key: str
 
     # adapter: polygon_wallet
     polygonscan_base_url: str = "https://api.polygonscan.com"
+    # The chain of the explorer at the base URL, e.g. MUMBAI for its testnet explorer.
+    polygonscan_chain: chain_utils.Chain = chain_utils.Chain.POLYGON
+    # One or more comma-separated API keys, rotated to multiply the rate limit.
     polygonscan_api_key: str
 
     # adapter: request_network
     request_network_subgraph_endpoint_url: str
     request_network_invoice_api_url: str
+    # Pages of payments to keep in flight, and id ranges to paginate concurrently.
+    request_network_subgraph_page_size: int = 1000
+    request_network_subgraph_pipeline_depth: int = 1
+    request_network_subgraph_shard_fan_out: int = 1
 
 
 settings = Settings()
@@ -1,10 +1,12 @@
 import datetime
+import pathlib
 
 import pytest
 from huma_utils import datetime_utils
 
 from huma_signals.adapters.ethereum_wallet import adapter
 from huma_signals.clients.eth_client import eth_types
+from huma_signals.commons import transaction_store
 from tests.fixtures.clients.eth import eth_type_factories, fake_eth_client
 from tests.helpers import address_helpers
 
@@ -94,6 +96,15 @@ def describe_EthereumWalletAdapter() -> None:
         assert result.wallet_tenure_in_days == wallet_tenure_in_days
         assert result.total_income_90days == amount_in_wei
         assert result.total_transactions_90days == 2
+        assert [window.window_in_days for window in result.windows] == [
+            7,
+            30,
+            90,
+            180,
+            365,
+        ]
+        assert result.windows[2].total_income == amount_in_wei
+        assert result.windows[4].total_transactions == 2
 
     def when_there_are_no_transactions() -> None:
         @pytest.fixture
@@ -111,3 +122,35 @@ def describe_EthereumWalletAdapter() -> None:
             assert result.wallet_tenure_in_days == 0
             assert result.total_income_90days == 0
             assert result.total_transactions_90days == 0
+
+    def with_a_transaction_store() -> None:
+        @pytest.fixture
+        def eth_client_(
+            transactions: list[eth_types.EthTransaction],
+        ) -> fake_eth_client.FakeEthClient:
+            return fake_eth_client.FakeEthClient(transactions=transactions)
+
+        @pytest.fixture
+        def adapter_(
+            eth_client_: fake_eth_client.FakeEthClient, tmp_path: pathlib.Path
+        ) -> adapter.EthereumWalletAdapter:
+            return adapter.EthereumWalletAdapter(
+                eth_client_=eth_client_,
+                transaction_store_=transaction_store.WalletTransactionStore(
+                    str(tmp_path / "transactions.db"), confirmations=0
+                ),
+            )
+
+        async def it_only_fetches_new_blocks_on_repeat_calls(
+            adapter_: adapter.EthereumWalletAdapter,
+            eth_client_: fake_eth_client.FakeEthClient,
+            borrower_wallet_address: str,
+            transactions: list[eth_types.EthTransaction],
+        ) -> None:
+            first = await adapter_.fetch(borrower_wallet_address)
+            second = await adapter_.fetch(borrower_wallet_address)
+
+            last_block = max(int(tx.block_number) for tx in transactions)
+            assert eth_client_.requested_start_blocks == [0, last_block + 1]
+            assert second == first
+            assert second.total_transactions == len(transactions)
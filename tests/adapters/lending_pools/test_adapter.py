@@ -1,17 +1,68 @@
+import asyncio
+from typing import Any
 from unittest import mock
 
 import pytest
 import pytest_mock
-from huma_utils import web3_utils
+import web3
+from eth_abi import abi
+from huma_utils import chain_utils, web3_utils
 from web3 import exceptions as web3_exceptions
 
 from huma_signals import exceptions
-from huma_signals.adapters.lending_pools import adapter
+from huma_signals.adapters.lending_pools import adapter, registry
+from huma_signals.adapters.lending_pools.settings import (
+    settings as lending_pool_settings,
+)
+from huma_signals.commons import block_cache, multicall
 from tests.helpers import address_helpers, vcr_helpers
 
 _FIXTURE_BASE_PATH = "/adapters/lending_pools"
 
 
+def _fake_eth_call(apr: int = 0) -> mock.AsyncMock:
+    """
+    Answers `poolConfig()` with a random config contract address, and `getPoolSummary()`
+    with a summary of the given APR.
+    """
+    token_address = address_helpers.fake_hex_address()
+
+    def _eth_call(transaction: dict[str, Any]) -> bytes:
+        if transaction["data"] == web3.Web3.keccak(text="poolConfig()")[:4]:
+            return abi.encode(["address"], [address_helpers.fake_hex_address()])
+        return abi.encode(
+            ["address", "uint256", "uint256", "uint256", "uint256"]
+            + ["string", "string", "uint8", "uint256", "address"],
+            [token_address, apr, 0, 1000, 0, "Token", "TKN", 6, 0, token_address],
+        )
+
+    return mock.AsyncMock(side_effect=_eth_call)
+
+
+def describe_load_abi() -> None:
+    def it_memoizes_the_parsed_abi() -> None:
+        abi_path = registry.get_pool_settings(
+            "0xA22D20FB0c9980fb96A9B0B5679C061aeAf5dDE4"
+        ).pool_abi_path
+
+        assert adapter.load_abi(abi_path) is adapter.load_abi(abi_path)
+
+
+def describe_load_functions() -> None:
+    def it_precomputes_the_function_selectors() -> None:
+        abi_path = registry.get_pool_settings(
+            "0xA22D20FB0c9980fb96A9B0B5679C061aeAf5dDE4"
+        ).pool_abi_path
+
+        functions = adapter.load_functions(abi_path)
+
+        assert (
+            functions["poolConfig"].selector
+            == web3.Web3.keccak(text="poolConfig()")[:4]
+        )
+        assert adapter.load_functions(abi_path) is functions
+
+
 def describe_LendingPoolAdapter() -> None:
     @pytest.fixture
     def pool_address() -> str:
@@ -39,6 +90,25 @@ def describe_LendingPoolAdapter() -> None:
                 assert signals.invoice_amount_ratio == 0.8
                 assert signals.is_testnet is True
 
+        def when_the_pool_was_fetched_before() -> None:
+            async def it_reuses_the_web3(
+                mocker: pytest_mock.MockerFixture, pool_address: str
+            ) -> None:
+                mock_w3 = mocker.MagicMock()
+                mock_w3.eth.call = _fake_eth_call()
+                mock_get_w3 = mocker.patch.object(
+                    web3_utils, "get_w3", return_value=mock_w3
+                )
+                lending_pool_adapter = adapter.LendingPoolAdapter()
+
+                await lending_pool_adapter.fetch(pool_address)
+                await lending_pool_adapter.fetch(pool_address)
+
+                assert mock_get_w3.call_count == 1
+                # Two raw `eth_call`s per fetch, without any contract object.
+                assert mock_w3.eth.call.call_count == 4
+                assert mock_w3.eth.contract.call_count == 0
+
         def with_invoice_factoring_pool() -> None:
             @pytest.fixture
             def pool_address() -> str:
@@ -79,16 +149,6 @@ def describe_LendingPoolAdapter() -> None:
                 # of a function instead of its behaviors. But since it's hard to trigger an exception
                 # on purpose for contract calls, let's use mocking here, but know that it's not the
                 # recommended practice.
-                @pytest.fixture
-                def mock_pool_contract(
-                    mocker: pytest_mock.MockerFixture,
-                ) -> mock.MagicMock:
-                    mock_pool_contract = mocker.MagicMock()
-                    mock_pool_contract.functions.poolConfig.return_value.call.side_effect = (
-                        web3_exceptions.Web3Exception()
-                    )
-                    return mock_pool_contract
-
                 @pytest.fixture
                 def mock_w3(mocker: pytest_mock.MockerFixture) -> mock.MagicMock:
                     mock_w3 = mocker.MagicMock()
@@ -97,11 +157,13 @@ def describe_LendingPoolAdapter() -> None:
 
                 def when_pool_config_call_fails() -> None:
                     async def it_throws_error(
+                        mocker: pytest_mock.MockerFixture,
                         mock_w3: mock.MagicMock,
-                        mock_pool_contract: mock.MagicMock,
                         pool_address: str,
                     ) -> None:
-                        mock_w3.eth.contract.return_value = mock_pool_contract
+                        mock_w3.eth.call = mocker.AsyncMock(
+                            side_effect=web3_exceptions.Web3Exception()
+                        )
 
                         with pytest.raises(exceptions.ContractCallFailedException):
                             await adapter.LendingPoolAdapter().fetch(pool_address)
@@ -110,17 +172,288 @@ def describe_LendingPoolAdapter() -> None:
                     async def it_throws_error(
                         mocker: pytest_mock.MockerFixture,
                         mock_w3: mock.MagicMock,
-                        mock_pool_contract: mock.MagicMock,
                         pool_address: str,
                     ) -> None:
-                        mock_pool_config_contract = mocker.MagicMock()
-                        mock_pool_config_contract.functions.getPoolSummary.return_value.call.side_effect = (
-                            web3_exceptions.Web3Exception()
+                        mock_w3.eth.call = mocker.AsyncMock(
+                            side_effect=[
+                                abi.encode(
+                                    ["address"], [address_helpers.fake_hex_address()]
+                                ),
+                                web3_exceptions.Web3Exception(),
+                            ]
                         )
-                        mock_w3.eth.contract.side_effect = [
-                            mock_pool_contract,
-                            mock_pool_config_contract,
-                        ]
 
                         with pytest.raises(exceptions.ContractCallFailedException):
                             await adapter.LendingPoolAdapter().fetch(pool_address)
+
+                def when_the_return_data_is_not_decodable() -> None:
+                    async def it_throws_error(
+                        mocker: pytest_mock.MockerFixture,
+                        mock_w3: mock.MagicMock,
+                        pool_address: str,
+                    ) -> None:
+                        mock_w3.eth.call = mocker.AsyncMock(return_value=b"")
+
+                        with pytest.raises(exceptions.ContractCallFailedException):
+                            await adapter.LendingPoolAdapter().fetch(pool_address)
+
+    def describe_fetch_many() -> None:
+        @pytest.fixture
+        def pool_addresses() -> list[str]:
+            return [
+                "0x11672c0bBFF498c72BC2200f42461c0414855042",
+                "0xA22D20FB0c9980fb96A9B0B5679C061aeAf5dDE4",
+            ]
+
+        @pytest.fixture
+        def w3(mocker: pytest_mock.MockerFixture) -> web3.Web3:
+            # An offline `Web3` is enough to encode and decode the calls.
+            w3 = web3.Web3()
+            mocker.patch.object(web3_utils, "get_w3", return_value=w3)
+            return w3
+
+        @pytest.fixture
+        def mock_aggregate3(
+            mocker: pytest_mock.MockerFixture, w3: web3.Web3
+        ) -> mock.AsyncMock:
+            token_address = address_helpers.fake_hex_address()
+
+            def _aggregate3(
+                w3_: web3.Web3, calls: list[multicall.Call]
+            ) -> list[multicall.CallResult]:
+                if calls[0].call_data == w3.keccak(text="poolConfig()")[:4]:
+                    return_data = [
+                        w3.codec.encode(
+                            ["address"], [address_helpers.fake_hex_address()]
+                        )
+                        for _ in calls
+                    ]
+                else:
+                    return_data = [
+                        w3.codec.encode(
+                            ["address", "uint256", "uint256", "uint256", "uint256"]
+                            + ["string", "string", "uint8", "uint256", "address"],
+                            [token_address, i, 0, 1000, 0, "Token", "TKN", 6, 0]
+                            + [token_address],
+                        )
+                        for i, _ in enumerate(calls)
+                    ]
+                return [
+                    multicall.CallResult(success=True, return_data=data)
+                    for data in return_data
+                ]
+
+            return mocker.patch.object(multicall, "aggregate3", side_effect=_aggregate3)
+
+        async def it_fetches_the_signals_in_two_multicalls_per_chain(
+            mock_aggregate3: mock.AsyncMock, pool_addresses: list[str]
+        ) -> None:
+            signals = await adapter.LendingPoolAdapter().fetch_many(pool_addresses)
+
+            assert [s.pool_address for s in signals] == pool_addresses
+            assert [s.apr for s in signals] == [0, 1]
+            assert signals[0].token_symbol == "TKN"
+            assert mock_aggregate3.call_count == 2
+
+        def when_a_call_fails() -> None:
+            async def it_throws_error(
+                mocker: pytest_mock.MockerFixture,
+                w3: web3.Web3,
+                pool_addresses: list[str],
+            ) -> None:
+                mocker.patch.object(
+                    multicall,
+                    "aggregate3",
+                    return_value=[
+                        multicall.CallResult(success=False, return_data=b"")
+                        for _ in pool_addresses
+                    ],
+                )
+
+                with pytest.raises(exceptions.ContractCallFailedException):
+                    await adapter.LendingPoolAdapter().fetch_many(pool_addresses)
+
+        def without_multicall() -> None:
+            async def it_makes_the_calls_of_each_step_concurrently(
+                mocker: pytest_mock.MockerFixture,
+                mock_aggregate3: mock.AsyncMock,
+                pool_addresses: list[str],
+            ) -> None:
+                mocker.patch.object(lending_pool_settings, "multicall_enabled", False)
+                mock_w3 = mocker.MagicMock()
+                mock_w3.eth.call = _fake_eth_call(apr=1)
+                lending_pool_adapter = adapter.LendingPoolAdapter()
+                mocker.patch.object(
+                    lending_pool_adapter, "_get_w3", return_value=mock_w3
+                )
+
+                signals = await lending_pool_adapter.fetch_many(pool_addresses)
+
+                assert [s.apr for s in signals] == [1, 1]
+                assert mock_w3.eth.call.call_count == 4
+                assert mock_aggregate3.call_count == 0
+
+        def with_an_unknown_pool() -> None:
+            async def it_throws_error(pool_addresses: list[str]) -> None:
+                with pytest.raises(exceptions.PoolSettingsNotFoundException):
+                    await adapter.LendingPoolAdapter().fetch_many(
+                        [*pool_addresses, address_helpers.fake_hex_address()]
+                    )
+
+    def describe_cache() -> None:
+        @pytest.fixture
+        def cache() -> block_cache.BlockAwareCache[adapter.LendingPoolSignals]:
+            return block_cache.BlockAwareCache(ttl_seconds=60)
+
+        @pytest.fixture
+        def mock_w3(mocker: pytest_mock.MockerFixture) -> mock.MagicMock:
+            mock_w3 = mocker.MagicMock()
+            mock_w3.eth.call = _fake_eth_call()
+            mocker.patch.object(web3_utils, "get_w3", return_value=mock_w3)
+            return mock_w3
+
+        async def it_serves_repeat_fetches_from_the_cache(
+            mock_w3: mock.MagicMock,
+            cache: block_cache.BlockAwareCache[adapter.LendingPoolSignals],
+            pool_address: str,
+        ) -> None:
+            lending_pool_adapter = adapter.LendingPoolAdapter(cache=cache)
+
+            first = await lending_pool_adapter.fetch(pool_address)
+            second = await lending_pool_adapter.fetch(pool_address.lower())
+
+            assert second == first.copy(update={"pool_address": pool_address.lower()})
+            assert mock_w3.eth.call.call_count == 2
+
+        async def it_shares_an_injected_cache_across_adapters(
+            mock_w3: mock.MagicMock,
+            cache: block_cache.BlockAwareCache[adapter.LendingPoolSignals],
+            pool_address: str,
+        ) -> None:
+            await adapter.LendingPoolAdapter(cache=cache).fetch(pool_address)
+            await adapter.LendingPoolAdapter(cache=cache).fetch(pool_address)
+
+            assert mock_w3.eth.call.call_count == 2
+
+        def without_a_cache() -> None:
+            async def it_reads_every_fetch_from_chain(
+                mock_w3: mock.MagicMock, pool_address: str
+            ) -> None:
+                await adapter.LendingPoolAdapter().fetch(pool_address)
+                await adapter.LendingPoolAdapter().fetch(pool_address)
+
+                assert mock_w3.eth.call.call_count == 4
+
+        def when_the_pool_is_invalidated() -> None:
+            async def it_reads_the_pool_again(
+                mock_w3: mock.MagicMock,
+                cache: block_cache.BlockAwareCache[adapter.LendingPoolSignals],
+                pool_address: str,
+            ) -> None:
+                lending_pool_adapter = adapter.LendingPoolAdapter(cache=cache)
+
+                await lending_pool_adapter.fetch(pool_address)
+                lending_pool_adapter.invalidate(pool_address)
+                await lending_pool_adapter.fetch(pool_address)
+
+                assert mock_w3.eth.call.call_count == 4
+
+        def describe_refresh_cache() -> None:
+            async def it_caches_every_registered_pool_at_the_block_read(
+                mocker: pytest_mock.MockerFixture,
+                cache: block_cache.BlockAwareCache[adapter.LendingPoolSignals],
+            ) -> None:
+                async def _get_w3(chain: chain_utils.Chain) -> mock.MagicMock:
+                    w3 = mocker.MagicMock()
+                    w3.eth.block_number = asyncio.sleep(0, result=42)
+                    return w3
+
+                lending_pool_adapter = adapter.LendingPoolAdapter(cache=cache)
+                mocker.patch.object(
+                    lending_pool_adapter, "_get_w3", side_effect=_get_w3
+                )
+                mocker.patch.object(
+                    lending_pool_adapter,
+                    "_get_pool_summaries",
+                    side_effect=lambda chain, pools: {
+                        pool.pool_address: [pool.pool_address, 0, 0, 1, 0, "T", "T", 6]
+                        for pool in pools
+                    },
+                )
+
+                await lending_pool_adapter.refresh_cache()
+
+                assert len(cache) == len(registry.POOL_REGISTRY)
+                # Reads from before the refresh's block no longer replace the entries.
+                pool_address = next(iter(registry.POOL_REGISTRY))
+                stale_signals = cache.get(pool_address)
+                assert stale_signals is not None
+                assert cache.put(pool_address, stale_signals, block_number=41) is False
+
+    def describe_fetch_borrower_credit() -> None:
+        @pytest.fixture
+        def borrower_address() -> str:
+            return web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+
+        @pytest.fixture
+        def mock_aggregate3(mocker: pytest_mock.MockerFixture) -> mock.AsyncMock:
+            credit_record_selector = web3.Web3.keccak(
+                text="creditRecordMapping(address)"
+            )[:4]
+
+            def _aggregate3(
+                w3: web3.Web3, calls: list[multicall.Call]
+            ) -> list[multicall.CallResult]:
+                return [
+                    multicall.CallResult(
+                        success=True,
+                        return_data=abi.encode(
+                            ["(uint96,uint64,int96,uint96,uint96,uint16,uint16,uint8)"],
+                            [(500, 1_700_000_000, 0, 120, 20, 1, 11, 4)],
+                        )
+                        if call.call_data[:4] == credit_record_selector
+                        else abi.encode(
+                            ["(uint96,uint16,uint16,uint96)"], [(1000, 1200, 30, 0)]
+                        ),
+                    )
+                    for call in calls
+                ]
+
+            return mocker.patch.object(multicall, "aggregate3", side_effect=_aggregate3)
+
+        async def it_fetches_the_credit_state_in_every_pool(
+            mocker: pytest_mock.MockerFixture,
+            mock_aggregate3: mock.AsyncMock,
+            borrower_address: str,
+        ) -> None:
+            lending_pool_adapter = adapter.LendingPoolAdapter()
+            mocker.patch.object(
+                lending_pool_adapter, "_get_w3", return_value=mocker.MagicMock()
+            )
+
+            signals = await lending_pool_adapter.fetch_borrower_credit(
+                borrower_address, chains=[chain_utils.Chain.GOERLI]
+            )
+
+            goerli_pools = [
+                pool.pool_address
+                for pool in registry.POOL_REGISTRY.values()
+                if pool.chain == chain_utils.Chain.GOERLI
+            ]
+            assert [s.pool_address for s in signals] == goerli_pools
+            assert signals[0].borrower_address == borrower_address
+            assert signals[0].credit_state == adapter.CreditState.DELAYED
+            assert signals[0].credit_limit == 1000
+            assert signals[0].apr == 1200
+            assert signals[0].total_due == 120
+            assert signals[0].missed_periods == 1
+            assert signals[0].due_date is not None
+            assert signals[0].due_date.timestamp() == 1_700_000_000
+            # All the pools of the chain in one multicall.
+            assert mock_aggregate3.call_count == 1
+            assert len(mock_aggregate3.call_args.args[1]) == 2 * len(goerli_pools)
+
+        def with_invalid_borrower_address() -> None:
+            async def it_throws_error() -> None:
+                with pytest.raises(exceptions.InvalidAddressException):
+                    await adapter.LendingPoolAdapter().fetch_borrower_credit("0x123")
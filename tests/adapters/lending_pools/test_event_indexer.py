@@ -0,0 +1,156 @@
+import asyncio
+import pathlib
+from typing import Any
+from unittest import mock
+
+import pytest
+import pytest_mock
+import web3
+from eth_abi import abi
+
+from huma_signals import exceptions
+from huma_signals.adapters.lending_pools import event_indexer, event_store
+from tests.helpers import address_helpers
+
+_POOL_ADDRESS = "0xA22D20FB0c9980fb96A9B0B5679C061aeAf5dDE4"
+
+
+def _log(
+    event_name: str, block_number: int, account: str, amounts: list[int]
+) -> dict[str, Any]:
+    types = ",".join(["uint256"] * len(amounts))
+    values: list[int | str] = [*amounts]
+    if event_name == "PaymentMade":
+        types, values = f"{types},address", [*values, account]
+    signature_types = "address," + types
+    return {
+        "topics": [
+            web3.Web3.keccak(text=f"{event_name}({signature_types})"),
+            abi.encode(["address"], [account]),
+        ],
+        "data": abi.encode(types.split(","), values),
+        "blockNumber": block_number,
+        "logIndex": 0,
+        "transactionHash": web3.Web3.keccak(text=f"{event_name}{block_number}"),
+    }
+
+
+def describe_PoolEventIndexer() -> None:
+    @pytest.fixture
+    def borrower_address() -> str:
+        return web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+
+    @pytest.fixture
+    def logs(borrower_address: str) -> list[dict[str, Any]]:
+        return [
+            _log("LiquidityDeposited", 5, borrower_address, [1000, 1000]),
+            _log("DrawdownMade", 10, borrower_address, [300, 290]),
+            _log("PaymentMade", 250, borrower_address, [110, 200, 0]),
+        ]
+
+    @pytest.fixture
+    def mock_w3(
+        mocker: pytest_mock.MockerFixture, logs: list[dict[str, Any]]
+    ) -> mock.MagicMock:
+        mock_w3 = mocker.MagicMock()
+        mock_w3.eth.block_number = asyncio.sleep(0, result=312)
+
+        def _get_logs(filter_params: dict[str, Any]) -> list[dict[str, Any]]:
+            if filter_params["toBlock"] - filter_params["fromBlock"] >= 100:
+                raise ValueError({"code": -32005, "message": "Too many results"})
+            return [
+                log
+                for log in logs
+                if filter_params["fromBlock"]
+                <= log["blockNumber"]
+                <= filter_params["toBlock"]
+            ]
+
+        mock_w3.eth.get_logs = mocker.AsyncMock(side_effect=_get_logs)
+        return mock_w3
+
+    @pytest.fixture
+    def indexer(
+        mocker: pytest_mock.MockerFixture,
+        tmp_path: pathlib.Path,
+        mock_w3: mock.MagicMock,
+    ) -> event_indexer.PoolEventIndexer:
+        web3_provider_registry = mocker.MagicMock()
+        web3_provider_registry.get_w3 = mocker.AsyncMock(return_value=mock_w3)
+        return event_indexer.PoolEventIndexer(
+            event_store.PoolEventStore(str(tmp_path / "events.db")),
+            web3_provider_registry=web3_provider_registry,
+            initial_block_range=400,
+            max_block_range=1000,
+            confirmations=12,
+        )
+
+    def describe_sync() -> None:
+        async def it_indexes_the_events_up_to_the_confirmed_block(
+            indexer: event_indexer.PoolEventIndexer,
+        ) -> None:
+            assert await indexer.sync(_POOL_ADDRESS) == 3
+
+            activity = await indexer.get_pool_activity(_POOL_ADDRESS)
+            assert activity.last_indexed_block == 300
+            assert activity.total_deposited == 1000
+            assert activity.total_drawn_down == 300
+            assert activity.total_paid == 110
+            assert activity.borrower_count == 1
+
+        async def it_shrinks_the_block_range_until_requests_succeed(
+            indexer: event_indexer.PoolEventIndexer, mock_w3: mock.MagicMock
+        ) -> None:
+            await indexer.sync(_POOL_ADDRESS)
+
+            ranges = [
+                (call.args[0]["fromBlock"], call.args[0]["toBlock"])
+                for call in mock_w3.eth.get_logs.call_args_list
+            ]
+            # Ranges of 100 blocks or more fail, and the range doubles after a success.
+            assert ranges == [
+                (0, 300),
+                (0, 199),
+                (0, 99),
+                (100, 299),
+                (100, 199),
+                (200, 300),
+                (200, 299),
+                (300, 300),
+            ]
+
+        async def it_only_scans_the_blocks_after_the_last_sync(
+            indexer: event_indexer.PoolEventIndexer, mock_w3: mock.MagicMock
+        ) -> None:
+            await indexer.sync(_POOL_ADDRESS)
+            mock_w3.eth.get_logs.reset_mock()
+            mock_w3.eth.block_number = asyncio.sleep(0, result=352)
+
+            assert await indexer.sync(_POOL_ADDRESS) == 0
+            (call,) = mock_w3.eth.get_logs.call_args_list
+            assert (call.args[0]["fromBlock"], call.args[0]["toBlock"]) == (301, 340)
+
+        def when_a_single_block_fails() -> None:
+            async def it_throws_error(
+                indexer: event_indexer.PoolEventIndexer, mock_w3: mock.MagicMock
+            ) -> None:
+                mock_w3.eth.get_logs.side_effect = ValueError("unavailable")
+
+                with pytest.raises(exceptions.ContractCallFailedException):
+                    await indexer.sync(_POOL_ADDRESS)
+
+    def describe_get_borrower_activity() -> None:
+        async def it_returns_the_borrower_history_per_pool(
+            indexer: event_indexer.PoolEventIndexer, borrower_address: str
+        ) -> None:
+            await indexer.sync(_POOL_ADDRESS)
+
+            (activity,) = await indexer.get_borrower_activity(borrower_address.lower())
+
+            assert activity.pool_address == _POOL_ADDRESS
+            assert activity.borrower_address == borrower_address
+            assert activity.drawdown_count == 1
+            assert activity.total_drawn_down == 300
+            assert activity.payment_count == 1
+            assert activity.first_drawdown_block == 10
+            assert activity.last_payment_block == 250
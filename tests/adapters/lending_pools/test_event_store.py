@@ -0,0 +1,98 @@
+import pathlib
+
+import pytest
+import web3
+from huma_utils import chain_utils
+
+from huma_signals.adapters.lending_pools import event_store
+from tests.helpers import address_helpers
+
+
+def describe_PoolEventStore() -> None:
+    @pytest.fixture
+    def store(tmp_path: pathlib.Path) -> event_store.PoolEventStore:
+        return event_store.PoolEventStore(str(tmp_path / "events.db"))
+
+    @pytest.fixture
+    def pool_address() -> str:
+        return web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+
+    @pytest.fixture
+    def borrower_address() -> str:
+        return web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+
+    @pytest.fixture
+    def events(pool_address: str, borrower_address: str) -> list[event_store.PoolEvent]:
+        return [
+            event_store.PoolEvent(
+                pool_address=pool_address,
+                event_type=event_type,
+                account=borrower_address,
+                # Larger than SQLite integers.
+                amount=10**30 + block_number,
+                block_number=block_number,
+                log_index=0,
+                transaction_hash=address_helpers.fake_hex_address(),
+            )
+            for block_number, event_type in (
+                (20, event_store.PoolEventType.PAYMENT),
+                (10, event_store.PoolEventType.DRAWDOWN),
+            )
+        ]
+
+    async def it_saves_the_events_and_the_cursor(
+        store: event_store.PoolEventStore,
+        pool_address: str,
+        events: list[event_store.PoolEvent],
+    ) -> None:
+        assert (
+            await store.get_last_indexed_block(chain_utils.Chain.GOERLI, pool_address)
+            is None
+        )
+
+        await store.save_events(
+            chain_utils.Chain.GOERLI, pool_address, events, last_block=30
+        )
+
+        assert (
+            await store.get_last_indexed_block(chain_utils.Chain.GOERLI, pool_address)
+            == 30
+        )
+        loaded = await store.load_events(
+            chain_utils.Chain.GOERLI, pool_address=pool_address
+        )
+        assert loaded == sorted(events, key=lambda event: event.block_number)
+
+    async def it_does_not_duplicate_events_saved_twice(
+        store: event_store.PoolEventStore,
+        pool_address: str,
+        events: list[event_store.PoolEvent],
+    ) -> None:
+        for _ in range(2):
+            await store.save_events(
+                chain_utils.Chain.GOERLI, pool_address, events, last_block=30
+            )
+
+        assert len(await store.load_events(chain_utils.Chain.GOERLI)) == 2
+
+    async def it_filters_the_events_by_account_and_type(
+        store: event_store.PoolEventStore,
+        pool_address: str,
+        borrower_address: str,
+        events: list[event_store.PoolEvent],
+    ) -> None:
+        await store.save_events(
+            chain_utils.Chain.GOERLI, pool_address, events, last_block=30
+        )
+
+        loaded = await store.load_events(
+            chain_utils.Chain.GOERLI,
+            account=borrower_address.lower(),
+            event_types=[event_store.PoolEventType.PAYMENT],
+        )
+
+        assert [event.block_number for event in loaded] == [20]
+        assert (
+            await store.load_events(chain_utils.Chain.POLYGON, account=borrower_address)
+            == []
+        )
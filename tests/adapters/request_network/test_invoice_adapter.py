@@ -6,6 +6,8 @@ from huma_signals.adapters.ethereum_wallet import adapter as ethereum_wallet_ada
 from huma_signals.adapters.polygon_wallet import adapter as polygon_wallet_adapter
 from huma_signals.adapters.request_network import request_invoice_adapter
 from huma_signals.clients.request_client import request_client, request_types
+from huma_signals.commons import executors
+from huma_signals.commons.settings import settings as commons_settings
 from tests.fixtures.adapters import (
     fake_ethereum_wallet_adapter,
     fake_polygon_wallet_adapter,
@@ -117,6 +119,44 @@ def describe_RequestInvoiceAdapter() -> None:
                 assert signals.invoice_amount == invoice.amount
                 assert signals.token_id == invoice.token_id
 
+            def with_more_payments_than_the_inline_threshold() -> None:
+                @pytest.fixture
+                def request_client_(
+                    invoice: request_types.Invoice,
+                ) -> fake_request_client.FakeRequestClient:
+                    # Pages of 2 x 1000 payments, each under the default threshold.
+                    return fake_request_client.FakeRequestClient(
+                        invoice=invoice, page_size=1000, num_pages=3
+                    )
+
+                async def it_offloads_the_payment_stats_at_default_settings(
+                    request_client_: request_client.BaseRequestClient,
+                    wallet_adapter: ethereum_wallet_adapter.BaseEthereumWalletAdapter,
+                    chain: chain_utils.Chain,
+                    payee_wallet_address: str,
+                    request_id: str,
+                ) -> None:
+                    cpu_executor = executors.create_executor(
+                        kind=commons_settings.cpu_executor_kind,
+                        max_workers=commons_settings.cpu_executor_max_workers,
+                        inline_threshold=commons_settings.cpu_executor_inline_threshold,
+                    )
+                    adapter = request_invoice_adapter.RequestInvoiceAdapter(
+                        request_client_=request_client_,
+                        wallet_adapter=wallet_adapter,
+                        chain=chain,
+                        cpu_executor=cpu_executor,
+                    )
+
+                    signals = await adapter.fetch(
+                        borrower_wallet_address=payee_wallet_address,
+                        receivable_param=request_id,
+                    )
+
+                    assert signals.payer_count == 3000
+                    assert cpu_executor.stats.offloaded_calls > 0
+                    assert cpu_executor.stats.inline_calls == 0
+
             def when_payee_is_not_the_borrower() -> None:
                 async def it_returns_false_for_the_signal_field(
                     adapter: request_invoice_adapter.RequestInvoiceAdapter,
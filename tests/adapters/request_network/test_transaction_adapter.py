@@ -95,6 +95,27 @@ def describe_RequestTransactionAdapter() -> None:
                 assert signals.payer_tenure == payer_wallet_tenure
                 assert signals.payee_tenure == payee_wallet_tenure
 
+            async def it_fetches_the_signals_of_many_pairs(
+                adapter: request_transaction_adapter.RequestTransactionAdapter,
+                payer_wallet_address: str,
+                payee_wallet_address: str,
+                payer_wallet_tenure: int,
+                payee_wallet_tenure: int,
+            ) -> None:
+                signals = await adapter.fetch_many(
+                    [
+                        (payer_wallet_address, payee_wallet_address),
+                        (payee_wallet_address, payer_wallet_address),
+                    ]
+                )
+
+                assert [s.payer_count for s in signals] == [10, 10]
+                assert [s.mutual_count for s in signals] == [0, 0]
+                assert [s.payer_tenure for s in signals] == [
+                    payer_wallet_tenure,
+                    payee_wallet_tenure,
+                ]
+
             def with_invalid_payer_addresses() -> None:
                 @pytest.fixture
                 def payer_wallet_address() -> str:
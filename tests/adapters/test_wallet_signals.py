@@ -0,0 +1,131 @@
+import datetime
+
+import pytest
+
+from huma_signals.adapters import wallet_signals
+from huma_signals.commons import transaction_columns
+from tests.fixtures.clients.eth import eth_type_factories
+from tests.helpers import address_helpers
+
+
+def describe_compute_wallet_signal_stats() -> None:
+    @pytest.fixture
+    def now() -> datetime.datetime:
+        return datetime.datetime(
+            2023, 6, 1, 12, 0, 0, 500_000, tzinfo=datetime.timezone.utc
+        )
+
+    @pytest.fixture
+    def wallet_address() -> str:
+        return address_helpers.fake_hex_address()
+
+    def _timestamp(now: datetime.datetime, **kwargs: float) -> str:
+        return str(int((now - datetime.timedelta(**kwargs)).timestamp()))
+
+    def it_computes_the_signals(now: datetime.datetime, wallet_address: str) -> None:
+        transactions = [
+            eth_type_factories.EthTransactionFactory.create(
+                from_=wallet_address,
+                time_stamp=_timestamp(now, days=400, seconds=1),
+                value=3,
+            ),
+            eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address, time_stamp=_timestamp(now, days=10), value=2**90
+            ),
+            eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address, time_stamp=_timestamp(now, days=30), value=5
+            ),
+            eth_type_factories.EthTransactionFactory.create(
+                from_=wallet_address, time_stamp=_timestamp(now, days=1), value=7
+            ),
+            eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address, time_stamp=_timestamp(now, days=200), value=11
+            ),
+        ]
+
+        stats = wallet_signals.compute_wallet_signal_stats(
+            transaction_columns.TransactionColumns.from_transactions(transactions),
+            wallet_address=wallet_address.upper(),
+            now=now,
+        )
+
+        assert stats == wallet_signals.WalletSignalStats(
+            total_transactions=5,
+            total_sent=2,
+            total_received=3,
+            wallet_tenure_in_days=400,
+            total_income_90days=2**90 + 5,
+            total_transactions_90days=3,
+            windows=[],
+        )
+
+    def it_matches_the_timedelta_days_at_the_90_day_boundary(
+        now: datetime.datetime, wallet_address: str
+    ) -> None:
+        # Timestamps are whole seconds while `now` isn't, so the transaction exactly
+        # 90 days before the truncated `now` is 90 days and half a second old.
+        transactions = [
+            eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address, time_stamp=_timestamp(now, days=90), value=1
+            ),
+            eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address,
+                time_stamp=_timestamp(now, days=90, seconds=-1),
+                value=2,
+            ),
+        ]
+
+        stats = wallet_signals.compute_wallet_signal_stats(
+            transaction_columns.TransactionColumns.from_transactions(transactions),
+            wallet_address=wallet_address,
+            now=now,
+        )
+
+        assert stats.total_transactions_90days == 1
+        assert stats.total_income_90days == 2
+        assert stats.wallet_tenure_in_days == 90
+
+    def it_computes_each_window(now: datetime.datetime, wallet_address: str) -> None:
+        ages_in_days = [400, 3, 200, 29, 31, 0.5, 90, 89, 6, 366]
+        transactions = [
+            eth_type_factories.EthTransactionFactory.create(
+                **({"to": wallet_address} if i % 3 else {"from_": wallet_address}),
+                time_stamp=_timestamp(now, days=age),
+                value=2**70 + i,
+            )
+            for i, age in enumerate(ages_in_days)
+        ]
+
+        stats = wallet_signals.compute_wallet_signal_stats(
+            transaction_columns.TransactionColumns.from_transactions(transactions),
+            wallet_address=wallet_address,
+            now=now,
+            windows_in_days=[7, 30, 90, 180, 365],
+        )
+
+        expected = []
+        for days in [7, 30, 90, 180, 365]:
+            in_window = [
+                (i, tx)
+                for i, tx in enumerate(transactions)
+                if (
+                    now
+                    - datetime.datetime.fromtimestamp(
+                        int(tx.time_stamp), tz=datetime.timezone.utc
+                    )
+                ).days
+                < days
+            ]
+            expected.append(
+                wallet_signals.WalletWindowSignals(
+                    window_in_days=days,
+                    total_transactions=len(in_window),
+                    total_sent=len([i for i, _ in in_window if i % 3 == 0]),
+                    total_received=len([i for i, _ in in_window if i % 3]),
+                    total_income=sum(int(tx.value) for i, tx in in_window if i % 3),
+                )
+            )
+        assert stats.windows == expected
+        assert stats.total_transactions_90days == expected[2].total_transactions
+        assert stats.total_income_90days == expected[2].total_income
+        assert stats.wallet_tenure_in_days == 400
@@ -1,7 +1,14 @@
+import asyncio
+
+import httpx
+import orjson
 import pydantic
 import pytest
+import pytest_mock
 
+from huma_signals import exceptions
 from huma_signals.clients.eth_client import eth_client
+from huma_signals.commons import http_client_pool
 from tests.helpers import vcr_helpers
 
 _FIXTURE_BASE_PATH = "/clients/eth_client"
@@ -43,3 +50,45 @@ def describe_EthClient() -> None:
                 ):
                     transactions = await client.get_transactions("0x1234")
                     assert len(transactions) == 0
+
+        def when_the_explorer_keeps_rate_limiting() -> None:
+            @pytest.fixture
+            def client() -> eth_client.EthClient:
+                def handler(request: httpx.Request) -> httpx.Response:
+                    return httpx.Response(
+                        200,
+                        content=orjson.dumps(
+                            {
+                                "status": "0",
+                                "message": "NOTOK",
+                                "result": "Max rate limit reached",
+                            }
+                        ),
+                    )
+
+                return eth_client.EthClient(
+                    etherscan_base_url=settings.etherscan_base_url,
+                    etherscan_api_key=settings.etherscan_api_key,
+                    http_client_pool_=http_client_pool.HttpClientPool(
+                        transport=httpx.MockTransport(handler)
+                    ),
+                )
+
+            async def it_raises_instead_of_returning_no_records(
+                client: eth_client.EthClient, mocker: pytest_mock.MockerFixture
+            ) -> None:
+                mocker.patch.object(asyncio, "sleep")
+                with pytest.raises(exceptions.BlockExplorerException):
+                    await client.get_transactions("0x1234")
+
+    def describe_get_transaction_columns() -> None:
+        async def it_returns_the_transactions_as_columns(
+            client: eth_client.EthClient, real_eth_address: str
+        ) -> None:
+            with vcr_helpers.use_cassette(
+                fixture_file_path=f"{_FIXTURE_BASE_PATH}/get_transactions.yml"
+            ):
+                columns = await client.get_transaction_columns(real_eth_address)
+                assert len(columns) > 1400
+                assert columns.time_stamp is not None
+                assert (columns.time_stamp[1:] >= columns.time_stamp[:-1]).all()
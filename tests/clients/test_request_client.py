@@ -1,6 +1,10 @@
 import datetime
 import decimal
+import json
+import re
+from typing import Any, Callable
 
+import httpx
 import pandas as pd
 import pydantic
 import pytest
@@ -8,8 +12,9 @@ import web3
 from huma_utils import chain_utils
 
 from huma_signals.clients.request_client import request_client
+from huma_signals.commons import executors, http_client_pool
 from tests.fixtures.clients.request import request_type_factories
-from tests.helpers import vcr_helpers
+from tests.helpers import address_helpers, vcr_helpers
 
 _FIXTURE_BASE_PATH = "/clients/request_client"
 
@@ -24,6 +29,43 @@ class Settings(pydantic.BaseSettings):
 settings = Settings()
 
 
+def _fake_subgraph(
+    payments: list[dict[str, Any]], queries: list[str]
+) -> Callable[[httpx.Request], httpx.Response]:
+    """
+    Serves the `payments` queries of `RequestClient` from the given payments, recording
+    the queries it receives.
+    """
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        query = json.loads(request.content)["query"]
+        queries.append(query)
+        data = {}
+        for alias, args in re.findall(r"(?:(\w+): )?payments\(([^)]*)\)", query):
+            first = int(re.findall(r"first: (\d+)", args)[0])
+            skip = int(re.findall(r"skip: (\d+)", args)[0])
+            where = dict(re.findall(r'(\w+): "(\w*)"', args))
+            id_gt = where.pop("id_gt", "")
+            id_gte = where.pop("id_gte", "")
+            id_lt = where.pop("id_lt", "0xz")
+            where_in = {
+                key: json.loads(values)
+                for key, values in re.findall(r"(\w+)_in: (\[[^\]]*\])", args)
+            }
+            matching = [
+                p
+                for p in payments
+                if id_gt < p["id"] < id_lt
+                and p["id"] >= id_gte
+                and all(p[key] == value for key, value in where.items())
+                and all(p[key] in values for key, values in where_in.items())
+            ]
+            data[alias or "payments"] = matching[skip : skip + first]
+        return httpx.Response(200, json={"data": data})
+
+    return _handle
+
+
 def describe_RequestClient() -> None:
     @pytest.fixture
     def client(rn_subgraph_endpoint_url: str) -> request_client.RequestClient:
@@ -78,6 +120,420 @@ def describe_RequestClient() -> None:
                     assert payments[-1]["to"] == to_address
                     assert payments[-1]["from"] == from_address
 
+    def describe_with_a_fake_subgraph() -> None:
+        @pytest.fixture
+        def payer_address() -> str:
+            return address_helpers.fake_hex_address()
+
+        @pytest.fixture
+        def payee_address() -> str:
+            return address_helpers.fake_hex_address()
+
+        @pytest.fixture
+        def payments(payer_address: str, payee_address: str) -> list[dict[str, Any]]:
+            parties = [
+                (payer_address, address_helpers.fake_hex_address()),
+                (payer_address, address_helpers.fake_hex_address()),
+                (payer_address, payee_address),
+                (payer_address, address_helpers.fake_hex_address()),
+                (payer_address, address_helpers.fake_hex_address()),
+                (address_helpers.fake_hex_address(), payee_address),
+                (address_helpers.fake_hex_address(), payee_address),
+                (
+                    address_helpers.fake_hex_address(),
+                    address_helpers.fake_hex_address(),
+                ),
+            ]
+            return [
+                request_type_factories.PaymentFactory.create(
+                    id=f"0x{i * 2**253:064x}", from_=from_, to=to
+                )
+                for i, (from_, to) in enumerate(parties)
+            ]
+
+        @pytest.fixture
+        def queries() -> list[str]:
+            return []
+
+        @pytest.fixture
+        def client_options() -> dict[str, Any]:
+            return {}
+
+        @pytest.fixture
+        def paged_client(
+            rn_subgraph_endpoint_url: str,
+            payments: list[dict[str, Any]],
+            queries: list[str],
+            client_options: dict[str, Any],
+        ) -> request_client.RequestClient:
+            return request_client.RequestClient(
+                request_network_subgraph_endpoint_url=rn_subgraph_endpoint_url,
+                invoice_api_url=settings.request_network_invoice_api_url,
+                http_client_pool_=http_client_pool.HttpClientPool(
+                    transport=httpx.MockTransport(_fake_subgraph(payments, queries))
+                ),
+                page_size=2,
+                **client_options,
+            )
+
+        def describe_get_payments() -> None:
+            async def it_returns_the_payments_in_id_order(
+                paged_client: request_client.RequestClient,
+                payments: list[dict[str, Any]],
+                payer_address: str,
+                queries: list[str],
+            ) -> None:
+                result = await paged_client.get_payments(payer_address, None)
+
+                assert [p["id"] for p in result] == [p["id"] for p in payments[:5]]
+                assert len(queries) == 3
+
+            def with_pipelining() -> None:
+                @pytest.fixture
+                def client_options() -> dict[str, Any]:
+                    return {"pipeline_depth": 3}
+
+                async def it_returns_the_same_payments(
+                    paged_client: request_client.RequestClient,
+                    payments: list[dict[str, Any]],
+                    payer_address: str,
+                ) -> None:
+                    result = await paged_client.get_payments(payer_address, None)
+
+                    assert [p["id"] for p in result] == [p["id"] for p in payments[:5]]
+
+                async def it_requests_the_next_pages_ahead_with_skip(
+                    paged_client: request_client.RequestClient,
+                    payer_address: str,
+                    queries: list[str],
+                ) -> None:
+                    await paged_client.get_payments(payer_address, None)
+
+                    skips = [re.findall(r"skip: (\d+)", query)[0] for query in queries]
+                    assert skips[:3] == ["0", "2", "4"]
+
+                def it_rejects_skipping_past_the_subgraph_limit(
+                    rn_subgraph_endpoint_url: str,
+                ) -> None:
+                    with pytest.raises(ValueError):
+                        request_client.RequestClient(
+                            request_network_subgraph_endpoint_url=rn_subgraph_endpoint_url,
+                            invoice_api_url=settings.request_network_invoice_api_url,
+                            pipeline_depth=7,
+                        )
+
+            def with_sharding() -> None:
+                @pytest.fixture
+                def client_options() -> dict[str, Any]:
+                    return {"shard_fan_out": 4}
+
+                async def it_returns_the_same_payments(
+                    paged_client: request_client.RequestClient,
+                    payments: list[dict[str, Any]],
+                    payee_address: str,
+                    queries: list[str],
+                ) -> None:
+                    result = await paged_client.get_payments(None, payee_address)
+
+                    assert [p["id"] for p in result] == [
+                        p["id"] for p in payments if p["to"] == payee_address
+                    ]
+                    assert all("id_lt" in q or "id_gte" in q for q in queries)
+
+        def describe_get_payments_by_party() -> None:
+            @pytest.fixture
+            def other_payer_address(payments: list[dict[str, Any]]) -> str:
+                return payments[5]["from"]
+
+            async def it_groups_the_payments_by_address(
+                paged_client: request_client.RequestClient,
+                payments: list[dict[str, Any]],
+                payer_address: str,
+                other_payer_address: str,
+                payee_address: str,
+            ) -> None:
+                by_payer, by_payee = await paged_client.get_payments_by_party(
+                    payer_addresses=[payer_address, other_payer_address],
+                    payee_addresses=[payee_address],
+                )
+
+                assert by_payer == {
+                    payer_address: payments[:5],
+                    other_payer_address: [payments[5]],
+                }
+                assert by_payee == {payee_address: [payments[2], *payments[5:7]]}
+
+            async def it_batches_the_addresses_in_shared_queries(
+                paged_client: request_client.RequestClient,
+                payments: list[dict[str, Any]],
+                queries: list[str],
+                payer_address: str,
+                other_payer_address: str,
+                payee_address: str,
+            ) -> None:
+                await paged_client.get_payments_by_party(
+                    payer_addresses=[payer_address, other_payer_address],
+                    payee_addresses=[payee_address],
+                )
+
+                # 6 payer payments take 4 pages, since the last one is full.
+                assert len(queries) == 4
+                assert "from_in" in queries[0] and "to_in" in queries[0]
+
+            def with_small_address_batches() -> None:
+                @pytest.fixture
+                def client_options() -> dict[str, Any]:
+                    return {"address_batch_size": 1}
+
+                async def it_queries_each_batch_under_its_own_alias(
+                    paged_client: request_client.RequestClient,
+                    payments: list[dict[str, Any]],
+                    queries: list[str],
+                    payer_address: str,
+                    other_payer_address: str,
+                ) -> None:
+                    by_payer, _ = await paged_client.get_payments_by_party(
+                        payer_addresses=[payer_address, other_payer_address],
+                        payee_addresses=[],
+                    )
+
+                    assert by_payer[other_payer_address] == [payments[5]]
+                    assert "payers0:" in queries[0] and "payers1:" in queries[0]
+                    assert len(queries) == 3
+
+        def describe_iter_payments() -> None:
+            async def it_yields_the_payments_page_by_page(
+                paged_client: request_client.RequestClient,
+                payments: list[dict[str, Any]],
+                payer_address: str,
+            ) -> None:
+                pages = [
+                    [p["id"] for p in page]
+                    async for page in paged_client.iter_payments(payer_address, None)
+                ]
+
+                ids = [p["id"] for p in payments[:5]]
+                assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+
+        def describe_get_party_payment_stats() -> None:
+            async def it_matches_the_stats_of_the_collected_payments(
+                paged_client: request_client.RequestClient,
+                payer_address: str,
+                payee_address: str,
+            ) -> None:
+                stats = await paged_client.get_party_payment_stats(
+                    payer_address=payer_address,
+                    payee_address=payee_address,
+                    chain=chain_utils.Chain.ETHEREUM,
+                )
+
+                enriched_df = request_client.RequestClient.enrich_payments_data(
+                    pd.DataFrame.from_records(
+                        await paged_client.get_payments_for_parties(
+                            payer_address=payer_address, payee_address=payee_address
+                        )
+                    ),
+                    chain=chain_utils.Chain.ETHEREUM,
+                )
+                is_from_payer = enriched_df["from"] == payer_address
+                is_to_payee = enriched_df["to"] == payee_address
+                assert stats == (
+                    request_client.RequestClient.get_payment_stats(
+                        enriched_df[is_from_payer]
+                    ),
+                    request_client.RequestClient.get_payment_stats(
+                        enriched_df[is_to_payee]
+                    ),
+                    request_client.RequestClient.get_payment_stats(
+                        enriched_df[is_from_payer & is_to_payee]
+                    ),
+                )
+                assert stats[2]["total_txns"] == 1
+
+            def with_an_executor() -> None:
+                async def it_offloads_once_the_payments_reach_the_inline_threshold(
+                    paged_client: request_client.RequestClient,
+                    payer_address: str,
+                    payee_address: str,
+                ) -> None:
+                    cpu_executor = executors.create_executor(
+                        kind=executors.ExecutorKind.THREAD,
+                        max_workers=1,
+                        inline_threshold=5,
+                    )
+
+                    stats = await paged_client.get_party_payment_stats(
+                        payer_address=payer_address,
+                        payee_address=payee_address,
+                        chain=chain_utils.Chain.ETHEREUM,
+                        cpu_executor=cpu_executor,
+                    )
+
+                    # Pages of 4 payments are batched past the threshold of 5, and
+                    # the remainder is offloaded with them.
+                    assert cpu_executor.stats.offloaded_calls == 2
+                    assert cpu_executor.stats.inline_calls == 0
+                    assert stats == await paged_client.get_party_payment_stats(
+                        payer_address=payer_address,
+                        payee_address=payee_address,
+                        chain=chain_utils.Chain.ETHEREUM,
+                    )
+
+        def describe_get_payments_for_parties() -> None:
+            async def it_returns_the_payments_of_both_parties_without_duplicates(
+                paged_client: request_client.RequestClient,
+                payments: list[dict[str, Any]],
+                payer_address: str,
+                payee_address: str,
+            ) -> None:
+                result = await paged_client.get_payments_for_parties(
+                    payer_address=payer_address, payee_address=payee_address
+                )
+
+                assert sorted(p["id"] for p in result) == [
+                    p["id"] for p in payments[:7]
+                ]
+
+            async def it_paginates_both_parties_in_the_same_queries(
+                paged_client: request_client.RequestClient,
+                queries: list[str],
+                payer_address: str,
+                payee_address: str,
+            ) -> None:
+                await paged_client.get_payments_for_parties(
+                    payer_address=payer_address, payee_address=payee_address
+                )
+
+                # 3 pages of payer payments and 2 pages of payee payments.
+                assert len(queries) == 3
+                assert ["payee:" in query for query in queries] == [True, True, False]
+
+            def with_pipelining() -> None:
+                @pytest.fixture
+                def client_options() -> dict[str, Any]:
+                    return {"pipeline_depth": 3}
+
+                async def it_requests_the_next_pages_in_the_same_query(
+                    paged_client: request_client.RequestClient,
+                    payments: list[dict[str, Any]],
+                    queries: list[str],
+                    payer_address: str,
+                    payee_address: str,
+                ) -> None:
+                    result = await paged_client.get_payments_for_parties(
+                        payer_address=payer_address, payee_address=payee_address
+                    )
+
+                    assert sorted(p["id"] for p in result) == [
+                        p["id"] for p in payments[:7]
+                    ]
+                    assert len(queries) == 1
+                    assert re.findall(r"skip: (\d+)", queries[0])[:3] == ["0", "2", "4"]
+
+            def with_sharding() -> None:
+                @pytest.fixture
+                def client_options() -> dict[str, Any]:
+                    return {"shard_fan_out": 4}
+
+                async def it_paginates_the_id_ranges_side_by_side(
+                    paged_client: request_client.RequestClient,
+                    payments: list[dict[str, Any]],
+                    queries: list[str],
+                    payer_address: str,
+                    payee_address: str,
+                ) -> None:
+                    result = await paged_client.get_payments_for_parties(
+                        payer_address=payer_address, payee_address=payee_address
+                    )
+
+                    assert sorted(p["id"] for p in result) == [
+                        p["id"] for p in payments[:7]
+                    ]
+                    assert "payer_3_0:" in queries[0] and "id_lt" in queries[0]
+                    # No id range holds more than 2 payments of a party.
+                    assert len(queries) == 2
+
+            def when_only_the_payer_is_given() -> None:
+                async def it_returns_the_payer_payments(
+                    paged_client: request_client.RequestClient,
+                    payments: list[dict[str, Any]],
+                    payer_address: str,
+                ) -> None:
+                    result = await paged_client.get_payments_for_parties(
+                        payer_address=payer_address, payee_address=None
+                    )
+
+                    assert [p["id"] for p in result] == [p["id"] for p in payments[:5]]
+
+    def describe_get_pair_payment_stats() -> None:
+        @pytest.fixture
+        def addresses() -> list[str]:
+            return [address_helpers.fake_hex_address() for _ in range(4)]
+
+        @pytest.fixture
+        def enriched_payments_data(addresses: list[str]) -> pd.DataFrame:
+            raw_data = pd.DataFrame.from_records(
+                [
+                    request_type_factories.PaymentFactory.create(
+                        from_=addresses[i % 3], to=addresses[(i * 7) % 4]
+                    )
+                    for i in range(30)
+                ]
+            )
+            return request_client.RequestClient.enrich_payments_data(
+                raw_data, chain=chain_utils.Chain.ETHEREUM
+            )
+
+        def it_matches_the_stats_of_each_subset(
+            enriched_payments_data: pd.DataFrame, addresses: list[str]
+        ) -> None:
+            df = enriched_payments_data
+            pairs = [
+                (addresses[0], addresses[1]),
+                (addresses[1], addresses[0]),
+                (addresses[2], addresses[2]),
+                (addresses[3], addresses[1]),
+            ]
+
+            result = request_client.RequestClient.get_pair_payment_stats(df, pairs)
+
+            assert result == [
+                (
+                    request_client.RequestClient.get_payment_stats(
+                        df[df["from"] == payer]
+                    ),
+                    request_client.RequestClient.get_payment_stats(
+                        df[df["to"] == payee]
+                    ),
+                    request_client.RequestClient.get_payment_stats(
+                        df[(df["from"] == payer) & (df["to"] == payee)]
+                    ),
+                )
+                for payer, payee in pairs
+            ]
+            assert result[3][0]["total_txns"] == 0
+
+    def describe_payment_stats_accumulator() -> None:
+        @pytest.fixture
+        def enriched_payments_data() -> pd.DataFrame:
+            raw_data = pd.DataFrame.from_records(
+                request_type_factories.PaymentFactory.create_batch(size=10)
+            )
+            return request_client.RequestClient.enrich_payments_data(
+                raw_data, chain=chain_utils.Chain.ETHEREUM
+            )
+
+        def it_matches_the_stats_of_all_batches_combined(
+            enriched_payments_data: pd.DataFrame,
+        ) -> None:
+            accumulator = request_client.PaymentStatsAccumulator()
+            for start in range(0, 10, 3):
+                accumulator.add(enriched_payments_data[start : start + 3])
+
+            assert accumulator.result() == (
+                request_client.RequestClient.get_payment_stats(enriched_payments_data)
+            )
+
     def describe_get_invoice() -> None:
         @pytest.fixture
         def request_id() -> str:
@@ -140,6 +596,67 @@ def describe_RequestClient() -> None:
             assert enriched_data["token_symbol"].eq("USDC").all()
             assert enriched_data["amount"].apply(lambda v: isinstance(v, float)).all()
 
+        def it_floors_the_usd_amounts_to_whole_dollars(
+            chain: chain_utils.Chain,
+        ) -> None:
+            payments_data = pd.DataFrame.from_records(
+                [
+                    request_type_factories.PaymentFactory.create(
+                        # DAI.
+                        token_address="0x6b175474e89094c44da98b954eedeac495271d0f",
+                        amount=str(123_456_789 * 10**18 - 1),
+                    ),
+                    request_type_factories.PaymentFactory.create(
+                        # USDC.
+                        token_address="0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48",
+                        amount="2999999",
+                    ),
+                    request_type_factories.PaymentFactory.create(amount="10"),
+                ]
+            )
+
+            enriched_data = request_client.RequestClient.enrich_payments_data(
+                payments_data, chain=chain
+            )
+
+            # Fractional USD amounts are floored, e.g. 2.999999 USDC is 2 USD, with
+            # integer arithmetic so that large DAI amounts aren't rounded up by floats.
+            assert enriched_data["amount_usd"].tolist() == [123_456_788, 2, 0]
+
+        def when_compact() -> None:
+            def it_matches_the_default_enrichment_with_exact_amounts(
+                payments_data: pd.DataFrame, chain: chain_utils.Chain
+            ) -> None:
+                payments_data.loc[0, "amount"] = str(10**18 + 1)
+
+                enriched_data = request_client.RequestClient.enrich_payments_data(
+                    payments_data, chain=chain, compact=True
+                )
+
+                expected_data = request_client.RequestClient.enrich_payments_data(
+                    payments_data, chain=chain
+                )
+                pd.testing.assert_frame_equal(
+                    enriched_data.drop(columns="amount"),
+                    expected_data.drop(columns="amount"),
+                    check_categorical=False,
+                    check_dtype=False,
+                )
+                assert enriched_data["amount"][0] == 10**18 + 1
+                assert enriched_data["from"].dtype == "category"
+                assert enriched_data["token_symbol"].dtype == "category"
+
+            def it_leaves_the_raw_data_as_is(
+                payments_data: pd.DataFrame, chain: chain_utils.Chain
+            ) -> None:
+                raw_columns = list(payments_data.columns)
+
+                request_client.RequestClient.enrich_payments_data(
+                    payments_data, chain=chain, compact=True
+                )
+
+                assert list(payments_data.columns) == raw_columns
+
     def describe_get_payment_stats() -> None:
         @pytest.fixture
         def num_payments() -> int:
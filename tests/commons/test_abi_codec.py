@@ -0,0 +1,124 @@
+from typing import Any
+
+import web3
+from eth_abi import abi
+
+from huma_signals.commons import abi_codec
+from tests.helpers import address_helpers
+
+_ABI: list[dict[str, Any]] = [
+    {
+        "inputs": [{"name": "account", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "summary",
+        "outputs": [
+            {"name": "token", "type": "address"},
+            {
+                "components": [
+                    {"name": "amount", "type": "uint256"},
+                    {"name": "name", "type": "string"},
+                ],
+                "name": "limits",
+                "type": "tuple[]",
+            },
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {"anonymous": False, "inputs": [], "name": "Paused", "type": "event"},
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "account", "type": "address"},
+            {"indexed": True, "name": "memo", "type": "string"},
+            {"indexed": False, "name": "amount", "type": "uint256"},
+        ],
+        "name": "Noted",
+        "type": "event",
+    },
+]
+
+
+def describe_load_functions() -> None:
+    def it_loads_only_the_functions_by_name_and_signature() -> None:
+        assert list(abi_codec.load_functions(_ABI)) == [
+            "balanceOf",
+            "summary",
+            "balanceOf(address)",
+            "summary()",
+        ]
+
+    def with_overloaded_functions() -> None:
+        def it_only_loads_the_overloads_by_signature() -> None:
+            functions = abi_codec.load_functions(
+                [
+                    {"inputs": [], "name": "summary", "type": "function"},
+                    {
+                        "inputs": [{"name": "account", "type": "address"}],
+                        "name": "summary",
+                        "type": "function",
+                    },
+                ]
+            )
+
+            assert list(functions) == ["summary()", "summary(address)"]
+            assert functions["summary(address)"].selector == (
+                web3.Web3.keccak(text="summary(address)")[:4]
+            )
+
+
+def describe_AbiFunction() -> None:
+    def it_precomputes_the_selector() -> None:
+        function = abi_codec.load_functions(_ABI)["balanceOf"]
+
+        assert function.signature == "balanceOf(address)"
+        assert function.selector == web3.Web3.keccak(text="balanceOf(address)")[:4]
+
+    def it_encodes_the_input() -> None:
+        account = web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+        function = abi_codec.load_functions(_ABI)["balanceOf"]
+
+        assert function.encode_input([account]) == function.selector + abi.encode(
+            ["address"], [account]
+        )
+
+    def it_decodes_the_outputs_including_tuples() -> None:
+        token = web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+        return_data = abi.encode(
+            ["address", "(uint256,string)[]"], [token.lower(), [(1, "a"), (2, "b")]]
+        )
+
+        outputs = abi_codec.load_functions(_ABI)["summary"].decode_output(return_data)
+
+        assert outputs == (token, ((1, "a"), (2, "b")))
+
+
+def describe_load_events() -> None:
+    def it_loads_only_the_events() -> None:
+        assert list(abi_codec.load_events(_ABI)) == ["Paused", "Noted"]
+
+
+def describe_AbiEvent() -> None:
+    def it_precomputes_the_topic() -> None:
+        event = abi_codec.load_events(_ABI)["Noted"]
+
+        assert event.signature == "Noted(address,string,uint256)"
+        assert event.topic == web3.Web3.keccak(text="Noted(address,string,uint256)")
+
+    def it_decodes_the_log_from_the_topics_and_data() -> None:
+        account = web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+        memo_topic = bytes(web3.Web3.keccak(text="memo"))
+
+        values = abi_codec.load_events(_ABI)["Noted"].decode_log(
+            [abi.encode(["address"], [account]), memo_topic],
+            abi.encode(["uint256"], [10**30]),
+        )
+
+        # The indexed string is only available as its hash.
+        assert values == {"account": account, "memo": memo_topic, "amount": 10**30}
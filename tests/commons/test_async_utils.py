@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from huma_signals import exceptions
+from huma_signals.commons import async_utils
+
+
+def describe_gather_bounded() -> None:
+    async def it_returns_the_results_in_order() -> None:
+        async def _value(value: int, delay: float) -> int:
+            await asyncio.sleep(delay)
+            return value
+
+        results = await async_utils.gather_bounded(
+            _value(1, 0.02), _value(2, 0.0), _value(3, 0.01), max_concurrency=3
+        )
+
+        assert results == [1, 2, 3]
+
+    async def it_limits_the_concurrency() -> None:
+        running = 0
+        max_running = 0
+
+        async def _track() -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await async_utils.gather_bounded(
+            *(_track() for _ in range(6)), max_concurrency=2
+        )
+
+        assert max_running == 2
+
+    def when_one_of_them_fails() -> None:
+        async def it_reraises_the_exception_and_cancels_the_rest() -> None:
+            cancelled = asyncio.Event()
+
+            async def _fail() -> None:
+                await asyncio.sleep(0.01)
+                raise exceptions.RequestException("boom")
+
+            async def _slow() -> None:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            with pytest.raises(exceptions.RequestException, match="boom"):
+                await async_utils.gather_bounded(_fail(), _slow(), max_concurrency=2)
+            assert cancelled.is_set()
@@ -0,0 +1,78 @@
+import pytest
+
+from huma_signals.commons import block_cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def describe_BlockAwareCache() -> None:
+    @pytest.fixture
+    def clock() -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(clock: FakeClock) -> block_cache.BlockAwareCache[str]:
+        return block_cache.BlockAwareCache(ttl_seconds=10, clock=clock)
+
+    def it_returns_fresh_entries(cache: block_cache.BlockAwareCache[str]) -> None:
+        cache.put("pool", "signals")
+
+        assert cache.get("pool") == "signals"
+        assert cache.stats.hits == 1
+
+    def it_expires_entries_after_the_ttl(
+        cache: block_cache.BlockAwareCache[str], clock: FakeClock
+    ) -> None:
+        cache.put("pool", "signals")
+        clock.now = 10
+
+        assert cache.get("pool") is None
+        assert cache.stats.misses == 1
+
+    def it_does_not_overwrite_entries_with_older_reads(
+        cache: block_cache.BlockAwareCache[str],
+    ) -> None:
+        assert cache.put("pool", "new", block_number=20) is True
+        assert cache.put("pool", "old", block_number=10) is False
+
+        assert cache.get("pool") == "new"
+
+    def describe_invalidate() -> None:
+        def it_drops_the_entry(cache: block_cache.BlockAwareCache[str]) -> None:
+            cache.put("pool", "signals", block_number=10)
+            cache.invalidate("pool")
+
+            assert cache.get("pool") is None
+            assert cache.stats.invalidations == 1
+
+        def with_block_number() -> None:
+            def it_drops_entries_read_before_the_block(
+                cache: block_cache.BlockAwareCache[str],
+            ) -> None:
+                cache.put("pool", "signals", block_number=10)
+                cache.invalidate("pool", block_number=11)
+
+                assert cache.get("pool") is None
+
+            def it_keeps_entries_read_at_or_after_the_block(
+                cache: block_cache.BlockAwareCache[str],
+            ) -> None:
+                cache.put("pool", "signals", block_number=11)
+                cache.invalidate("pool", block_number=11)
+
+                assert cache.get("pool") == "signals"
+
+            def it_rejects_later_writes_of_reads_before_the_block(
+                cache: block_cache.BlockAwareCache[str],
+            ) -> None:
+                cache.invalidate("pool", block_number=11)
+
+                assert cache.put("pool", "stale", block_number=10) is False
+                assert cache.put("pool", "fresh", block_number=11) is True
+                assert cache.get("pool") == "fresh"
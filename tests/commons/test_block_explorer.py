@@ -0,0 +1,104 @@
+import httpx
+import orjson
+import pytest
+
+from huma_signals import exceptions
+from huma_signals.commons import block_explorer, rate_limiter
+
+_RATE_LIMITED = {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+_NO_TRANSACTIONS = {"status": "0", "message": "No transactions found", "result": []}
+_TRANSACTIONS = {"status": "1", "message": "OK", "result": [{"hash": "0x1"}]}
+
+
+def describe_get_result() -> None:
+    @pytest.fixture
+    def api_key_pool() -> rate_limiter.ApiKeyPool:
+        return rate_limiter.RateLimiterRegistry().get_api_key_pool(
+            rate_limiter.Upstream.ETHERSCAN, ["key-1", "key-2"]
+        )
+
+    @pytest.fixture
+    def requests() -> list[httpx.Request]:
+        return []
+
+    @pytest.fixture
+    def client(
+        responses: list[dict], requests: list[httpx.Request]
+    ) -> httpx.AsyncClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, content=orjson.dumps(responses.pop(0)))
+
+        return httpx.AsyncClient(
+            base_url="https://explorer", transport=httpx.MockTransport(handler)
+        )
+
+    async def _get_result(
+        client: httpx.AsyncClient, api_key_pool: rate_limiter.ApiKeyPool
+    ) -> list:
+        return await block_explorer.get_result(
+            client,
+            "/api?module=account&action=txlist",
+            api_key_pool,
+            max_rate_limit_retries=2,
+            rate_limit_backoff_seconds=0,
+        )
+
+    def with_records() -> None:
+        @pytest.fixture
+        def responses() -> list[dict]:
+            return [_TRANSACTIONS]
+
+        async def it_returns_the_records(
+            client: httpx.AsyncClient, api_key_pool: rate_limiter.ApiKeyPool
+        ) -> None:
+            assert await _get_result(client, api_key_pool) == [{"hash": "0x1"}]
+
+    def with_no_records() -> None:
+        @pytest.fixture
+        def responses() -> list[dict]:
+            return [_NO_TRANSACTIONS]
+
+        async def it_returns_no_records(
+            client: httpx.AsyncClient, api_key_pool: rate_limiter.ApiKeyPool
+        ) -> None:
+            assert await _get_result(client, api_key_pool) == []
+
+    def when_rate_limited() -> None:
+        @pytest.fixture
+        def responses() -> list[dict]:
+            return [_RATE_LIMITED, _TRANSACTIONS]
+
+        async def it_retries_with_a_key_from_the_pool(
+            client: httpx.AsyncClient,
+            api_key_pool: rate_limiter.ApiKeyPool,
+            requests: list[httpx.Request],
+        ) -> None:
+            assert await _get_result(client, api_key_pool) == [{"hash": "0x1"}]
+            assert len(requests) == 2
+            assert all("apikey=key-" in str(request.url) for request in requests)
+
+        def when_the_retries_are_exhausted() -> None:
+            @pytest.fixture
+            def responses() -> list[dict]:
+                return [_RATE_LIMITED] * 3
+
+            async def it_raises(
+                client: httpx.AsyncClient,
+                api_key_pool: rate_limiter.ApiKeyPool,
+                requests: list[httpx.Request],
+            ) -> None:
+                with pytest.raises(exceptions.BlockExplorerException):
+                    await _get_result(client, api_key_pool)
+                assert len(requests) == 3
+
+    def when_the_call_fails() -> None:
+        @pytest.fixture
+        def responses() -> list[dict]:
+            return [{"status": "0", "message": "NOTOK", "result": "Invalid API Key"}]
+
+        async def it_raises_instead_of_returning_no_records(
+            client: httpx.AsyncClient, api_key_pool: rate_limiter.ApiKeyPool
+        ) -> None:
+            with pytest.raises(exceptions.BlockExplorerException):
+                await _get_result(client, api_key_pool)
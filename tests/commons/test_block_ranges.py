@@ -0,0 +1,76 @@
+import pytest
+
+from huma_signals.commons import block_ranges
+
+
+def _make_records(blocks: list[int]) -> list[tuple[int, str]]:
+    return [(block, f"{block}-{i}") for i, block in enumerate(blocks)]
+
+
+def describe_fetch_block_range() -> None:
+    @pytest.fixture
+    def max_page_size() -> int:
+        return 100
+
+    @pytest.fixture
+    def records() -> list[tuple[int, str]]:
+        # 3 records per block for 1000 blocks, plus a long tail of sparse blocks.
+        blocks = [b for b in range(1000) for _ in range(3)]
+        blocks.extend(range(100_000, 5_000_000, 50_000))
+        return _make_records(blocks)
+
+    @pytest.fixture
+    def requested_ranges() -> list[tuple[int, int]]:
+        return []
+
+    async def _fetch(
+        records: list[tuple[int, str]],
+        max_page_size: int,
+        requested_ranges: list[tuple[int, int]],
+    ) -> list[tuple[int, str]]:
+        async def fetch_page(start: int, end: int) -> list[tuple[int, str]]:
+            requested_ranges.append((start, end))
+            return [r for r in records if start <= r[0] <= end][:max_page_size]
+
+        return await block_ranges.fetch_block_range(
+            fetch_page=fetch_page,
+            get_block_number=lambda r: r[0],
+            get_key=lambda r: r[1],
+            max_page_size=max_page_size,
+        )
+
+    async def it_fetches_all_records_in_order(
+        records: list[tuple[int, str]],
+        max_page_size: int,
+        requested_ranges: list[tuple[int, int]],
+    ) -> None:
+        result = await _fetch(records, max_page_size, requested_ranges)
+        assert result == records
+        assert len(requested_ranges) > 1
+
+    def when_the_first_page_is_not_saturated() -> None:
+        @pytest.fixture
+        def records() -> list[tuple[int, str]]:
+            return _make_records([1, 2, 3])
+
+        async def it_makes_a_single_request(
+            records: list[tuple[int, str]],
+            max_page_size: int,
+            requested_ranges: list[tuple[int, int]],
+        ) -> None:
+            result = await _fetch(records, max_page_size, requested_ranges)
+            assert result == records
+            assert requested_ranges == [(0, block_ranges.LATEST_BLOCK)]
+
+    def when_a_single_block_exceeds_the_page_size() -> None:
+        @pytest.fixture
+        def records() -> list[tuple[int, str]]:
+            return _make_records([5] * 150 + [6, 7])
+
+        async def it_returns_what_it_can_and_moves_on(
+            records: list[tuple[int, str]],
+            max_page_size: int,
+            requested_ranges: list[tuple[int, int]],
+        ) -> None:
+            result = await _fetch(records, max_page_size, requested_ranges)
+            assert result == records[:100] + records[150:]
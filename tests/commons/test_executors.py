@@ -0,0 +1,65 @@
+import concurrent.futures
+import threading
+from typing import Iterator
+
+import pytest
+
+from huma_signals.commons import executors
+
+
+def describe_CpuExecutor() -> None:
+    @pytest.fixture
+    def thread_pool() -> Iterator[concurrent.futures.ThreadPoolExecutor]:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            yield pool
+
+    @pytest.fixture
+    def cpu_executor(
+        thread_pool: concurrent.futures.ThreadPoolExecutor,
+    ) -> executors.CpuExecutor:
+        return executors.CpuExecutor(executor=thread_pool, inline_threshold=100)
+
+    async def it_runs_small_work_inline(cpu_executor: executors.CpuExecutor) -> None:
+        thread_id = await cpu_executor.run(threading.get_ident, size=99)
+
+        assert thread_id == threading.get_ident()
+        assert cpu_executor.stats.inline_calls == 1
+        assert cpu_executor.stats.offloaded_calls == 0
+
+    async def it_offloads_large_work_to_the_executor(
+        cpu_executor: executors.CpuExecutor,
+    ) -> None:
+        thread_id = await cpu_executor.run(threading.get_ident, size=100)
+
+        assert thread_id != threading.get_ident()
+        assert cpu_executor.stats.offloaded_calls == 1
+        assert cpu_executor.stats.offloaded_seconds > 0
+
+    async def it_passes_the_arguments_through(
+        cpu_executor: executors.CpuExecutor,
+    ) -> None:
+        assert await cpu_executor.run(pow, 2, 10, size=1000) == 1024
+
+    def without_an_executor() -> None:
+        async def it_runs_everything_inline() -> None:
+            cpu_executor = executors.CpuExecutor()
+
+            await cpu_executor.run(threading.get_ident, size=10**9)
+
+            assert cpu_executor.stats.inline_calls == 1
+
+
+def describe_create_executor() -> None:
+    def it_creates_the_configured_kind_of_executor() -> None:
+        thread_executor = executors.create_executor(
+            kind=executors.ExecutorKind.THREAD, max_workers=2, inline_threshold=10
+        )
+        inline_executor = executors.create_executor(
+            kind=executors.ExecutorKind.INLINE, max_workers=2, inline_threshold=10
+        )
+
+        assert isinstance(
+            thread_executor.executor, concurrent.futures.ThreadPoolExecutor
+        )
+        assert thread_executor.inline_threshold == 10
+        assert inline_executor.executor is None
@@ -0,0 +1,56 @@
+import numpy as np
+
+from huma_signals.commons import fixed_point
+
+
+def describe_to_limbs() -> None:
+    def it_round_trips_uint256_values() -> None:
+        values = [0, 1, 2**64 + 3, 2**255 + 2**128 + 5, 2**256 - 1]
+
+        limbs = fixed_point.to_limbs(values)
+
+        assert limbs.shape == (5, fixed_point.UINT256_LIMBS)
+        assert limbs.dtype == np.uint32
+        assert fixed_point.from_limbs(limbs) == values
+
+    def it_accepts_decimal_strings() -> None:
+        limbs = fixed_point.to_limbs(["123456789012345678901234567890", ""])
+
+        assert fixed_point.from_limbs(limbs) == [123456789012345678901234567890, 0]
+
+
+def describe_sum_limbs() -> None:
+    def it_sums_exactly_past_64_bits() -> None:
+        values = [2**256 - 1] * 1000 + [10**30 + i for i in range(1000)]
+
+        assert fixed_point.sum_limbs(fixed_point.to_limbs(values)) == sum(values)
+
+    def it_returns_0_for_no_values() -> None:
+        assert fixed_point.sum_limbs(fixed_point.to_limbs([])) == 0
+
+
+def describe_prefix_sums() -> None:
+    def it_gives_the_exact_sum_of_any_range() -> None:
+        values = [3 * 10**25 + i for i in range(10)]
+        sums = fixed_point.prefix_sums(fixed_point.to_limbs(values))
+
+        assert sums.shape == (11, fixed_point.UINT256_LIMBS)
+        for start in range(11):
+            for end in range(start, 11):
+                assert fixed_point.combine_limb_sums(sums[end] - sums[start]) == sum(
+                    values[start:end]
+                )
+
+
+def describe_to_int_array() -> None:
+    def it_uses_int64_when_the_values_fit() -> None:
+        array = fixed_point.to_int_array(["1", 2, 2**63 - 1])
+
+        assert array.dtype == np.int64
+        assert array.tolist() == [1, 2, 2**63 - 1]
+
+    def it_falls_back_to_python_ints() -> None:
+        array = fixed_point.to_int_array(["1", str(10**30)])
+
+        assert array.dtype == object
+        assert array.tolist() == [1, 10**30]
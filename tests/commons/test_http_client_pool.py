@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from huma_signals.commons import http_client_pool
+
+
+def describe_HttpClientPool() -> None:
+    @pytest.fixture
+    def pool() -> http_client_pool.HttpClientPool:
+        return http_client_pool.HttpClientPool(
+            transport=httpx.MockTransport(lambda _: httpx.Response(200, json={}))
+        )
+
+    def describe_get_client() -> None:
+        async def it_reuses_the_client_for_the_same_base_url(
+            pool: http_client_pool.HttpClientPool,
+        ) -> None:
+            assert pool.get_client("https://a.test") is pool.get_client(
+                "https://a.test"
+            )
+
+        async def it_creates_separate_clients_per_base_url(
+            pool: http_client_pool.HttpClientPool,
+        ) -> None:
+            assert pool.get_client("https://a.test") is not pool.get_client(
+                "https://b.test"
+            )
+
+        async def it_applies_the_configured_limits(
+            pool: http_client_pool.HttpClientPool,
+        ) -> None:
+            client = pool.get_client("https://a.test")
+            assert client.timeout == pool.timeout
+
+        def when_used_from_another_event_loop() -> None:
+            async def _get_client(
+                pool: http_client_pool.HttpClientPool,
+            ) -> httpx.AsyncClient:
+                return pool.get_client("https://a.test")
+
+            def it_closes_the_replaced_client_in_its_own_loop(
+                pool: http_client_pool.HttpClientPool,
+            ) -> None:
+                old_loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=old_loop.run_forever)
+                thread.start()
+                try:
+                    old_client = asyncio.run_coroutine_threadsafe(
+                        _get_client(pool), old_loop
+                    ).result()
+                    new_client = asyncio.run(_get_client(pool))
+                    # The close is scheduled in the old loop, and runs there.
+                    asyncio.run_coroutine_threadsafe(
+                        asyncio.sleep(0.01), old_loop
+                    ).result()
+                finally:
+                    old_loop.call_soon_threadsafe(old_loop.stop)
+                    thread.join()
+                    old_loop.close()
+
+                assert new_client is not old_client
+                assert old_client.is_closed
+
+            def when_that_loop_is_not_running() -> None:
+                def it_drops_the_replaced_client(
+                    pool: http_client_pool.HttpClientPool,
+                ) -> None:
+                    old_loop = asyncio.new_event_loop()
+                    try:
+                        old_client = old_loop.run_until_complete(_get_client(pool))
+                        new_client = asyncio.run(_get_client(pool))
+                        assert not asyncio.all_tasks(old_loop)
+                    finally:
+                        old_loop.close()
+
+                    assert new_client is not old_client
+                    assert not old_client.is_closed
+
+    def describe_shutdown() -> None:
+        async def it_closes_all_clients(
+            pool: http_client_pool.HttpClientPool,
+        ) -> None:
+            client = pool.get_client("https://a.test")
+            await pool.shutdown()
+            assert client.is_closed
+            assert pool.get_client("https://a.test") is not client
+
+    def describe_connection_stats() -> None:
+        async def it_counts_the_requests_per_base_url(
+            pool: http_client_pool.HttpClientPool,
+        ) -> None:
+            client = pool.get_client("https://a.test")
+            await client.get("/foo")
+            await client.get("/bar")
+
+            stats = pool.connection_stats()["https://a.test"]
+            assert stats.requests == 2
+            # The mock transport never opens a real connection.
+            assert stats.connections_opened == 0
+            assert stats.connections_reused == 2
@@ -0,0 +1,141 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator
+
+import orjson
+import pytest
+
+from huma_signals.commons import json_rpc_batch
+
+
+class FakeResponse:
+    def __init__(self, body: Any) -> None:
+        self.body = body
+
+    def raise_for_status(self) -> None:
+        pass
+
+    async def read(self) -> bytes:
+        return orjson.dumps(self.body)
+
+
+class FakeSession:
+    """
+    Answers JSON-RPC batches with the method of each request as its result.
+    """
+
+    def __init__(self, supports_batches: bool = True) -> None:
+        self.supports_batches = supports_batches
+        self.batches: list[list[dict[str, Any]]] = []
+
+    @contextlib.asynccontextmanager
+    async def post(self, url: str, data: bytes, **kwargs: Any) -> AsyncIterator[Any]:
+        batch = orjson.loads(data)
+        self.batches.append(batch)
+        if not self.supports_batches:
+            yield FakeResponse({"jsonrpc": "2.0", "id": None, "error": {}})
+            return
+        # Out of order, like some providers answer.
+        yield FakeResponse(
+            [
+                {"jsonrpc": "2.0", "id": request["id"], "result": request["params"]}
+                for request in reversed(batch)
+            ]
+        )
+
+
+class FakeProvider:
+    endpoint_uri = "https://rpc.test"
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, Any]] = []
+
+    def get_request_kwargs(self) -> dict[str, Any]:
+        return {"headers": {"Content-Type": "application/json"}}
+
+    async def make_request(self, method: str, params: Any) -> dict[str, Any]:
+        self.requests.append((method, params))
+        return {"jsonrpc": "2.0", "id": 0, "result": params}
+
+
+def describe_BatchingAsyncHTTPProvider() -> None:
+    @pytest.fixture
+    def provider() -> FakeProvider:
+        return FakeProvider()
+
+    @pytest.fixture
+    def session() -> FakeSession:
+        return FakeSession()
+
+    @pytest.fixture
+    def batching_provider(
+        provider: FakeProvider, session: FakeSession
+    ) -> json_rpc_batch.BatchingAsyncHTTPProvider:
+        return json_rpc_batch.BatchingAsyncHTTPProvider(
+            provider,  # type: ignore[arg-type]
+            session,  # type: ignore[arg-type]
+            window_seconds=0.01,
+            max_batch_size=3,
+        )
+
+    async def it_sends_concurrent_calls_as_one_batch(
+        batching_provider: json_rpc_batch.BatchingAsyncHTTPProvider,
+        session: FakeSession,
+    ) -> None:
+        responses = await asyncio.gather(
+            batching_provider.make_request("eth_call", ["a"]),  # type: ignore[arg-type]
+            batching_provider.make_request("eth_call", ["b"]),  # type: ignore[arg-type]
+        )
+
+        assert [response["result"] for response in responses] == [["a"], ["b"]]
+        assert len(session.batches) == 1
+        assert batching_provider.stats.avg_batch_size == 2
+
+    async def it_sends_full_batches_early(
+        batching_provider: json_rpc_batch.BatchingAsyncHTTPProvider,
+        session: FakeSession,
+    ) -> None:
+        await asyncio.gather(
+            *(
+                batching_provider.make_request("eth_call", [i])  # type: ignore[arg-type]
+                for i in range(5)
+            )
+        )
+
+        assert [len(batch) for batch in session.batches] == [3, 2]
+
+    async def it_sends_a_lone_call_as_is(
+        batching_provider: json_rpc_batch.BatchingAsyncHTTPProvider,
+        provider: FakeProvider,
+        session: FakeSession,
+    ) -> None:
+        await batching_provider.make_request("eth_call", ["a"])  # type: ignore[arg-type]
+
+        assert provider.requests == [("eth_call", ["a"])]
+        assert not session.batches
+
+    async def it_does_not_batch_other_methods(
+        batching_provider: json_rpc_batch.BatchingAsyncHTTPProvider,
+        provider: FakeProvider,
+    ) -> None:
+        await batching_provider.make_request("eth_chainId", [])  # type: ignore[arg-type]
+
+        assert provider.requests == [("eth_chainId", [])]
+        assert batching_provider.stats.batches == 0
+
+    def when_the_endpoint_rejects_batches() -> None:
+        @pytest.fixture
+        def session() -> FakeSession:
+            return FakeSession(supports_batches=False)
+
+        async def it_sends_the_calls_one_by_one(
+            batching_provider: json_rpc_batch.BatchingAsyncHTTPProvider,
+            provider: FakeProvider,
+        ) -> None:
+            responses = await asyncio.gather(
+                batching_provider.make_request("eth_call", ["a"]),  # type: ignore[arg-type]
+                batching_provider.make_request("eth_call", ["b"]),  # type: ignore[arg-type]
+            )
+
+            assert [response["result"] for response in responses] == [["a"], ["b"]]
+            assert len(provider.requests) == 2
@@ -0,0 +1,44 @@
+import pytest_mock
+import web3
+
+from huma_signals.commons import multicall
+from tests.helpers import address_helpers
+
+
+def describe_aggregate3() -> None:
+    async def it_makes_no_call_without_calls() -> None:
+        assert await multicall.aggregate3(web3.Web3(), []) == []
+
+    async def it_makes_the_calls_in_one_eth_call(
+        mocker: pytest_mock.MockerFixture,
+    ) -> None:
+        w3 = web3.Web3()
+        target = web3.Web3.to_checksum_address(address_helpers.fake_hex_address())
+        mock_call = mocker.patch.object(
+            w3.eth,
+            "call",
+            new=mocker.AsyncMock(
+                return_value=w3.codec.encode(
+                    ["(bool,bytes)[]"], [[(True, b"\x01"), (False, b"")]]
+                )
+            ),
+        )
+
+        results = await multicall.aggregate3(
+            w3,
+            [
+                multicall.Call(target=target, call_data=b"\x01"),
+                multicall.Call(target=target, call_data=b"\x02"),
+            ],
+        )
+
+        assert results == [
+            multicall.CallResult(success=True, return_data=b"\x01"),
+            multicall.CallResult(success=False, return_data=b""),
+        ]
+        (transaction,) = mock_call.call_args.args
+        assert transaction["to"] == multicall.MULTICALL3_ADDRESS
+        assert (
+            transaction["data"][:4]
+            == w3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+        )
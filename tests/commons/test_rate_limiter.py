@@ -0,0 +1,63 @@
+import pytest
+
+from huma_signals.commons import rate_limiter
+
+
+def describe_TokenBucketRateLimiter() -> None:
+    async def it_lets_a_burst_through_without_waiting() -> None:
+        limiter = rate_limiter.TokenBucketRateLimiter(requests_per_second=5)
+        for _ in range(5):
+            await limiter.acquire()
+        assert limiter.stats.acquired == 5
+        assert limiter.stats.waited == 0
+
+    async def it_makes_callers_wait_once_the_bucket_is_empty() -> None:
+        limiter = rate_limiter.TokenBucketRateLimiter(requests_per_second=100, burst=1)
+        for _ in range(3):
+            await limiter.acquire()
+        assert limiter.stats.waited == 2
+        assert limiter.stats.max_wait_seconds > 0
+        assert limiter.stats.avg_wait_seconds > 0
+
+
+def describe_ApiKeyPool() -> None:
+    async def it_rotates_over_the_keys() -> None:
+        pool = rate_limiter.RateLimiterRegistry().get_api_key_pool(
+            rate_limiter.Upstream.ETHERSCAN, ["key-1", "key-2"]
+        )
+        keys = [await pool.acquire() for _ in range(4)]
+        assert sorted(keys) == ["key-1", "key-1", "key-2", "key-2"]
+
+    def it_requires_a_key() -> None:
+        with pytest.raises(ValueError):
+            rate_limiter.ApiKeyPool({})
+
+
+def describe_RateLimiterRegistry() -> None:
+    def it_shares_limiters_per_upstream_and_key() -> None:
+        registry = rate_limiter.RateLimiterRegistry()
+        assert registry.get(rate_limiter.Upstream.ETHERSCAN, "a") is registry.get(
+            rate_limiter.Upstream.ETHERSCAN, "a"
+        )
+        assert registry.get(rate_limiter.Upstream.ETHERSCAN, "a") is not registry.get(
+            rate_limiter.Upstream.POLYGONSCAN, "a"
+        )
+
+    async def it_aggregates_the_stats_per_upstream() -> None:
+        registry = rate_limiter.RateLimiterRegistry(
+            requests_per_second={rate_limiter.Upstream.ETHERSCAN: 1000}
+        )
+        pool = registry.get_api_key_pool(
+            rate_limiter.Upstream.ETHERSCAN, ["key-1", "key-2"]
+        )
+        for _ in range(3):
+            await pool.acquire()
+        assert registry.stats()[rate_limiter.Upstream.ETHERSCAN].acquired == 3
+
+
+def describe_parse_api_keys() -> None:
+    def it_splits_comma_separated_keys() -> None:
+        assert rate_limiter.parse_api_keys("a, b,,c") == ["a", "b", "c"]
+
+    def it_falls_back_to_no_key() -> None:
+        assert rate_limiter.parse_api_keys("") == [""]
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from huma_signals.commons import single_flight
+
+
+def describe_SingleFlight() -> None:
+    @pytest.fixture
+    def group() -> single_flight.SingleFlight:
+        return single_flight.SingleFlight()
+
+    async def it_coalesces_concurrent_calls_for_the_same_key(
+        group: single_flight.SingleFlight,
+    ) -> None:
+        upstream_calls = 0
+
+        async def fn() -> int:
+            nonlocal upstream_calls
+            upstream_calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(group.do(("test", "a"), fn) for _ in range(5)))
+        assert results == [42] * 5
+        assert upstream_calls == 1
+        assert group.stats()["test"].calls == 5
+        assert group.stats()["test"].coalesced == 4
+
+    async def it_does_not_coalesce_different_keys(
+        group: single_flight.SingleFlight,
+    ) -> None:
+        async def fn() -> int:
+            await asyncio.sleep(0.01)
+            return 42
+
+        await asyncio.gather(group.do(("test", "a"), fn), group.do(("test", "b"), fn))
+        assert group.stats()["test"].coalesced == 0
+
+    async def it_does_not_coalesce_sequential_calls(
+        group: single_flight.SingleFlight,
+    ) -> None:
+        async def fn() -> int:
+            return 42
+
+        await group.do(("test", "a"), fn)
+        await group.do(("test", "a"), fn)
+        assert group.stats()["test"].coalesced == 0
+
+    async def it_propagates_exceptions_to_all_callers(
+        group: single_flight.SingleFlight,
+    ) -> None:
+        async def fn() -> int:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            group.do(("test", "a"), fn),
+            group.do(("test", "a"), fn),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, ValueError) for r in results)
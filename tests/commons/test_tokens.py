@@ -45,3 +45,31 @@ def describe_TOKEN_USD_PRICE_MAPPING() -> None:
     def it_has_all_token_prices_positive() -> None:
         for token_usd_price in tokens.TOKEN_USD_PRICE_MAPPING.values():
             assert token_usd_price > 0
+
+
+def describe_TOKENS() -> None:
+    def it_has_a_token_for_every_mapped_address() -> None:
+        for chain in chain_utils.Chain:
+            assert set(tokens.TOKEN_ADDRESS_MAPPING[chain].values()) <= set(
+                tokens.TOKENS
+            )
+
+    def it_matches_the_usd_price_of_a_base_unit() -> None:
+        for token_symbol, token in tokens.TOKENS.items():
+            assert tokens.TOKEN_USD_PRICE_MAPPING[token_symbol] == (
+                1.0 / 10**token.decimals
+            )
+
+
+def describe_Token() -> None:
+    def describe_to_usd() -> None:
+        def it_floors_fractional_usd_amounts() -> None:
+            # 2.999999 USDC.
+            assert tokens.TOKENS["USDC"].to_usd(2_999_999) == 2
+
+        def it_is_exact_beyond_float_precision() -> None:
+            amount = 123_456_789 * 10**18 - 1
+            # Multiplying by the float price of a base unit rounds up to a whole
+            # 123,456,789 USD instead.
+            assert int(amount * tokens.TOKENS["DAI"].base_unit_usd_price) == 123_456_789
+            assert tokens.TOKENS["DAI"].to_usd(amount) == 123_456_788
@@ -0,0 +1,115 @@
+import numpy as np
+import orjson
+import pytest
+
+from huma_signals.clients.eth_client import eth_types
+from huma_signals.commons import transaction_columns
+from tests.fixtures.clients.eth import eth_type_factories
+from tests.helpers import address_helpers
+
+
+def describe_TransactionColumns() -> None:
+    @pytest.fixture
+    def wallet_address() -> str:
+        return address_helpers.fake_hex_address()
+
+    @pytest.fixture
+    def transactions(wallet_address: str) -> list[eth_types.EthTransaction]:
+        return [
+            eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address, value=2**200 + 7
+            ),
+            eth_type_factories.EthTransactionFactory.create(
+                from_=wallet_address.upper(), value=0
+            ),
+            eth_type_factories.EthTransactionFactory.create(to=wallet_address),
+        ]
+
+    def describe_from_transactions() -> None:
+        def it_decodes_the_columns(
+            wallet_address: str, transactions: list[eth_types.EthTransaction]
+        ) -> None:
+            columns = transaction_columns.TransactionColumns.from_transactions(
+                transactions
+            )
+
+            assert len(columns) == 3
+            assert columns.block_number is not None
+            assert columns.block_number.dtype == np.int64
+            assert columns.block_number.tolist() == [
+                int(tx.block_number) for tx in transactions
+            ]
+            assert columns.time_stamp is not None
+            assert columns.time_stamp.tolist() == [
+                int(tx.time_stamp) for tx in transactions
+            ]
+            assert columns.hash is not None
+            assert [h.decode() for h in columns.hash] == [
+                tx.hash for tx in transactions
+            ]
+            assert columns.values() == [int(tx.value) for tx in transactions]
+
+        def it_interns_the_addresses_in_lowercase(
+            wallet_address: str, transactions: list[eth_types.EthTransaction]
+        ) -> None:
+            columns = transaction_columns.TransactionColumns.from_transactions(
+                transactions
+            )
+
+            wallet_index = columns.address_index(wallet_address.upper())
+            assert wallet_index is not None
+            assert columns.to_index is not None
+            assert columns.from_index is not None
+            assert (columns.to_index == wallet_index).tolist() == [True, False, True]
+            assert (columns.from_index == wallet_index).tolist() == [
+                False,
+                True,
+                False,
+            ]
+            assert len(columns.addresses) == len(set(columns.addresses))
+            assert columns.address_index(address_helpers.fake_hex_address()) is None
+
+        def it_only_decodes_the_projected_fields(
+            transactions: list[eth_types.EthTransaction],
+        ) -> None:
+            columns = transaction_columns.TransactionColumns.from_transactions(
+                transactions,
+                fields=frozenset(
+                    {
+                        transaction_columns.TransactionField.TIME_STAMP,
+                        transaction_columns.TransactionField.TO,
+                    }
+                ),
+            )
+
+            assert columns.time_stamp is not None
+            assert columns.to_index is not None
+            assert columns.block_number is None
+            assert columns.from_index is None
+            assert columns.value_limbs is None
+            with pytest.raises(ValueError):
+                columns.values()
+
+
+def describe_decode_txlist() -> None:
+    def it_decodes_the_payload() -> None:
+        transactions = eth_type_factories.EthTransactionFactory.create_batch(size=4)
+        payload = orjson.dumps(
+            {
+                "status": "1",
+                "message": "OK",
+                "result": [tx.dict(by_alias=True) for tx in transactions],
+            }
+        )
+
+        columns = transaction_columns.decode_txlist(payload)
+
+        assert len(columns) == 4
+        assert columns.values() == [int(tx.value) for tx in transactions]
+
+    def it_returns_no_transactions_for_failed_responses() -> None:
+        payload = orjson.dumps(
+            {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+        )
+
+        assert len(transaction_columns.decode_txlist(payload)) == 0
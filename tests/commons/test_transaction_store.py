@@ -0,0 +1,128 @@
+import pathlib
+from typing import Awaitable, Callable
+
+import pytest
+from huma_utils import chain_utils
+
+from huma_signals.clients.eth_client import eth_types
+from huma_signals.commons import transaction_store
+from tests.fixtures.clients.eth import eth_type_factories
+from tests.helpers import address_helpers
+
+
+def describe_WalletTransactionStore() -> None:
+    @pytest.fixture
+    def store(tmp_path: pathlib.Path) -> transaction_store.WalletTransactionStore:
+        return transaction_store.WalletTransactionStore(
+            str(tmp_path / "store.db"), confirmations=5
+        )
+
+    @pytest.fixture
+    def wallet_address() -> str:
+        return address_helpers.fake_hex_address()
+
+    @pytest.fixture
+    def transactions(wallet_address: str) -> list[eth_types.EthTransaction]:
+        return [
+            eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address, block_number=block_number
+            )
+            for block_number in (10, 20, 20, 30)
+        ]
+
+    @pytest.fixture
+    def fetch_since(
+        transactions: list[eth_types.EthTransaction], requested_start_blocks: list[int]
+    ) -> Callable[[int], Awaitable[list[eth_types.EthTransaction]]]:
+        async def _fetch_since(start_block: int) -> list[eth_types.EthTransaction]:
+            requested_start_blocks.append(start_block)
+            return [tx for tx in transactions if int(tx.block_number) >= start_block]
+
+        return _fetch_since
+
+    @pytest.fixture
+    def requested_start_blocks() -> list[int]:
+        return []
+
+    def describe_sync_transactions() -> None:
+        async def it_only_fetches_blocks_after_the_confirmed_ones(
+            store: transaction_store.WalletTransactionStore,
+            wallet_address: str,
+            transactions: list[eth_types.EthTransaction],
+            fetch_since: Callable[[int], Awaitable[list[eth_types.EthTransaction]]],
+            requested_start_blocks: list[int],
+        ) -> None:
+            first = await store.sync_transactions(
+                chain=chain_utils.Chain.ETHEREUM,
+                address=wallet_address,
+                fetch_since=fetch_since,
+            )
+            transactions.append(
+                eth_type_factories.EthTransactionFactory.create(
+                    to=wallet_address, block_number=40
+                )
+            )
+            second = await store.sync_transactions(
+                chain=chain_utils.Chain.ETHEREUM,
+                address=wallet_address,
+                fetch_since=fetch_since,
+            )
+
+            # Blocks 26 to 30 are within 5 blocks of block 30, so are fetched again.
+            assert requested_start_blocks == [0, 26]
+            assert first.hash is not None
+            assert second.hash is not None and second.block_number is not None
+            assert first.hash.tolist() == [tx.hash.encode() for tx in transactions[:4]]
+            assert second.hash.tolist() == [tx.hash.encode() for tx in transactions]
+            assert second.block_number.tolist() == [10, 20, 20, 30, 40]
+
+        async def it_drops_the_transactions_reorged_out_of_unconfirmed_blocks(
+            store: transaction_store.WalletTransactionStore,
+            wallet_address: str,
+            transactions: list[eth_types.EthTransaction],
+            fetch_since: Callable[[int], Awaitable[list[eth_types.EthTransaction]]],
+        ) -> None:
+            await store.sync_transactions(
+                chain=chain_utils.Chain.ETHEREUM,
+                address=wallet_address,
+                fetch_since=fetch_since,
+            )
+            transactions[3] = eth_type_factories.EthTransactionFactory.create(
+                to=wallet_address, block_number=31
+            )
+            columns = await store.sync_transactions(
+                chain=chain_utils.Chain.ETHEREUM,
+                address=wallet_address,
+                fetch_since=fetch_since,
+            )
+
+            assert columns.hash is not None and columns.block_number is not None
+            assert columns.hash.tolist() == [tx.hash.encode() for tx in transactions]
+            assert columns.block_number.tolist() == [10, 20, 20, 31]
+
+        async def it_keeps_chains_apart(
+            store: transaction_store.WalletTransactionStore,
+            wallet_address: str,
+            transactions: list[eth_types.EthTransaction],
+        ) -> None:
+            await store.save_transactions(
+                chain_utils.Chain.ETHEREUM,
+                wallet_address,
+                transactions,
+                start_block=0,
+                last_block=30,
+            )
+            assert (
+                await store.get_last_synced_block(
+                    chain_utils.Chain.POLYGON, wallet_address
+                )
+                is None
+            )
+            assert (
+                len(
+                    await store.load_transaction_columns(
+                        chain_utils.Chain.POLYGON, wallet_address
+                    )
+                )
+                == 0
+            )
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any, cast
+
+import aiohttp
+import pytest
+import pytest_mock
+from huma_utils import chain_utils, web3_utils
+
+from huma_signals.commons import web3_providers
+
+
+class FakeEndpoint:
+    def __init__(self, latency_seconds: float = 0.0, fails: bool = False) -> None:
+        self.latency_seconds = latency_seconds
+        self.fails = fails
+        self.requests = 0
+
+    async def make_request(self, method: str, params: Any) -> dict[str, Any]:
+        self.requests += 1
+        await asyncio.sleep(self.latency_seconds)
+        if self.fails:
+            raise aiohttp.ClientConnectionError()
+        return {"jsonrpc": "2.0", "id": 1, "result": method}
+
+
+def describe_RoutedAsyncHTTPProvider() -> None:
+    async def it_routes_requests_to_the_fastest_endpoint() -> None:
+        fast, slow = FakeEndpoint(), FakeEndpoint(latency_seconds=0.02)
+        provider = web3_providers.RoutedAsyncHTTPProvider(
+            {"https://slow.test": slow, "https://fast.test": fast}  # type: ignore[dict-item]
+        )
+
+        # Endpoints without a measured latency yet are tried first.
+        for _ in range(4):
+            await provider.make_request("eth_chainId", [])  # type: ignore[arg-type]
+
+        assert slow.requests == 1
+        assert fast.requests == 3
+
+    def when_an_endpoint_fails() -> None:
+        async def it_fails_over_to_the_next_endpoint() -> None:
+            broken, healthy = FakeEndpoint(fails=True), FakeEndpoint()
+            provider = web3_providers.RoutedAsyncHTTPProvider(
+                {"https://broken.test": broken, "https://healthy.test": healthy}  # type: ignore[dict-item]
+            )
+
+            response = await provider.make_request("eth_chainId", [])  # type: ignore[arg-type]
+            await provider.make_request("eth_chainId", [])  # type: ignore[arg-type]
+
+            assert response["result"] == "eth_chainId"
+            # The broken endpoint is skipped during its cooldown.
+            assert broken.requests == 1
+            assert healthy.requests == 2
+            assert provider.stats["https://broken.test"].failures == 1
+
+        def when_every_endpoint_fails() -> None:
+            async def it_raises_the_last_error() -> None:
+                provider = web3_providers.RoutedAsyncHTTPProvider(
+                    {"https://broken.test": FakeEndpoint(fails=True)}  # type: ignore[dict-item]
+                )
+
+                with pytest.raises(aiohttp.ClientConnectionError):
+                    await provider.make_request("eth_chainId", [])  # type: ignore[arg-type]
+
+
+def describe_Web3ProviderRegistry() -> None:
+    @pytest.fixture
+    def registry() -> web3_providers.Web3ProviderRegistry:
+        return web3_providers.Web3ProviderRegistry(
+            {chain_utils.Chain.POLYGON: ["https://a.test", "https://b.test"]}
+        )
+
+    async def it_creates_the_web3_once_per_chain(
+        mocker: pytest_mock.MockerFixture,
+        registry: web3_providers.Web3ProviderRegistry,
+    ) -> None:
+        mock_get_w3 = mocker.patch.object(
+            web3_utils, "get_w3", side_effect=lambda *_: mocker.MagicMock()
+        )
+
+        w3s = await asyncio.gather(
+            *(registry.get_w3(chain_utils.Chain.POLYGON) for _ in range(3))
+        )
+
+        assert all(w3 is w3s[0] for w3 in w3s)
+        # One per provider URL of the chain.
+        assert mock_get_w3.call_count == 2
+        assert isinstance(w3s[0].provider, web3_providers.RoutedAsyncHTTPProvider)
+        assert list(w3s[0].provider.endpoints) == ["https://a.test", "https://b.test"]
+        await registry.shutdown()
+
+    def with_no_provider_url_for_the_chain() -> None:
+        async def it_uses_the_default_provider_url(
+            mocker: pytest_mock.MockerFixture,
+            registry: web3_providers.Web3ProviderRegistry,
+        ) -> None:
+            mocker.patch.object(
+                web3_utils, "get_w3", side_effect=lambda *_: mocker.MagicMock()
+            )
+
+            w3 = await registry.get_w3(
+                chain_utils.Chain.GOERLI, default_provider_url="https://default.test"
+            )
+
+            provider = cast(web3_providers.RoutedAsyncHTTPProvider, w3.provider)
+            assert list(provider.endpoints) == ["https://default.test"]
+            await registry.shutdown()
+
+        async def it_throws_error_without_a_default(
+            registry: web3_providers.Web3ProviderRegistry,
+        ) -> None:
+            with pytest.raises(ValueError):
+                await registry.get_w3(chain_utils.Chain.GOERLI)
+
+    def with_an_unreachable_provider_url() -> None:
+        async def it_routes_over_the_reachable_ones(
+            mocker: pytest_mock.MockerFixture,
+            registry: web3_providers.Web3ProviderRegistry,
+        ) -> None:
+            async def get_w3(chain: chain_utils.Chain, url: str) -> Any:
+                if url == "https://a.test":
+                    raise aiohttp.ClientConnectionError()
+                return mocker.MagicMock()
+
+            mocker.patch.object(web3_utils, "get_w3", side_effect=get_w3)
+
+            w3 = await registry.get_w3(chain_utils.Chain.POLYGON)
+
+            provider = cast(web3_providers.RoutedAsyncHTTPProvider, w3.provider)
+            assert list(provider.endpoints) == ["https://b.test"]
+            await registry.shutdown()
+
+        def when_no_provider_url_is_reachable() -> None:
+            async def it_raises_the_connection_error(
+                mocker: pytest_mock.MockerFixture,
+                registry: web3_providers.Web3ProviderRegistry,
+            ) -> None:
+                mocker.patch.object(
+                    web3_utils, "get_w3", side_effect=aiohttp.ClientConnectionError()
+                )
+
+                with pytest.raises(aiohttp.ClientConnectionError):
+                    await registry.get_w3(chain_utils.Chain.POLYGON)
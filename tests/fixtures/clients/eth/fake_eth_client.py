@@ -1,4 +1,5 @@
 from huma_signals.clients.eth_client import eth_types
+from huma_signals.commons import transaction_columns
 from tests.fixtures.clients.eth import eth_type_factories
 
 
@@ -7,14 +8,29 @@ class FakeEthClient:
         self, transactions: list[eth_types.EthTransaction] | None = None
     ) -> None:
         self.transactions = transactions
+        self.requested_start_blocks: list[int] = []
 
     async def get_transactions(
-        self, wallet_address: str
+        self, wallet_address: str, start_block: int = 0
     ) -> list[eth_types.EthTransaction]:
-        return (
-            self.transactions
-            if self.transactions is not None
-            else eth_type_factories.EthTransactionFactory.create_batch(
+        self.requested_start_blocks.append(start_block)
+        if self.transactions is None:
+            return eth_type_factories.EthTransactionFactory.create_batch(
                 size=5, to=wallet_address
             )
+        return [tx for tx in self.transactions if int(tx.block_number) >= start_block]
+
+    async def get_transaction_columns(
+        self,
+        wallet_address: str,
+        start_block: int = 0,
+        fields: frozenset[
+            transaction_columns.TransactionField
+        ] = transaction_columns.ALL_FIELDS,
+    ) -> transaction_columns.TransactionColumns:
+        transactions = await self.get_transactions(
+            wallet_address, start_block=start_block
+        )
+        return transaction_columns.TransactionColumns.from_transactions(
+            transactions, fields=fields
         )
@@ -1,4 +1,5 @@
 from huma_signals.clients.polygon_client import polygon_types
+from huma_signals.commons import transaction_columns
 from tests.fixtures.clients.polygon import polygon_type_factories
 
 
@@ -7,14 +8,29 @@ class FakePolygonClient:
         self, transactions: list[polygon_types.PolygonTransaction] | None = None
     ) -> None:
         self.transactions = transactions
+        self.requested_start_blocks: list[int] = []
 
     async def get_transactions(
-        self, wallet_address: str
+        self, wallet_address: str, start_block: int = 0
     ) -> list[polygon_types.PolygonTransaction]:
-        return (
-            self.transactions
-            if self.transactions is not None
-            else polygon_type_factories.PolygonTransactionFactory.create_batch(
+        self.requested_start_blocks.append(start_block)
+        if self.transactions is None:
+            return polygon_type_factories.PolygonTransactionFactory.create_batch(
                 size=5, to=wallet_address
             )
+        return [tx for tx in self.transactions if int(tx.block_number) >= start_block]
+
+    async def get_transaction_columns(
+        self,
+        wallet_address: str,
+        start_block: int = 0,
+        fields: frozenset[
+            transaction_columns.TransactionField
+        ] = transaction_columns.ALL_FIELDS,
+    ) -> transaction_columns.TransactionColumns:
+        transactions = await self.get_transactions(
+            wallet_address, start_block=start_block
+        )
+        return transaction_columns.TransactionColumns.from_transactions(
+            transactions, fields=fields
         )
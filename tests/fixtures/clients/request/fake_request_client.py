@@ -1,12 +1,19 @@
-from typing import Any
+from typing import Any, AsyncIterator, Collection
 
 from huma_signals.clients.request_client import request_client, request_types
 from tests.fixtures.clients.request import request_type_factories
 
 
 class FakeRequestClient(request_client.BaseRequestClient):
-    def __init__(self, invoice: request_types.Invoice | None = None) -> None:
+    def __init__(
+        self,
+        invoice: request_types.Invoice | None = None,
+        page_size: int = 10,
+        num_pages: int = 1,
+    ) -> None:
         self.invoice = invoice
+        self.page_size = page_size
+        self.num_pages = num_pages
 
     async def get_payments(
         self,
@@ -14,8 +21,51 @@ class FakeRequestClient(request_client.BaseRequestClient):
         to_address: str | None,
     ) -> list[dict[str, Any]]:
         return request_type_factories.PaymentFactory.create_batch(
-            size=10, from_=from_address, to=to_address
+            size=self.page_size, from_=from_address, to=to_address
+        )
+
+    async def get_payments_for_parties(
+        self,
+        payer_address: str | None,
+        payee_address: str | None,
+    ) -> list[dict[str, Any]]:
+        return [
+            *await self.get_payments(from_address=payer_address, to_address=None),
+            *await self.get_payments(from_address=None, to_address=payee_address),
+        ]
+
+    async def get_payments_by_party(
+        self,
+        payer_addresses: Collection[str],
+        payee_addresses: Collection[str],
+    ) -> tuple[request_client.PaymentsByAddress, request_client.PaymentsByAddress]:
+        return (
+            {
+                address: await self.get_payments(from_address=address, to_address=None)
+                for address in payer_addresses
+            },
+            {
+                address: await self.get_payments(from_address=None, to_address=address)
+                for address in payee_addresses
+            },
         )
 
+    async def iter_payments(
+        self,
+        from_address: str | None,
+        to_address: str | None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        yield await self.get_payments(from_address=from_address, to_address=to_address)
+
+    async def iter_payments_for_parties(
+        self,
+        payer_address: str | None,
+        payee_address: str | None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        for _ in range(self.num_pages):
+            yield await self.get_payments_for_parties(
+                payer_address=payer_address, payee_address=payee_address
+            )
+
     async def get_invoice(self, request_id: str) -> request_types.Invoice:
         return self.invoice or request_type_factories.InvoiceFactory.create()
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest_mock
+
+from huma_signals import lifecycle
+from huma_signals.adapters.lending_pools import adapter as lending_pool_adapter
+from huma_signals.commons import block_cache, http_client_pool
+
+
+def describe_lifecycle() -> None:
+    async def it_refreshes_the_lending_pool_cache_until_shutdown(
+        mocker: pytest_mock.MockerFixture,
+    ) -> None:
+        mocker.patch.object(
+            lending_pool_adapter.default_adapter,
+            "cache",
+            block_cache.BlockAwareCache(ttl_seconds=60),
+        )
+        refresh_cache = mocker.patch.object(
+            lending_pool_adapter.default_adapter, "refresh_cache"
+        )
+
+        await lifecycle.startup()
+        await asyncio.sleep(0)
+        await lifecycle.shutdown()
+
+        refresh_cache.assert_awaited_once()
+
+    async def it_closes_the_pooled_http_clients_on_shutdown(
+        mocker: pytest_mock.MockerFixture,
+    ) -> None:
+        mocker.patch.object(lending_pool_adapter.default_adapter, "refresh_cache")
+        await lifecycle.startup()
+        client = http_client_pool.default_pool.get_client("https://a.test")
+
+        await lifecycle.shutdown()
+
+        assert client.is_closed